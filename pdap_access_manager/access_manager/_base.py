@@ -1,17 +1,105 @@
+import copy
+import json
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, Generator, Optional, TYPE_CHECKING
+from urllib.parse import urlsplit
 
-from aiohttp import ClientSession
-from requests import Session
-
-from pdap_access_manager.constants import DEFAULT_DATA_SOURCES_URL, DEFAULT_SOURCE_COLLECTOR_URL
-from pdap_access_manager.enums import RequestType
-from pdap_access_manager.exceptions import AuthNotSetError, TokensNotSetError, IncorrectSessionError
+from pdap_access_manager.cache import ResponseCache
+from pdap_access_manager.compression import compress
+from pdap_access_manager.circuit_breaker import CircuitBreaker, CircuitBreakerStats
+from pdap_access_manager.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimiterStats
+from pdap_access_manager.constants import DEFAULT_DATA_SOURCES_URL, DEFAULT_SOURCE_COLLECTOR_URL, \
+    DEFAULT_CLOCK_SKEW_SECONDS, DEFAULT_MAX_CONCURRENCY, DEFAULT_READ_AHEAD, DEFAULT_PAGE_PARAM, \
+    DEFAULT_RECORDS_KEY
+from pdap_access_manager.enums import RequestType, ResponseMode, RequestPriority
+from pdap_access_manager.exceptions import AuthNotSetError, TokensNotSetError, RequestError
+from pdap_access_manager.helpers import authorization_from_token, lower_case_headers, url_has_prefix
+from pdap_access_manager.instrumentation import Hooks, RequestEvent, RetryEvent, AuthEvent, request_body_size
 from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.circuit_breaker import CircuitBreakerConfig
+from pdap_access_manager.models.compression import CompressionConfig
+from pdap_access_manager.models.concurrency import AdaptiveConcurrencyConfig
 from pdap_access_manager.models.request import RequestInfo
 from pdap_access_manager.models.response import ResponseInfo
+from pdap_access_manager.models.retry import RetryPolicy
 from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.models.transport import TransportConfig
+from pdap_access_manager.rate_limit import RateLimiter
+from pdap_access_manager.scheduler import PriorityScheduler
+from pdap_access_manager.streaming import JsonDecoder, iter_items, aiter_items
+from pdap_access_manager.token_store import StoredCredentials, TokenStore
+from pdap_access_manager.transports._base import Transport, AsyncTransport, TransportResponse
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+    # Each transport is imported only by the subclass that uses it
+    from aiohttp import ClientSession
+    from requests import Session
+
+
+@dataclass
+class _InFlight:
+    """A coalesced request: its pending result and the number of callers awaiting it"""
+    result: "asyncio.Task | Future"
+    waiters: int = 0
+
+
+# Steps yielded by the request flows below. Each subclass performs them
+# in its own way (blocking or awaiting) and sends back the result.
+
+@dataclass(slots=True)
+class _Sleep:
+    seconds: float
+
+
+@dataclass(slots=True)
+class _Send:
+    """Send a request once through the transport; results in a `TransportResponse`"""
+    ri: RequestInfo
+
+
+@dataclass(slots=True)
+class _SendCoalesced:
+    """Send a request through the coalescing, cache and retry layers"""
+    ri: RequestInfo
+
+
+@dataclass(slots=True)
+class _MakeRequest:
+    ri: RequestInfo
+    allow_retry: bool
+
+
+@dataclass(slots=True)
+class _Refresh:
+    """Refresh the tokens single-flight, unless they were replaced since `stale_tokens`"""
+    stale_tokens: Optional[TokensInfo]
+
+
+@dataclass(slots=True)
+class _Login:
+    pass
+
+
+@dataclass(slots=True)
+class _JwtHeader:
+    pass
+
+
+@dataclass(slots=True)
+class _RefreshJwtHeader:
+    pass
+
+
+# What a flow generator yields, is sent back, and finally returns
+Flow = Generator[Any, Any, Any]
 
 
 class AccessManagerBase(ABC):
@@ -20,47 +108,127 @@ class AccessManagerBase(ABC):
             self,
             auth: Optional[AuthInfo] = None,
             tokens: Optional[TokensInfo] = None,
-            session: Optional[ClientSession | Session] = None,
+            session: Optional["ClientSession | Session"] = None,
             api_key: Optional[str] = None,
             data_sources_url: str = DEFAULT_DATA_SOURCES_URL,
-            source_collector_url: str = DEFAULT_SOURCE_COLLECTOR_URL
+            source_collector_url: str = DEFAULT_SOURCE_COLLECTOR_URL,
+            proactive_refresh: bool = False,
+            clock_skew: float = DEFAULT_CLOCK_SKEW_SECONDS,
+            retry_policy: Optional[RetryPolicy] = None,
+            response_cache: Optional[ResponseCache] = None,
+            token_store: Optional[TokenStore] = None,
+            transport_config: Optional[TransportConfig] = None,
+            hooks: Optional[Hooks] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            circuit_breaker: Optional[CircuitBreakerConfig] = None,
+            coalesce_requests: bool = False,
+            transport: Optional["Transport | AsyncTransport"] = None,
+            json_decoder: Optional[JsonDecoder] = None,
+            compression: Optional[CompressionConfig] = None,
+            adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None,
+            scheduler: Optional[PriorityScheduler] = None,
+            warm_up_on_enter: bool = False
     ):
-        self._validate_session(session)
-        self._session = session
-        self._external_session = session
+        """
+        Args:
+            proactive_refresh: Refresh the access token shortly before its
+                `exp` claim is reached, instead of waiting for a 401.
+            clock_skew: Seconds before expiry at which tokens obtained by
+                this manager are treated as expired.
+            retry_policy: Retries 429s, transient 5xx responses and connection
+                errors with backoff. If None, such failures are raised at once.
+                The refresh-and-replay on a 401 happens regardless.
+            response_cache: Caches GET responses, revalidating with
+                `ETag`/`Last-Modified` when they go stale. If None, nothing is cached.
+            token_store: Shares tokens and the API key with other processes and
+                restarts. Missing `tokens`/`api_key` are loaded from it on startup,
+                and new ones are written back after login, refresh and `load_api_key`.
+            transport_config: Connection pool settings for sessions created by
+                this manager. Ignored for a session passed in.
+            hooks: Callbacks for request, retry, refresh and login events,
+                e.g. a `MetricsCollector`. If None, nothing is recorded.
+            rate_limiter: Paces requests per base URL or endpoint, and slows
+                down on 429s. May be shared by several managers. If None,
+                requests are sent as soon as they are made.
+            circuit_breaker: Settings for a circuit breaker per base URL, which
+                rejects requests with `CircuitOpenError` while that service is
+                failing. If None, every request is sent.
+            coalesce_requests: Share one network call between identical GETs
+                in flight at the same time, i.e. with the same URL, params
+                and headers. Each caller gets its own copy of the data.
+            transport: Sends the requests, e.g. `AsyncHttpxTransport` for HTTP/2
+                or an in-memory transport in tests. If None, the subclass's
+                default transport is built from `session` and `transport_config`.
+            json_decoder: Decodes JSON bodies from bytes, e.g. `orjson.loads`.
+                If None, the HTTP library's own decoder is used, and `json.loads`
+                for the items of streamed bodies.
+            compression: Compresses JSON request bodies above a size threshold
+                and asks for compressed responses. If None, bodies are sent
+                as is and response encodings are left to the HTTP library.
+            adaptive_concurrency: Settings for an adaptive limit on requests in
+                flight per base URL, which grows while responses are fast and
+                healthy and is cut on 429s, 5xx and rising latency. Requests
+                over the limit wait for a slot. If None, there is no such limit.
+            scheduler: Shares request slots between priority classes, set by
+                `RequestInfo.priority` or per call. May be shared by several
+                managers. If None, requests are sent in the order they are made.
+            warm_up_on_enter: Run `warm_up` when entered as a context manager,
+                so the first request does not wait for login or new connections.
+        """
+        if session is not None and transport is not None:
+            raise ValueError("Pass either a session or a transport, not both")
         self._tokens = tokens
         self._auth = auth
         self.api_key = api_key
         self.data_sources_url = data_sources_url
         self.source_collector_url = source_collector_url
+        self.proactive_refresh = proactive_refresh
+        self.clock_skew = clock_skew
+        self.retry_policy = retry_policy
+        self.response_cache = response_cache
+        self.token_store = token_store
+        self.transport_config = transport_config or TransportConfig()
+        self.transport = transport if transport is not None else self._default_transport(session)
+        self.hooks = hooks
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers: dict[str, CircuitBreaker] = {}
+        if circuit_breaker is not None:
+            self.circuit_breakers = {
+                base_url: CircuitBreaker(base_url, circuit_breaker)
+                for base_url in (data_sources_url, source_collector_url)
+            }
+        self.concurrency_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+        if adaptive_concurrency is not None:
+            self.concurrency_limiters = {
+                base_url: AdaptiveConcurrencyLimiter(base_url, adaptive_concurrency)
+                for base_url in (data_sources_url, source_collector_url)
+            }
+        self.scheduler = scheduler
+        self.warm_up_on_enter = warm_up_on_enter
+        self.coalesce_requests = coalesce_requests
+        self.json_decoder = json_decoder
+        self.compression = compression
+        # Hosts that rejected a compressed body with 415
+        self._identity_hosts: set[str] = set()
+        self._in_flight: dict[str, _InFlight] = {}
         self.logger = logging.getLogger(__name__)
+        self._load_from_store()
 
     @abstractmethod
-    def _expected_session_type(
-        self
-    ) -> type[ClientSession | Session]:
-        raise NotImplementedError
-
-    def _validate_session(
+    def _default_transport(
         self,
-        session: ClientSession | Session | None
-    ):
-        """Validates that the expected session type is set."""
-        if session is None:
-            return
-        expected_session_type = self._expected_session_type()
-        if not isinstance(session, expected_session_type):
-            raise IncorrectSessionError(
-                f"Expected session type: {expected_session_type.__name__}, "
-                f"got: {type(session).__name__}"
-            )
-
-    @abstractmethod
-    def _initialize_session(
-        self
-    ) -> ClientSession | Session:
+        session: "ClientSession | Session | None"
+    ) -> "Transport | AsyncTransport":
+        """The transport used when none is passed in, sending with `session` if given."""
         raise NotImplementedError
 
+    def connection_pool_stats(self) -> dict[str, int]:
+        """
+        Pool size (`limit`) and connections checked out (`in_use`) for the
+        sessions this manager uses, or an empty dict if there is no session yet.
+        """
+        return self.transport.pool_stats()
+
     @property
     def auth(self) -> AuthInfo:
         if self._auth is None:
@@ -74,18 +242,9 @@ class AccessManagerBase(ABC):
         return self._tokens
 
     @property
-    def session(self) -> ClientSession | Session:
-        if self._external_session is not None:
-            return self._external_session
-        if self._session is not None:
-            return self._session
-        self.logger.warning(
-            "No Session set, creating a new Session. "
-            "Please use the `with_session` context manager if possible or otherwise "
-            "pass in a Session to the constructor."
-        )
-        self._session = self._initialize_session()
-        return self._session
+    def session(self) -> Any:
+        """The transport's session or client, created on first use if needed."""
+        return self.transport.session
 
     @property
     @abstractmethod
@@ -109,10 +268,62 @@ class AccessManagerBase(ABC):
     def make_request(
         self,
         ri: RequestInfo,
-        allow_retry: bool = True
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
     ) -> ResponseInfo:
         raise NotImplementedError
 
+    @staticmethod
+    def _with_priority(ri: RequestInfo, priority: Optional[RequestPriority]) -> RequestInfo:
+        if priority is None or priority == ri.priority:
+            return ri
+        return ri.model_copy(update={"priority": priority})
+
+    @abstractmethod
+    def make_requests(
+        self,
+        ris,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True
+    ):
+        """
+        Make many requests with at most `max_concurrency` in flight,
+        yielding `(index, ResponseInfo | RequestError)` pairs.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def paginate(
+        self,
+        ri: RequestInfo,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        page_param: str = DEFAULT_PAGE_PARAM,
+        records_key: str = DEFAULT_RECORDS_KEY,
+        start_page: int = 1
+    ):
+        """
+        Yield records one at a time across the pages of a list or search endpoint,
+        prefetching up to `read_ahead` pages.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream(self, ri: RequestInfo):
+        """
+        Yield the items of a top-level JSON array or NDJSON body as they arrive,
+        holding only the item being received in memory.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def warm_up(self, connections: int = 1, load_api_key: bool = True) -> None:
+        """
+        Log in, load the API key and open pooled connections to each base URL,
+        at the same time where possible, so that the first request costs
+        no more than later ones.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def login(self) -> TokensInfo:
         raise NotImplementedError
@@ -138,14 +349,497 @@ class AccessManagerBase(ABC):
     def build_login_request_info(self) -> RequestInfo:
         url: str = f"{self.data_sources_url}/v2/auth/login"
         auth = self.auth
-        return RequestInfo(
+        return RequestInfo.model_construct(
             type_=RequestType.POST,
             url=url,
             json_={
                 "email": auth.email,
                 "password": auth.password
-            }
+            },
+            priority=RequestPriority.AUTH
         )
 
+    def _tokens_from_data(self, data: dict) -> TokensInfo:
+        return TokensInfo(
+            access_token=data["access_token"],
+            refresh_token=data["refresh_token"],
+            clock_skew=self.clock_skew
+        )
+
+    def _warm_up_requests(self, connections: int) -> list[RequestInfo]:
+        """
+        HEAD requests that open `connections` connections to each base URL.
+        Their status does not matter: the connection stays pooled either way.
+        """
+        if connections < 0:
+            raise ValueError("connections must not be negative")
+        base_urls = dict.fromkeys((self.data_sources_url, self.source_collector_url))
+        return [
+            RequestInfo.model_construct(
+                type_=RequestType.HEAD,
+                url=base_url,
+                response_mode=ResponseMode.BYTES
+            )
+            for base_url in base_urls
+            for _ in range(connections)
+        ]
+
+    def _warm_up_failed(self, ri: RequestInfo, error: BaseException) -> None:
+        if isinstance(error, RequestError) and error.status_code is not None:
+            # The server answered, so the connection is open
+            return
+        self.logger.info("Could not open a connection to %s while warming up: %r", ri.url, error)
+
+    def _host_limits(self) -> dict[str, int]:
+        """Connection limits per base URL from `transport_config`."""
+        limits = {}
+        config = self.transport_config
+        if config.data_sources_limit is not None:
+            limits[self.data_sources_url] = config.data_sources_limit
+        if config.source_collector_limit is not None:
+            limits[self.source_collector_url] = config.source_collector_limit
+        return limits
+
+    @property
+    def _account_email(self) -> Optional[str]:
+        """The account whose credentials this manager keeps in its token store."""
+        return self._auth.email if self._auth is not None else None
+
+    def _load_stored(self) -> StoredCredentials:
+        """Credentials in the token store, or none if they belong to another account."""
+        stored = self.token_store.load()
+        if stored.email != self._account_email:
+            return StoredCredentials()
+        return stored
+
+    def _load_from_store(self) -> None:
+        if self.token_store is None:
+            return
+        stored = self._load_stored()
+        if self._tokens is None:
+            self._tokens = stored.tokens
+        if self.api_key is None:
+            self.api_key = stored.api_key
+
+    def _set_tokens(self, tokens: TokensInfo) -> None:
+        self._tokens = tokens
+        if self.token_store is not None:
+            self.token_store.save(tokens=tokens, email=self._account_email)
+
+    def _set_api_key(self, api_key: str) -> None:
+        self.api_key = api_key
+        if self.token_store is not None:
+            self.token_store.save(api_key=api_key, email=self._account_email)
+
+    def _adopt_stored_tokens(self, stale_tokens: Optional[TokensInfo]) -> bool:
+        """
+        Use tokens from the token store if another process replaced `stale_tokens`.
+
+        Returns: True if stored tokens were adopted and no refresh or login is needed.
+        """
+        if self.token_store is None:
+            return False
+        stored = self._load_stored().tokens
+        if stored is None:
+            return False
+        if stale_tokens is not None and stored.access_token == stale_tokens.access_token:
+            return False
+        self._tokens = stored
+        return True
+
+    def _needs_proactive_refresh(self) -> bool:
+        """Cheap check for whether the current access token is about to expire."""
+        if not self.proactive_refresh or self._tokens is None:
+            return False
+        return self._tokens.access_token_expired()
+
+    @staticmethod
+    def _swap_stale_authorization(
+        ri: RequestInfo,
+        stale_tokens: TokensInfo,
+        new_header: dict
+    ) -> None:
+        """Replace the Authorization header of `ri` if it carries the stale access token."""
+        if ri.headers is None:
+            return
+        if ri.headers.get("Authorization") != authorization_from_token(
+            stale_tokens.access_token
+        )["Authorization"]:
+            return
+        ri.headers = {**ri.headers, **new_header}
+
+    @staticmethod
+    def _page_request_info(ri: RequestInfo, page_param: str, page: int) -> RequestInfo:
+        params = dict(ri.params or {})
+        params[page_param] = page
+        return ri.model_copy(update={"params": params})
+
+    @staticmethod
+    def _page_records(response_info: ResponseInfo, records_key: str) -> list:
+        if response_info.data is None:
+            return []
+        return response_info.data.get(records_key) or []
+
+    def _retry_delay(
+        self,
+        ri: RequestInfo,
+        attempt: int,
+        status_code: Optional[int],
+        retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """Seconds to wait before retrying `ri`, or None if it should not be retried."""
+        if self.retry_policy is None:
+            return None
+        delay = self.retry_policy.next_delay(
+            type_=ri.type_,
+            attempt=attempt,
+            status_code=status_code,
+            retry_after=retry_after,
+            retryable=ri.retryable
+        )
+        if delay is not None:
+            self.logger.info(
+                "Retrying %s request to %s (attempt %d, status %s) in %.2fs",
+                ri.type_.value, ri.url, attempt + 1, status_code, delay
+            )
+            if self.hooks is not None:
+                self.hooks.on_retry(
+                    RetryEvent(
+                        method=ri.type_.value,
+                        url=ri.url,
+                        attempt=attempt,
+                        status_code=status_code,
+                        delay=delay
+                    )
+                )
+        return delay
+
+    def _coalesce_key(self, ri: RequestInfo) -> Optional[str]:
+        """Key shared by identical GETs, or None if `ri` is not coalesced."""
+        if not self.coalesce_requests or ri.type_ != RequestType.GET:
+            return None
+        if ri.response_mode == ResponseMode.STREAM:
+            # A stream can be read only once
+            return None
+        headers = sorted((ri.headers or {}).items())
+        return f"{ri.url_with_query_params()} {headers}"
+
+    @staticmethod
+    def _coalesced_response(in_flight: _InFlight, response_info: ResponseInfo) -> ResponseInfo:
+        """The response for one caller; copied if several callers share it."""
+        if in_flight.waiters == 1:
+            return response_info
+        return ResponseInfo.model_construct(
+            status_code=response_info.status_code,
+            data=copy.deepcopy(response_info.data),
+            headers=None if response_info.headers is None else dict(response_info.headers)
+        )
+
+    def circuit_breaker_stats(self) -> dict[str, CircuitBreakerStats]:
+        """State of the circuit breaker for each base URL, for monitoring."""
+        return {
+            base_url: breaker.stats()
+            for base_url, breaker in self.circuit_breakers.items()
+        }
+
+    def _circuit_breaker_for(self, url: str) -> Optional[CircuitBreaker]:
+        for base_url, breaker in self.circuit_breakers.items():
+            if url_has_prefix(url, base_url):
+                return breaker
+        return None
+
+    def concurrency_stats(self) -> dict[str, ConcurrencyLimiterStats]:
+        """Current adaptive concurrency limit and load for each base URL, for monitoring."""
+        return {
+            base_url: limiter.stats()
+            for base_url, limiter in self.concurrency_limiters.items()
+        }
+
+    def _concurrency_limiter_for(self, url: str) -> Optional[AdaptiveConcurrencyLimiter]:
+        for base_url, limiter in self.concurrency_limiters.items():
+            if url_has_prefix(url, base_url):
+                return limiter
+        return None
+
+    def _finish_concurrency_slot(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        started: float,
+        response: Optional[TransportResponse],
+        error: Optional[BaseException] = None
+    ) -> None:
+        """Give back a concurrency slot, reporting the send's outcome if it says anything about load."""
+        if error is None:
+            limiter.record(started, response.status_code)
+        elif isinstance(error, RequestError):
+            limiter.record(started, error.status_code)
+        elif isinstance(error, self.transport.connection_errors):
+            limiter.record(started, None)
+        else:
+            limiter.release()
+
+    def _observe_attempt(
+        self,
+        ri: RequestInfo,
+        breaker: Optional[CircuitBreaker],
+        generation: Optional[int],
+        status_code: Optional[int],
+        retry_after: Optional[float] = None
+    ) -> None:
+        """Report the outcome of an attempt to the circuit breaker and rate limiter."""
+        if breaker is not None:
+            breaker.record(generation, status_code)
+        if self.rate_limiter is not None:
+            self.rate_limiter.observe(ri.url, status_code, retry_after)
+
+    def _start_request_event(
+        self,
+        ri: RequestInfo,
+        attempt: int,
+        body_bytes: Optional[int] = None,
+        request_bytes: Optional[int] = None
+    ) -> RequestEvent:
+        event = RequestEvent.start(ri, attempt, request_bytes)
+        if body_bytes is not None:
+            event.request_body_bytes = body_bytes
+        self.hooks.on_request_start(event)
+        return event
+
+    def _finish_request_event(
+        self,
+        event: RequestEvent,
+        status_code: Optional[int],
+        error: Optional[BaseException] = None
+    ) -> None:
+        event.finish(status_code, error)
+        self.hooks.on_response(event)
+
+    @contextmanager
+    def _auth_event(self, kind: str) -> Generator[None, None, None]:
+        """Report the login or refresh run inside the block to `hooks`."""
+        if self.hooks is None:
+            yield
+            return
+        started_at = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            event = AuthEvent(
+                kind=kind,
+                started_at=started_at,
+                duration=time.monotonic() - started_at,
+                success=success
+            )
+            if kind == "login":
+                self.hooks.on_login(event)
+            else:
+                self.hooks.on_token_refresh(event)
+
     def get_http_method(self, type_: RequestType) -> callable:
-        return getattr(self.session, type_.value.lower())
\ No newline at end of file
+        return getattr(self.session, type_.value.lower())
+
+    # Request flows shared by both subclasses. Each is a generator that yields
+    # the steps above and is driven by the subclass's `_run`, so the retry,
+    # refresh and caching logic is written once for blocking and async I/O.
+
+    def _make_request_flow(self, ri: RequestInfo, allow_retry: bool) -> Flow:
+        if allow_retry and self._needs_proactive_refresh():
+            stale_tokens = self._tokens
+            yield _Refresh(stale_tokens)
+            self._swap_stale_authorization(ri, stale_tokens, (yield _JwtHeader()))
+        sent_with_tokens = self._tokens
+        try:
+            return (yield _SendCoalesced(ri))
+        except RequestError as e:
+            if e.status_code != HTTPStatus.UNAUTHORIZED or not allow_retry:
+                raise
+            self.logger.info("401 error, refreshing access token...")
+            yield _Refresh(sent_with_tokens)
+            ri.headers = yield _JwtHeader()
+            return (yield _SendCoalesced(ri))
+
+    def _send_cached_flow(self, ri: RequestInfo) -> Flow:
+        """Serve GETs from `response_cache` when fresh, revalidating stale entries."""
+        cache = self.response_cache
+        if cache is None or not cache.accepts(ri):
+            return (yield from self._send_encoded_flow(ri))
+        key = cache.key_for(ri)
+        entry = cache.lookup(key)
+        if entry is not None and entry.is_fresh():
+            return cache.to_response(entry)
+        response_info = yield from self._send_encoded_flow(
+            cache.conditional_request(ri, entry),
+            capture_headers=True
+        )
+        return cache.update(key, entry, response_info)
+
+    def _send_encoded_flow(self, ri: RequestInfo, capture_headers: bool = False) -> Flow:
+        """Send `ri` with its body compressed per `compression`, uncompressed if the server rejects that."""
+        if self.compression is None:
+            return (yield from self._send_with_retries_flow(ri, capture_headers))
+        encoded, body_bytes = self._encode_request(ri)
+        if body_bytes is None:
+            return (yield from self._send_with_retries_flow(encoded, capture_headers))
+        try:
+            return (yield from self._send_with_retries_flow(encoded, capture_headers, body_bytes))
+        except RequestError as e:
+            if e.status_code != HTTPStatus.UNSUPPORTED_MEDIA_TYPE:
+                raise
+        host = urlsplit(ri.url).netloc
+        self.logger.info("%s rejected a compressed body, sending uncompressed bodies from now on", host)
+        self._identity_hosts.add(host)
+        encoded, _ = self._encode_request(ri)
+        return (yield from self._send_with_retries_flow(encoded, capture_headers))
+
+    def _encode_request(self, ri: RequestInfo) -> tuple[RequestInfo, Optional[int]]:
+        """
+        `ri` with `Accept-Encoding` set and its JSON body compressed if large enough.
+
+        Returns: The request to send, and the size of the body before
+            compression if it was compressed.
+        """
+        config = self.compression
+        headers = dict(ri.headers or {})
+        accept_encoding = self.transport.accept_encoding
+        if (
+            config.accept_encoding
+            and accept_encoding is not None
+            and not any(name.lower() == "accept-encoding" for name in headers)
+        ):
+            headers["Accept-Encoding"] = accept_encoding
+        update = {"headers": headers}
+        body_bytes = None
+        if ri.json_ is not None and urlsplit(ri.url).netloc not in self._identity_hosts:
+            body = json.dumps(ri.json_, separators=(",", ":")).encode()
+            if len(body) >= config.min_size:
+                headers["Content-Type"] = "application/json"
+                headers["Content-Encoding"] = config.encoding.value
+                update["json_"] = None
+                update["content"] = compress(body, config.encoding, config.level)
+                body_bytes = len(body)
+        return ri.model_copy(update=update), body_bytes
+
+    def _send_with_retries_flow(
+        self,
+        ri: RequestInfo,
+        capture_headers: bool = False,
+        body_bytes: Optional[int] = None
+    ) -> Flow:
+        breaker = self._circuit_breaker_for(ri.url) if self.circuit_breakers else None
+        # Measured once rather than on every attempt
+        request_bytes = request_body_size(ri) if self.hooks is not None else None
+        attempt = 1
+        generation = None
+        while True:
+            if breaker is not None:
+                # Fails fast with CircuitOpenError, which is never retried
+                generation = breaker.acquire()
+            try:
+                if self.rate_limiter is not None:
+                    wait = self.rate_limiter.reserve(ri.url)
+                    if wait:
+                        yield _Sleep(wait)
+                response_info = yield from self._attempt_flow(
+                    ri, capture_headers, attempt, body_bytes, request_bytes
+                )
+            except RequestError as e:
+                self._observe_attempt(ri, breaker, generation, e.status_code, e.retry_after)
+                delay = self._retry_delay(ri, attempt, e.status_code, e.retry_after)
+                if delay is None:
+                    raise
+            except self.transport.connection_errors:
+                self._observe_attempt(ri, breaker, generation, None)
+                delay = self._retry_delay(ri, attempt, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                if breaker is not None:
+                    breaker.release(generation)
+                raise
+            else:
+                self._observe_attempt(ri, breaker, generation, response_info.status_code)
+                return response_info
+            yield _Sleep(delay)
+            attempt += 1
+
+    def _attempt_flow(
+        self,
+        ri: RequestInfo,
+        capture_headers: bool,
+        attempt: int,
+        body_bytes: Optional[int] = None,
+        request_bytes: Optional[int] = None
+    ) -> Flow:
+        """Send `ri` once, reporting the attempt to `hooks` if set."""
+        if self.hooks is None:
+            response = yield _Send(ri)
+            return self._response_info(ri, response, capture_headers)
+        event = self._start_request_event(ri, attempt, body_bytes, request_bytes)
+        try:
+            response = yield _Send(ri)
+        except RequestError as e:
+            self._finish_request_event(event, e.status_code, e)
+            raise
+        except BaseException as e:
+            self._finish_request_event(event, None, e)
+            raise
+        event.response_bytes = response.content_length
+        self._finish_request_event(event, response.status_code)
+        return self._response_info(ri, response, capture_headers)
+
+    def _response_info(
+        self,
+        ri: RequestInfo,
+        response: TransportResponse,
+        capture_headers: bool
+    ) -> ResponseInfo:
+        data = response.data
+        if ri.response_mode == ResponseMode.STREAM:
+            loads = self.json_decoder or json.loads
+            if hasattr(data, "__aiter__"):
+                data = aiter_items(data, loads)
+            else:
+                data = iter_items(data, loads)
+        return ResponseInfo.model_construct(
+            status_code=HTTPStatus(response.status_code),
+            data=data,
+            headers=lower_case_headers(response.headers) if capture_headers else None
+        )
+
+    def _refresh_flow(self) -> Flow:
+        """Refresh access and refresh tokens, logging in again if the refresh token has expired."""
+        if self._tokens is not None and self._tokens.refresh_token_expired():
+            self._set_tokens((yield _Login()))
+            return
+        rqi = RequestInfo.model_construct(
+            type_=RequestType.POST,
+            url=self._get_refresh_access_token_url(),
+            headers=(yield _RefreshJwtHeader()),
+            priority=RequestPriority.AUTH
+        )
+        try:
+            with self._auth_event("refresh"):
+                rsi = yield _MakeRequest(rqi, allow_retry=False)
+            self._set_tokens(self._tokens_from_data(rsi.data))
+        except RequestError as e:
+            if e.status_code == HTTPStatus.UNAUTHORIZED:  # Token expired, retry logging in
+                self._set_tokens((yield _Login()))
+
+    def _login_flow(self) -> Flow:
+        request_info = self.build_login_request_info()
+        # A 401 on login means bad credentials; refreshing cannot help
+        with self._auth_event("login"):
+            response_info = yield _MakeRequest(request_info, allow_retry=False)
+        return self._tokens_from_data(response_info.data)
+
+    def _load_api_key_flow(self) -> Flow:
+        request_info = RequestInfo.model_construct(
+            type_=RequestType.POST,
+            url=self._get_api_key_url(),
+            headers=(yield _JwtHeader()),
+            priority=RequestPriority.AUTH
+        )
+        response_info = yield _MakeRequest(request_info, allow_retry=True)
+        self._set_api_key(response_info.data["api_key"])
\ No newline at end of file
@@ -1,64 +1,164 @@
+import asyncio
+from collections import deque
 from contextlib import asynccontextmanager
-from http import HTTPStatus
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional
 from typing_extensions import override
 
-from aiohttp import ClientSession, ClientResponseError
+from aiohttp import ClientSession
 
-from pdap_access_manager.access_manager._base import AccessManagerBase
-from pdap_access_manager.enums import RequestType
+from pdap_access_manager.access_manager._base import AccessManagerBase, _InFlight, Flow, _Sleep, _Send, \
+    _SendCoalesced, _MakeRequest, _Refresh, _Login, _JwtHeader, _RefreshJwtHeader
+from pdap_access_manager.constants import DEFAULT_MAX_CONCURRENCY, DEFAULT_READ_AHEAD, DEFAULT_PAGE_PARAM, \
+    DEFAULT_RECORDS_KEY
+from pdap_access_manager.enums import ResponseMode, RequestPriority
 from pdap_access_manager.exceptions import TokensNotSetError, RequestError
-from pdap_access_manager.helpers import authorization_from_token
+from pdap_access_manager.helpers import authorization_from_token, url_has_prefix
 from pdap_access_manager.models.request import RequestInfo
 from pdap_access_manager.models.response import ResponseInfo
 from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.token_store import StoreLock
+from pdap_access_manager.transports._base import AsyncTransport, TransportResponse
+from pdap_access_manager.transports.aiohttp_ import AiohttpTransport
+
+
+async def _acquire_off_loop(lock: StoreLock) -> None:
+    """Acquire `lock` in a thread; if the wait is cancelled, release it once the thread gets it."""
+    acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        def _release(future: asyncio.Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                lock.release()
+
+        acquiring.add_done_callback(_release)
+        raise
+
+
+async def _aiter_requests(
+    ris: Iterable[RequestInfo] | AsyncIterable[RequestInfo]
+) -> AsyncIterator[RequestInfo]:
+    if isinstance(ris, AsyncIterable):
+        async for ri in ris:
+            yield ri
+    else:
+        for ri in ris:
+            yield ri
 
 
 class AccessManagerAsync(AccessManagerBase):
     """
     Manages login, api key, access and refresh tokens
+
+    Token refreshes and lazy logins are single-flight: when many coroutines
+    need new tokens at once, only one request is sent to PDAP and every
+    other coroutine awaits its result.
+
+    With `proactive_refresh=True`, a background task refreshes the access
+    token shortly before it expires, so requests rarely hit a 401.
     """
-    @override
-    def _expected_session_type(
-        self
-    ) -> type[ClientSession]:
-        return ClientSession
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._login_task: Optional[asyncio.Task] = None
+        self._proactive_refresh_task: Optional[asyncio.Task] = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {
+            base_url: asyncio.Semaphore(limit)
+            for base_url, limit in self._host_limits().items()
+        }
 
     @override
-    def _initialize_session(
-        self
-    ) -> ClientSession:
-        return ClientSession()
+    def _default_transport(self, session: Optional[ClientSession]) -> AsyncTransport:
+        return AiohttpTransport(session, self.transport_config)
 
     @asynccontextmanager
     async def with_session(self) -> AsyncGenerator["AccessManagerAsync", Any]:
         """Allows just the session lifecycle to be managed."""
-        created_session = False
-        if self._session is None:
-            self._session = self._initialize_session()
-            created_session = True
-
+        created_session = self.transport.open()
         try:
             yield self
         finally:
+            await self._stop_proactive_refresh()
             if created_session:
-                await self._session.close()
-                self._session = None
+                await self.transport.close()
 
     async def __aenter__(self):
         """
-        Create session if not already set
+        Create session if not already set, and warm up if `warm_up_on_enter`
         """
-        if self._session is None:
-            self._session = ClientSession()
+        created_session = self.transport.open()
+        if not self.warm_up_on_enter:
+            return self
+        try:
+            await self.warm_up()
+        except BaseException:
+            await self._stop_proactive_refresh()
+            if created_session:
+                await self.transport.close()
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """
         Close session
         """
-        if self._external_session is None and self._session is not None:
-            await self._session.close()
+        await self._stop_proactive_refresh()
+        await self.transport.close()
+
+    def _ensure_proactive_refresh(self) -> None:
+        """
+        Start the background refresh task if enabled, not already running,
+        and there is a token expiry to wait for.
+        """
+        if not self.proactive_refresh:
+            return
+        task = self._proactive_refresh_task
+        if task is not None and not task.done():
+            return
+        # Checked here too, so requests don't each start a task that exits at once
+        tokens = self._tokens
+        if tokens is None or tokens.seconds_until_access_refresh() is None:
+            return
+        self._proactive_refresh_task = asyncio.ensure_future(
+            self._proactive_refresh_loop()
+        )
+
+    async def _stop_proactive_refresh(self) -> None:
+        task = self._proactive_refresh_task
+        self._proactive_refresh_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _proactive_refresh_loop(self) -> None:
+        """
+        Sleep until the access token is about to expire, then refresh it.
+        Exits when the expiry is unknown; the next request restarts it.
+        """
+        refreshed = False
+        while True:
+            tokens = self._tokens
+            if tokens is None:
+                return
+            delay = tokens.seconds_until_access_refresh()
+            if delay is None:
+                return
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif refreshed:
+                # New tokens are already inside the skew margin; don't spin
+                return
+            try:
+                await self._refresh_single_flight(tokens)
+            except Exception:
+                self.logger.exception("Proactive token refresh failed")
+                return
+            refreshed = True
 
     @override
     @property
@@ -66,7 +166,7 @@ class AccessManagerAsync(AccessManagerBase):
         try:
             return self.tokens.access_token
         except TokensNotSetError:
-            self._tokens = await self.login()
+            await self._login_single_flight()
             return self.tokens.access_token
 
     @override
@@ -75,22 +175,121 @@ class AccessManagerAsync(AccessManagerBase):
         try:
             return self.tokens.refresh_token
         except TokensNotSetError:
-            self._tokens = await self.login()
+            await self._login_single_flight()
             return self.tokens.refresh_token
 
+    async def _single_flight(
+        self,
+        attr: str,
+        factory: Callable[[], Awaitable[None]]
+    ) -> None:
+        """
+        Run `factory` at most once at a time, stored under `attr`.
+        Callers arriving while it is in flight await the same task.
+        The task is shielded so a cancelled waiter does not cancel it.
+        """
+        task: Optional[asyncio.Task] = getattr(self, attr)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            setattr(self, attr, task)
+
+            def _clear(done: asyncio.Task) -> None:
+                if getattr(self, attr) is done:
+                    setattr(self, attr, None)
+
+            task.add_done_callback(_clear)
+        await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def _holding_store_lock(self) -> AsyncGenerator[None, Any]:
+        """Hold the token store's refresh lock, acquired off the event loop."""
+        if self.token_store is None:
+            yield
+            return
+        lock = self.token_store.refresh_lock()
+        await _acquire_off_loop(lock)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    async def _login_single_flight(self) -> None:
+        """
+        Log in and store the tokens, sharing any login already in flight.
+        Tokens another process saved to the token store are used instead, if present.
+        """
+        async def _login() -> None:
+            async with self._holding_store_lock():
+                if self._tokens is not None or self._adopt_stored_tokens(None):
+                    return
+                self._set_tokens(await self.login())
+
+        await self._single_flight("_login_task", _login)
+
+    async def _refresh_single_flight(
+        self,
+        stale_tokens: Optional[TokensInfo]
+    ) -> None:
+        """
+        Refresh the tokens, sharing any refresh already in flight.
+        If the tokens were replaced since `stale_tokens` was read,
+        another coroutine already refreshed them and nothing is sent.
+        Likewise if another process saved new tokens to the token store.
+        """
+        if self._refresh_task is None and self._tokens is not stale_tokens:
+            return
+
+        async def _refresh() -> None:
+            if stale_tokens is None:
+                # Nothing to share yet; a lazy login takes the store lock itself
+                await self.refresh_access_token()
+                return
+            async with self._holding_store_lock():
+                if self._adopt_stored_tokens(stale_tokens):
+                    return
+                await self.refresh_access_token()
+
+        await self._single_flight("_refresh_task", _refresh)
+
+    async def _run(self, flow: Flow) -> Any:
+        """Drive a request flow from the base class, awaiting each step it yields."""
+        value = None
+        error: Optional[BaseException] = None
+        while True:
+            try:
+                step = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = await self._perform(step), None
+            except BaseException as e:
+                value, error = None, e
+
+    async def _perform(self, step) -> Any:
+        if isinstance(step, _Send):
+            return await self._send_limited(step.ri)
+        if isinstance(step, _Sleep):
+            await asyncio.sleep(step.seconds)
+            return None
+        if isinstance(step, _SendCoalesced):
+            return await self._send_coalesced(step.ri)
+        if isinstance(step, _MakeRequest):
+            return await self.make_request(step.ri, allow_retry=step.allow_retry)
+        if isinstance(step, _JwtHeader):
+            return await self.jwt_header()
+        if isinstance(step, _RefreshJwtHeader):
+            return await self.refresh_jwt_header()
+        if isinstance(step, _Refresh):
+            return await self._refresh_single_flight(step.stale_tokens)
+        if isinstance(step, _Login):
+            return await self.login()
+        raise TypeError(f"Unknown request flow step: {step!r}")
 
     @override
     async def load_api_key(self) -> None:
         """Load API key from PDAP:
         """
-        url = self._get_api_key_url()
-        request_info = RequestInfo(
-            type_ = RequestType.POST,
-            url=url,
-            headers=await self.jwt_header()
-        )
-        response_info = await self.make_request(request_info)
-        self.api_key = response_info.data["api_key"]
+        await self._run(self._load_api_key_flow())
 
     @override
     async def refresh_access_token(self):
@@ -98,69 +297,285 @@ class AccessManagerAsync(AccessManagerBase):
         Refresh access and refresh tokens from PDAP
         :return:
         """
-        url = self._get_refresh_access_token_url()
-        rqi = RequestInfo(
-            type_=RequestType.POST,
-            url=url,
-            headers=await self.refresh_jwt_header()
-        )
-        try:
-            rsi = await self.make_request(rqi, allow_retry=False)
-            data = rsi.data
-            self._tokens = TokensInfo(
-                access_token=data['access_token'],
-                refresh_token=data['refresh_token']
-            )
-        except RequestError as e:
-            if e.status_code == HTTPStatus.UNAUTHORIZED:  # Token expired, retry logging in
-                self._tokens = await self.login()
+        await self._run(self._refresh_flow())
 
     @override
-    async def make_request(self, ri: RequestInfo, allow_retry: bool = True) -> ResponseInfo:
+    async def make_request(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> ResponseInfo:
         """
         Make request to PDAP
 
+        On a 401, the tokens are refreshed once for all concurrent callers
+        and the request is replayed with the new JWT header.
+        Other transient failures are retried according to `retry_policy`.
+
+        Args:
+            priority: Scheduling class for `scheduler`, overriding `ri.priority`
+
         Raises:
-            ClientResponseError: If request fails
+            RequestError: If request fails
+        """
+        ri = self._with_priority(ri, priority)
+        if allow_retry:
+            self._ensure_proactive_refresh()
+        return await self._run(self._make_request_flow(ri, allow_retry))
+
+    async def _send_coalesced(self, ri: RequestInfo) -> ResponseInfo:
+        """
+        Send `ri`, or with `coalesce_requests` await an identical GET already in flight.
+        The shared send is shielded so a cancelled caller does not cancel it.
         """
+        key = self._coalesce_key(ri)
+        if key is None:
+            return await self._run(self._send_cached_flow(ri))
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            async def _send() -> ResponseInfo:
+                try:
+                    return await self._run(self._send_cached_flow(ri))
+                finally:
+                    # Removed before the result is set, so no caller joins afterwards
+                    del self._in_flight[key]
+
+            in_flight = self._in_flight[key] = _InFlight(asyncio.ensure_future(_send()))
+        in_flight.waiters += 1
+        response_info = await asyncio.shield(in_flight.result)
+        return self._coalesced_response(in_flight, response_info)
+
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        for base_url, semaphore in self._host_semaphores.items():
+            if url_has_prefix(url, base_url):
+                return semaphore
+        return None
+
+    async def _send_limited(self, ri: RequestInfo) -> TransportResponse:
+        """Send `ri` once, in its turn with `scheduler` if any."""
+        if self.scheduler is None:
+            return await self._send_within_concurrency_limit(ri)
+        priority = await self.scheduler.acquire_async(ri.priority)
+        try:
+            return await self._send_within_concurrency_limit(ri)
+        finally:
+            self.scheduler.release(priority)
+
+    async def _send_within_concurrency_limit(self, ri: RequestInfo) -> TransportResponse:
+        """Send `ri` once, within the adaptive concurrency limit for its base URL if any."""
+        limiter = self._concurrency_limiter_for(ri.url) if self.concurrency_limiters else None
+        if limiter is None:
+            return await self._send_within_host_limit(ri)
+        started = await limiter.acquire_async()
+        try:
+            response = await self._send_within_host_limit(ri)
+        except BaseException as e:
+            self._finish_concurrency_slot(limiter, started, None, e)
+            raise
+        self._finish_concurrency_slot(limiter, started, response)
+        return response
+
+    async def _send_within_host_limit(self, ri: RequestInfo) -> TransportResponse:
+        """Send `ri` once, within the connection limit for its base URL if any."""
+        semaphore = self._host_semaphore(ri.url) if self._host_semaphores else None
+        if semaphore is None:
+            return await self.transport.send(ri, self.json_decoder)
+        async with semaphore:
+            return await self.transport.send(ri, self.json_decoder)
+
+    async def _make_request_or_error(self, ri: RequestInfo) -> ResponseInfo | RequestError:
+        """Make a request, returning rather than raising any failure."""
         try:
-            method = self.get_http_method(ri.type_)
-            async with method(**ri.kwargs()) as response:
-                response.raise_for_status()
-                json = await response.json()
-                return ResponseInfo(
-                    status_code=HTTPStatus(response.status),
-                    data=json
+            return await self.make_request(ri)
+        except RequestError as e:
+            return e
+        except self.transport.errors as e:
+            error = RequestError(
+                message=f"Error making {ri.type_} request to {ri.url}: {e!r}",
+                status_code=None
+            )
+            error.__cause__ = e
+            return error
+
+    @override
+    async def make_requests(
+        self,
+        ris: Iterable[RequestInfo] | AsyncIterable[RequestInfo],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True
+    ) -> AsyncGenerator[tuple[int, ResponseInfo | RequestError], None]:
+        """
+        Make many requests with at most `max_concurrency` in flight
+
+        Requests are pulled from `ris` only as slots free up, so a lazy
+        (async) generator of any length is consumed with bounded memory.
+        Failed requests are yielded as `RequestError` values instead of
+        cancelling the batch.
+
+        Args:
+            ris: Iterable or async iterable of requests to make
+            max_concurrency: Maximum number of requests in flight
+            ordered: Yield in input order if True, otherwise as completed
+
+        Yields: `(index, ResponseInfo | RequestError)` pairs,
+            where `index` is the position of the request in `ris`
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        source = _aiter_requests(ris)
+        pending: deque[tuple[int, asyncio.Task]] = deque()
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_concurrency:
+                    try:
+                        ri = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    task = asyncio.ensure_future(self._make_request_or_error(ri))
+                    pending.append((next_index, task))
+                    next_index += 1
+                if not pending:
+                    return
+                if ordered:
+                    index, task = pending.popleft()
+                    yield index, await task
+                    continue
+                await asyncio.wait(
+                    [task for _, task in pending],
+                    return_when=asyncio.FIRST_COMPLETED
                 )
-        except ClientResponseError as e:
-            if e.status == 401 and allow_retry:  # Unauthorized, token expired?
-                print("401 error, refreshing access token...")
-                await self.refresh_access_token()
-                ri.headers = await self.jwt_header()
-                return await self.make_request(ri, allow_retry=False)
-            raise RequestError(
-                message=f"Error making {ri.type_} request to {ri.url}: {e.message}",
-                status_code=HTTPStatus(e.status)
-            ) from e
+                still_pending = deque()
+                finished = []
+                for index, task in pending:
+                    (finished if task.done() else still_pending).append((index, task))
+                pending = still_pending
+                for index, task in finished:
+                    yield index, task.result()
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            await source.aclose()
 
+    @override
+    async def paginate(
+        self,
+        ri: RequestInfo,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        page_param: str = DEFAULT_PAGE_PARAM,
+        records_key: str = DEFAULT_RECORDS_KEY,
+        start_page: int = 1
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Yield records one at a time across the pages of a list or search endpoint
+
+        While the caller works through one page, the next `read_ahead` pages
+        are already being fetched. Only those pages are held in memory,
+        however large the full result set. Iteration stops at the first
+        page with no records.
+
+        Args:
+            ri: The request for the endpoint; `page_param` is added to its params
+            read_ahead: Number of pages to fetch ahead of the current one
+            page_param: Query parameter holding the page number
+            records_key: Key of the records list in each page's response
+            start_page: Number of the first page
+        """
+        if read_ahead < 0:
+            raise ValueError("read_ahead must not be negative")
+        pages: deque[asyncio.Task] = deque()
+        next_page = start_page
+        try:
+            while True:
+                while len(pages) <= read_ahead:
+                    page_ri = self._page_request_info(ri, page_param, next_page)
+                    pages.append(asyncio.ensure_future(self.make_request(page_ri)))
+                    next_page += 1
+                records = self._page_records(await pages.popleft(), records_key)
+                if not records:
+                    return
+                for record in records:
+                    yield record
+        finally:
+            for task in pages:
+                task.cancel()
+            await asyncio.gather(*pages, return_exceptions=True)
 
     @override
-    async def login(self) -> TokensInfo:
+    async def stream(self, ri: RequestInfo) -> AsyncGenerator[Any, None]:
         """
-        Login to PDAP and retrieve access and refresh tokens
+        Yield the items of a top-level JSON array or NDJSON body as they arrive
+
+        Only the item being received is held in memory, however large the body.
+        The request is retried and refreshed on a 401 like `make_request` until
+        the response starts; a failure partway through the body is raised as is.
+        Close the generator early (`aclose`) to release the connection.
+
+        Args:
+            ri: The request; its `response_mode` is set to `ResponseMode.STREAM`
+        """
+        ri = ri.model_copy(update={"response_mode": ResponseMode.STREAM})
+        items = (await self.make_request(ri)).data
+        try:
+            async for item in items:
+                yield item
+        finally:
+            await items.aclose()
+
+    @override
+    async def warm_up(self, connections: int = 1, load_api_key: bool = True) -> None:
+        """
+        Log in, load the API key and open connections to each base URL, concurrently
+
+        Steps that are already done (tokens or an API key passed in or loaded
+        from the token store) are skipped; an expired access token is refreshed.
+        Connections that fail to open are logged rather than raised.
+
+        Args:
+            connections: Connections to open to each base URL; at most
+                the transport's pool size are kept
+            load_api_key: Also load an API key if there is none yet
 
         Raises:
-            ClientResponseError: If login fails
+            RequestError: If login, refresh or loading the API key fails
         """
-        request_info = self.build_login_request_info()
-        response_info = await self.make_request(request_info)
-        data = response_info.data
-        return TokensInfo(
-            access_token=data["access_token"],
-            refresh_token=data["refresh_token"]
+        await asyncio.gather(
+            self._warm_up_auth(load_api_key),
+            *(self._preconnect(ri) for ri in self._warm_up_requests(connections))
         )
 
+    async def _warm_up_auth(self, load_api_key: bool) -> None:
+        tokens = self._tokens
+        if tokens is None:
+            if self._auth is None:
+                # API key only; there is nothing to log in with
+                return
+            await self._login_single_flight()
+        elif tokens.access_token_expired():
+            await self._refresh_single_flight(tokens)
+        self._ensure_proactive_refresh()
+        if load_api_key and self.api_key is None:
+            await self.load_api_key()
 
+    async def _preconnect(self, ri: RequestInfo) -> None:
+        try:
+            await self._send_within_host_limit(ri)
+        except (RequestError, *self.transport.errors) as e:
+            self._warm_up_failed(ri, e)
+
+    @override
+    async def login(self) -> TokensInfo:
+        """
+        Login to PDAP and retrieve access and refresh tokens
+
+        Raises:
+            ClientResponseError: If login fails
+        """
+        return await self._run(self._login_flow())
 
     @override
     async def jwt_header(self) -> dict:
@@ -193,3 +608,4 @@ class AccessManagerAsync(AccessManagerBase):
         return {
             "Authorization": f"Basic {self.api_key}"
         }
+
@@ -0,0 +1,395 @@
+import asyncio
+import time
+from http import HTTPStatus
+from typing import Callable, Optional, Sequence
+from typing_extensions import override
+
+from pdap_access_manager.access_manager._base import AccessManagerBase
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.credential_pool import Credential, CredentialPool, CredentialStats
+from pdap_access_manager.enums import CredentialStrategy, RequestPriority
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+from pdap_access_manager.models.retry import RetryPolicy
+from pdap_access_manager.models.tokens import TokensInfo
+
+# Set per credential rather than for the pool
+_CREDENTIAL_ARGS = ("auth", "tokens", "api_key", "token_store")
+# Built once by the pool and shared by every credential's manager
+_SHARED_ARGS = ("session", "transport", "circuit_breaker", "adaptive_concurrency", "concurrent")
+
+
+class _CredentialPoolMixin:
+    """
+    Construction and credential selection shared by the pooled managers.
+    Mixed in ahead of the manager class each credential uses.
+    """
+    _manager_class: type[AccessManagerBase]
+
+    def __init__(
+        self,
+        credentials: Sequence[Credential | AuthInfo],
+        strategy: CredentialStrategy = CredentialStrategy.LEAST_LOADED,
+        throttle_cooldown: float = 1.0,
+        max_throttle_cooldown: float = 60.0,
+        **kwargs
+    ):
+        """
+        Args:
+            credentials: The accounts to spread requests over
+            strategy: How the credential for each request is picked
+            throttle_cooldown: Seconds a credential is skipped after a 429
+                without `Retry-After`, doubled for each 429 in a row
+            max_throttle_cooldown: Upper bound on that cooldown
+
+        Other arguments are those of the manager each credential uses,
+        except the ones set per credential (`auth`, `tokens`, `api_key`
+        and `token_store`). A `rate_limiter` paces each credential on its
+        own: every credential's manager gets a copy of it.
+        """
+        for name in _CREDENTIAL_ARGS:
+            if kwargs.get(name) is not None:
+                raise ValueError(f"Pass {name} per credential, in a Credential")
+        credentials = [
+            credential if isinstance(credential, Credential) else Credential(auth=credential)
+            for credential in credentials
+        ]
+        super().__init__(**kwargs)
+        self.credential_pool = CredentialPool(
+            [self._credential_name(index, credential) for index, credential in enumerate(credentials)],
+            strategy=strategy,
+            throttle_cooldown=throttle_cooldown,
+            max_throttle_cooldown=max_throttle_cooldown
+        )
+        shared = {
+            name: value for name, value in kwargs.items()
+            if name not in _SHARED_ARGS and name not in _CREDENTIAL_ARGS and name != "rate_limiter"
+        }
+        # 429s come back to the pool, which moves the request to another credential
+        shared["retry_policy"] = self._without_throttle_retries(self.retry_policy)
+        self.managers = [
+            self._manager_class(
+                auth=credential.auth,
+                tokens=credential.tokens,
+                api_key=credential.api_key,
+                token_store=credential.token_store,
+                transport=self.transport,
+                # PDAP limits each account, so each gets its own buckets
+                rate_limiter=self.rate_limiter.copy() if self.rate_limiter is not None else None,
+                **shared
+            )
+            for credential in credentials
+        ]
+        for manager in self.managers:
+            self._share_state(manager)
+
+    @staticmethod
+    def _credential_name(index: int, credential: Credential) -> str:
+        if credential.name is not None:
+            return credential.name
+        if credential.auth is not None:
+            return credential.auth.email
+        return f"credential-{index}"
+
+    @staticmethod
+    def _without_throttle_retries(policy: Optional[RetryPolicy]) -> Optional[RetryPolicy]:
+        if policy is None or HTTPStatus.TOO_MANY_REQUESTS not in policy.retry_statuses:
+            return policy
+        return policy.model_copy(
+            update={"retry_statuses": policy.retry_statuses - {HTTPStatus.TOO_MANY_REQUESTS}}
+        )
+
+    def _share_state(self, manager: AccessManagerBase) -> None:
+        """Point `manager` at the pool's per-service state, which does not depend on the credential."""
+        manager.circuit_breakers = self.circuit_breakers
+        manager.concurrency_limiters = self.concurrency_limiters
+        manager._identity_hosts = self._identity_hosts
+
+    def credential_stats(self) -> dict[str, CredentialStats]:
+        """Load and throttling of each credential, for monitoring."""
+        return self.credential_pool.stats()
+
+    def _chosen_manager(self) -> AccessManagerBase:
+        return self.managers[self.credential_pool.choose()]
+
+    @staticmethod
+    def _with_authorization(ri: RequestInfo, header: dict) -> RequestInfo:
+        if ri.headers["Authorization"] == header["Authorization"]:
+            return ri
+        return ri.model_copy(update={"headers": {**ri.headers, **header}})
+
+    @staticmethod
+    def _authorization_scheme(ri: RequestInfo) -> Optional[str]:
+        """`Bearer` or `Basic` if `ri` carries a header of that scheme to swap for the credential's."""
+        if not ri.headers:
+            return None
+        authorization = ri.headers.get("Authorization")
+        if authorization is None:
+            return None
+        scheme = authorization.partition(" ")[0]
+        return scheme if scheme in ("Bearer", "Basic") else None
+
+    def _moves_on_throttle(self, ri: RequestInfo, attempt: int, error: RequestError, allow_retry: bool) -> bool:
+        """Whether a request throttled with a 429 should be sent again with another credential."""
+        if error.status_code != HTTPStatus.TOO_MANY_REQUESTS or not allow_retry or self.retry_policy is None:
+            return False
+        # The Retry-After throttles the credential rather than delaying the request
+        delay = self.retry_policy.next_delay(
+            type_=ri.type_,
+            attempt=attempt,
+            status_code=error.status_code,
+            retryable=ri.retryable
+        )
+        if delay is None:
+            return False
+        self.logger.info(
+            "%s request to %s was throttled (attempt %d), sending it with another credential",
+            ri.type_.value, ri.url, attempt
+        )
+        return True
+
+
+class AccessManagerPoolAsync(_CredentialPoolMixin, AccessManagerAsync):
+    """
+    Spreads requests over several PDAP accounts, to get past the
+    per-account rate limit
+
+    Each credential has its own `AccessManagerAsync` in `managers`, with its
+    own login, tokens, refresh and API key, and all of them share this
+    manager's session, circuit breakers and concurrency limits.
+    `make_request` picks a credential (see `CredentialPool`) and swaps the
+    request's Bearer or Basic `Authorization` header for that credential's;
+    requests without one are sent as they are. A 429 throttles the
+    credential, and with a `retry_policy` the request is sent again at once
+    with another one. `make_requests`, `paginate` and `stream` go through
+    `make_request`, and the header methods return the next credential's.
+    """
+    _manager_class = AccessManagerAsync
+
+    @override
+    def _share_state(self, manager: AccessManagerAsync) -> None:
+        super()._share_state(manager)
+        manager._host_semaphores = self._host_semaphores
+
+    @override
+    async def make_request(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> ResponseInfo:
+        """
+        Make request to PDAP with the least loaded credential that is not throttled
+
+        Raises:
+            RequestError: If request fails
+        """
+        ri = self._with_priority(ri, priority)
+        attempt = 1
+        while True:
+            index, wait = self.credential_pool.acquire()
+            status_code = retry_after = None
+            try:
+                if wait:
+                    await asyncio.sleep(wait)
+                manager = self.managers[index]
+                response_info = await manager.make_request(await self._for_credential(manager, ri), allow_retry)
+                status_code = response_info.status_code
+                return response_info
+            except RequestError as e:
+                status_code, retry_after = e.status_code, e.retry_after
+                if not self._moves_on_throttle(ri, attempt, e, allow_retry):
+                    raise
+            finally:
+                self.credential_pool.release(index, status_code, retry_after)
+            attempt += 1
+
+    async def _for_credential(self, manager: AccessManagerAsync, ri: RequestInfo) -> RequestInfo:
+        scheme = self._authorization_scheme(ri)
+        if scheme == "Bearer":
+            return self._with_authorization(ri, await manager.jwt_header())
+        if scheme == "Basic":
+            return self._with_authorization(ri, await manager.api_key_header())
+        return ri
+
+    @override
+    async def _warm_up_auth(self, load_api_key: bool) -> None:
+        await asyncio.gather(*(manager._warm_up_auth(load_api_key) for manager in self.managers))
+
+    @override
+    async def _stop_proactive_refresh(self) -> None:
+        await asyncio.gather(*(manager._stop_proactive_refresh() for manager in self.managers))
+
+    @override
+    @property
+    async def access_token(self) -> str:
+        return await self._chosen_manager().access_token
+
+    @override
+    @property
+    async def refresh_token(self) -> str:
+        return await self._chosen_manager().refresh_token
+
+    @override
+    async def login(self) -> TokensInfo:
+        """
+        Log in with the credential the next request would use
+
+        Returns: Its new tokens, which are not kept; see `login_all`
+        """
+        return await self._chosen_manager().login()
+
+    async def login_all(self) -> list[TokensInfo]:
+        """
+        Log in with every credential, keeping each one's tokens
+
+        Returns: The new tokens of each credential, in order
+        """
+        async def _login(manager: AccessManagerAsync) -> TokensInfo:
+            tokens = await manager.login()
+            manager._set_tokens(tokens)
+            return tokens
+
+        return list(await asyncio.gather(*(_login(manager) for manager in self.managers)))
+
+    @override
+    async def load_api_key(self) -> None:
+        """Load the API key of every credential."""
+        await asyncio.gather(*(manager.load_api_key() for manager in self.managers))
+
+    @override
+    async def refresh_access_token(self) -> None:
+        """Refresh the tokens of every credential."""
+        await asyncio.gather(*(manager.refresh_access_token() for manager in self.managers))
+
+    @override
+    async def jwt_header(self) -> dict:
+        """JWT header of the credential the next request would use."""
+        return await self._chosen_manager().jwt_header()
+
+    @override
+    async def refresh_jwt_header(self) -> dict:
+        return await self._chosen_manager().refresh_jwt_header()
+
+    @override
+    async def api_key_header(self) -> dict:
+        """API key header of the credential the next request would use."""
+        return await self._chosen_manager().api_key_header()
+
+
+class AccessManagerPoolSync(_CredentialPoolMixin, AccessManagerSync):
+    """
+    Spreads requests over several PDAP accounts, to get past the
+    per-account rate limit
+
+    The blocking counterpart of `AccessManagerPoolAsync`, with an
+    `AccessManagerSync` per credential in `managers`. Thread-safe like
+    `AccessManagerSync`; pass `concurrent=True` for a session per thread.
+    """
+    _manager_class = AccessManagerSync
+
+    @override
+    def make_request(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> ResponseInfo:
+        """
+        Make request to PDAP with the least loaded credential that is not throttled
+
+        Raises:
+            RequestError: If request fails
+        """
+        ri = self._with_priority(ri, priority)
+        attempt = 1
+        while True:
+            index, wait = self.credential_pool.acquire()
+            status_code = retry_after = None
+            try:
+                if wait:
+                    time.sleep(wait)
+                manager = self.managers[index]
+                response_info = manager.make_request(self._for_credential(manager, ri), allow_retry)
+                status_code = response_info.status_code
+                return response_info
+            except RequestError as e:
+                status_code, retry_after = e.status_code, e.retry_after
+                if not self._moves_on_throttle(ri, attempt, e, allow_retry):
+                    raise
+            finally:
+                self.credential_pool.release(index, status_code, retry_after)
+            attempt += 1
+
+    def _for_credential(self, manager: AccessManagerSync, ri: RequestInfo) -> RequestInfo:
+        scheme = self._authorization_scheme(ri)
+        if scheme == "Bearer":
+            return self._with_authorization(ri, manager.jwt_header())
+        if scheme == "Basic":
+            return self._with_authorization(ri, manager.api_key_header())
+        return ri
+
+    @override
+    def _warm_up_auth_steps(self, load_api_key: bool) -> list[Callable[[], None]]:
+        return [step for manager in self.managers for step in manager._warm_up_auth_steps(load_api_key)]
+
+    @override
+    @property
+    def access_token(self) -> str:
+        return self._chosen_manager().access_token
+
+    @override
+    @property
+    def refresh_token(self) -> str:
+        return self._chosen_manager().refresh_token
+
+    @override
+    def login(self) -> TokensInfo:
+        """
+        Log in with the credential the next request would use
+
+        Returns: Its new tokens, which are not kept; see `login_all`
+        """
+        return self._chosen_manager().login()
+
+    def login_all(self) -> list[TokensInfo]:
+        """
+        Log in with every credential, keeping each one's tokens
+
+        Returns: The new tokens of each credential, in order
+        """
+        tokens = []
+        for manager in self.managers:
+            with manager._login_lock:
+                manager._set_tokens(manager.login())
+            tokens.append(manager.tokens)
+        return tokens
+
+    @override
+    def load_api_key(self) -> None:
+        """Load the API key of every credential."""
+        for manager in self.managers:
+            manager.load_api_key()
+
+    @override
+    def refresh_access_token(self) -> None:
+        """Refresh the tokens of every credential."""
+        for manager in self.managers:
+            manager.refresh_access_token()
+
+    @override
+    def jwt_header(self) -> dict:
+        """JWT header of the credential the next request would use."""
+        return self._chosen_manager().jwt_header()
+
+    @override
+    def refresh_jwt_header(self) -> dict:
+        return self._chosen_manager().refresh_jwt_header()
+
+    @override
+    def api_key_header(self) -> dict:
+        """API key header of the credential the next request would use."""
+        return self._chosen_manager().api_key_header()
@@ -1,24 +1,85 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from contextlib import contextmanager
-from http import HTTPStatus
-from typing import Generator, Any
+from typing import Generator, Any, Callable, Iterable, Optional
 from typing_extensions import override
 
-from requests import Session, HTTPError
+from requests import Session
 
-from pdap_access_manager.access_manager._base import AccessManagerBase
-from pdap_access_manager.enums import RequestType
+from pdap_access_manager.access_manager._base import AccessManagerBase, _InFlight, Flow, _Sleep, _Send, \
+    _SendCoalesced, _MakeRequest, _Refresh, _Login, _JwtHeader, _RefreshJwtHeader
+from pdap_access_manager.constants import DEFAULT_MAX_CONCURRENCY, DEFAULT_READ_AHEAD, DEFAULT_PAGE_PARAM, \
+    DEFAULT_RECORDS_KEY
+from pdap_access_manager.enums import ResponseMode, RequestPriority
 from pdap_access_manager.exceptions import TokensNotSetError, RequestError
 from pdap_access_manager.helpers import authorization_from_token
 from pdap_access_manager.models.request import RequestInfo
 from pdap_access_manager.models.response import ResponseInfo
 from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.transports._base import Transport, TransportResponse
+from pdap_access_manager.transports.requests_ import RequestsTransport
 
 
 class AccessManagerSync(AccessManagerBase):
+    """
+    Manages login, api key, access and refresh tokens
+
+    With `proactive_refresh=True`, each request first checks whether the
+    access token is about to expire and refreshes it before sending.
+
+    Instances are thread-safe: lazy login, API key loading, session creation
+    and token refresh are guarded, and concurrent 401s trigger one refresh.
+    With `concurrent=True`, each thread also gets its own `Session`
+    (unless one or a transport is passed in), which suits sharing one
+    manager across `ThreadPoolExecutor` workers.
+    """
+
+    def __init__(self, *args, concurrent: bool = False, **kwargs):
+        # Read by `_default_transport` during the base constructor
+        self.concurrent = concurrent
+        super().__init__(*args, **kwargs)
+        self._login_lock = threading.RLock()
+        self._refresh_lock = threading.RLock()
+        self._api_key_lock = threading.RLock()
+        self._in_flight_lock = threading.Lock()
+        # Worker threads for batches, reused so that their sessions and connections are too
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._executor_lock = threading.Lock()
+
+    def _shared_executor(self, workers: int) -> ThreadPoolExecutor:
+        """The manager's worker threads, grown to at least `workers` if needed."""
+        with self._executor_lock:
+            if self._executor is None or self._executor_workers < workers:
+                if self._executor is not None:
+                    # Work already submitted finishes; its threads then exit
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=workers)
+                self._executor_workers = workers
+            return self._executor
+
+    def _shutdown_executor(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+            self._executor_workers = 0
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _cancel(futures: Iterable[Future]) -> None:
+        """Cancel `futures` that have not started, and wait for the rest."""
+        wait([future for future in futures if not future.cancel()])
 
     @override
-    def _initialize_session(self) -> Session:
-        return Session()
+    def _default_transport(self, session: Optional[Session]) -> Transport:
+        return RequestsTransport(
+            session,
+            self.transport_config,
+            concurrent=self.concurrent,
+            host_limits=self._host_limits()
+        )
 
     @override
     @property
@@ -26,7 +87,7 @@ class AccessManagerSync(AccessManagerBase):
         try:
             return self.tokens.access_token
         except TokensNotSetError:
-            self._tokens = self.login()
+            self._login_single_flight()
             return self.tokens.access_token
 
     @override
@@ -35,72 +96,360 @@ class AccessManagerSync(AccessManagerBase):
         try:
             return self.tokens.refresh_token
         except TokensNotSetError:
-            self._tokens = self.login()
+            self._login_single_flight()
             return self.tokens.refresh_token
 
+    @contextmanager
+    def _holding_store_lock(self) -> Generator[None, Any, Any]:
+        """Hold the token store's refresh lock, if there is a token store."""
+        if self.token_store is None:
+            yield
+            return
+        with self.token_store.refresh_lock():
+            yield
+
+    def _login_single_flight(self) -> None:
+        """
+        Log in and store the tokens unless another thread already has.
+        Tokens another process saved to the token store are used instead, if present.
+        """
+        with self._login_lock:
+            if self._tokens is not None:
+                return
+            with self._holding_store_lock():
+                if self._adopt_stored_tokens(None):
+                    return
+                self._set_tokens(self.login())
+
+    def _refresh_single_flight(self, stale_tokens: Optional[TokensInfo]) -> None:
+        """
+        Refresh the tokens once for all threads holding `stale_tokens`.
+        If another thread replaced them while this one waited, nothing is sent.
+        Likewise if another process saved new tokens to the token store.
+        """
+        with self._refresh_lock:
+            if self._tokens is not stale_tokens:
+                return
+            if stale_tokens is None:
+                # Nothing to share yet; a lazy login takes the store lock itself
+                self.refresh_access_token()
+                return
+            with self._holding_store_lock():
+                if self._adopt_stored_tokens(stale_tokens):
+                    return
+                self.refresh_access_token()
+
+    def _run(self, flow: Flow) -> Any:
+        """Drive a request flow from the base class, performing each step it yields."""
+        value = None
+        error: Optional[BaseException] = None
+        while True:
+            try:
+                step = flow.send(value) if error is None else flow.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                value, error = self._perform(step), None
+            except BaseException as e:
+                value, error = None, e
+
+    def _perform(self, step) -> Any:
+        if isinstance(step, _Send):
+            return self._send_limited(step.ri)
+        if isinstance(step, _Sleep):
+            time.sleep(step.seconds)
+            return None
+        if isinstance(step, _SendCoalesced):
+            return self._send_coalesced(step.ri)
+        if isinstance(step, _MakeRequest):
+            return self.make_request(step.ri, allow_retry=step.allow_retry)
+        if isinstance(step, _JwtHeader):
+            return self.jwt_header()
+        if isinstance(step, _RefreshJwtHeader):
+            return self.refresh_jwt_header()
+        if isinstance(step, _Refresh):
+            return self._refresh_single_flight(step.stale_tokens)
+        if isinstance(step, _Login):
+            with self._login_lock:
+                return self.login()
+        raise TypeError(f"Unknown request flow step: {step!r}")
+
+    def _send_limited(self, ri: RequestInfo) -> TransportResponse:
+        """Send `ri` once, in its turn with `scheduler` if any."""
+        if self.scheduler is None:
+            return self._send_within_concurrency_limit(ri)
+        priority = self.scheduler.acquire(ri.priority)
+        try:
+            return self._send_within_concurrency_limit(ri)
+        finally:
+            self.scheduler.release(priority)
+
+    def _send_within_concurrency_limit(self, ri: RequestInfo) -> TransportResponse:
+        """Send `ri` once, within the adaptive concurrency limit for its base URL if any."""
+        limiter = self._concurrency_limiter_for(ri.url) if self.concurrency_limiters else None
+        if limiter is None:
+            return self.transport.send(ri, self.json_decoder)
+        started = limiter.acquire()
+        try:
+            response = self.transport.send(ri, self.json_decoder)
+        except BaseException as e:
+            self._finish_concurrency_slot(limiter, started, None, e)
+            raise
+        self._finish_concurrency_slot(limiter, started, response)
+        return response
+
     @override
     def load_api_key(self) -> None:
-        url = self._get_api_key_url()
-        request_info = RequestInfo(
-            type_=RequestType.POST,
-            url=url,
-            headers=self.jwt_header()
-        )
-        response_info = self.make_request(request_info)
-        self.api_key = response_info.data["api_key"]
+        self._run(self._load_api_key_flow())
 
     @override
     def refresh_access_token(self) -> None:
-        url = self._get_refresh_access_token_url()
-        rqi = RequestInfo(
-            type_=RequestType.POST,
-            url=url,
-            headers=self.refresh_jwt_header()
-        )
+        self._run(self._refresh_flow())
+
+    @override
+    def make_request(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> ResponseInfo:
+        """
+        Make request to PDAP
+
+        On a 401, the tokens are refreshed once for all threads
+        and the request is replayed with the new JWT header.
+        Other transient failures are retried according to `retry_policy`.
+
+        Args:
+            priority: Scheduling class for `scheduler`, overriding `ri.priority`
+
+        Raises:
+            RequestError: If request fails
+        """
+        ri = self._with_priority(ri, priority)
+        return self._run(self._make_request_flow(ri, allow_retry))
+
+    def _send_coalesced(self, ri: RequestInfo) -> ResponseInfo:
+        """Send `ri`, or with `coalesce_requests` wait for an identical GET already in flight in another thread."""
+        key = self._coalesce_key(ri)
+        if key is None:
+            return self._run(self._send_cached_flow(ri))
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self._in_flight[key] = _InFlight(Future())
+            in_flight.waiters += 1
+        if leader:
+            try:
+                response_info = self._run(self._send_cached_flow(ri))
+            except BaseException as e:
+                self._finish_in_flight(key)
+                in_flight.result.set_exception(e)
+                raise
+            self._finish_in_flight(key)
+            in_flight.result.set_result(response_info)
+        response_info = in_flight.result.result()
+        return self._coalesced_response(in_flight, response_info)
+
+    def _finish_in_flight(self, key: str) -> None:
+        # Removed before the result is set, so no caller joins afterwards
+        with self._in_flight_lock:
+            del self._in_flight[key]
+
+    def _make_request_or_error(self, ri: RequestInfo) -> ResponseInfo | RequestError:
+        """Make a request, returning rather than raising any failure."""
         try:
-            rsi = self.make_request(rqi, allow_retry=False)
-            data = rsi.data
-            self._tokens = TokensInfo(
-                access_token=data['access_token'],
-                refresh_token=data['refresh_token']
-            )
+            return self.make_request(ri)
         except RequestError as e:
-            if e.status_code == HTTPStatus.UNAUTHORIZED:  # Token expired, retry logging in
-                self._tokens = self.login()
+            return e
+        except self.transport.errors as e:
+            error = RequestError(
+                message=f"Error making {ri.type_} request to {ri.url}: {e!r}",
+                status_code=None
+            )
+            error.__cause__ = e
+            return error
 
     @override
-    def make_request(self, ri: RequestInfo, allow_retry: bool = True) -> ResponseInfo:
+    def make_requests(
+        self,
+        ris: Iterable[RequestInfo],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True
+    ) -> Generator[tuple[int, ResponseInfo | RequestError], None, None]:
+        """
+        Make many requests on a pool of `max_concurrency` threads
+
+        Requests are pulled from `ris` only as threads free up, so a lazy
+        generator of any length is consumed with bounded memory.
+        Failed requests are yielded as `RequestError` values instead of
+        stopping the batch. Consider `concurrent=True` so each worker
+        thread uses its own `Session`.
+
+        Args:
+            ris: Iterable of requests to make
+            max_concurrency: Maximum number of requests in flight
+            ordered: Yield in input order if True, otherwise as completed
+
+        Yields: `(index, ResponseInfo | RequestError)` pairs,
+            where `index` is the position of the request in `ris`
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        source = iter(ris)
+        pending: deque[tuple[int, Future]] = deque()
+        next_index = 0
+        exhausted = False
+        executor = self._shared_executor(max_concurrency)
         try:
-            method = self.get_http_method(ri.type_)
-            response = method(**ri.kwargs())
-            response.raise_for_status()
-            json = response.json()
-            return ResponseInfo(
-                status_code=HTTPStatus(response.status),
-                data=json
-            )
-        except HTTPError as e:
-            status_code = e.response.status_code
-            if status_code != HTTPStatus.UNAUTHORIZED or not allow_retry:
-                raise RequestError(
-                    message=f"Error making {ri.type_} request to {ri.url}",
-                    status_code=HTTPStatus(status_code)
-                ) from e
-            print("401 error, refreshing access token...")
-            self.refresh_access_token()
-            ri.headers = self.jwt_header()
-            return self.make_request(ri, allow_retry=False)
+            while True:
+                while not exhausted and len(pending) < max_concurrency:
+                    try:
+                        ri = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = executor.submit(self._make_request_or_error, ri)
+                    pending.append((next_index, future))
+                    next_index += 1
+                if not pending:
+                    return
+                if ordered:
+                    index, future = pending.popleft()
+                    yield index, future.result()
+                    continue
+                wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                still_pending = deque()
+                finished = []
+                for index, future in pending:
+                    (finished if future.done() else still_pending).append((index, future))
+                pending = still_pending
+                for index, future in finished:
+                    yield index, future.result()
+        finally:
+            self._cancel(future for _, future in pending)
 
+    @override
+    def paginate(
+        self,
+        ri: RequestInfo,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        page_param: str = DEFAULT_PAGE_PARAM,
+        records_key: str = DEFAULT_RECORDS_KEY,
+        start_page: int = 1
+    ) -> Generator[Any, None, None]:
+        """
+        Yield records one at a time across the pages of a list or search endpoint
+
+        While the caller works through one page, the next `read_ahead` pages
+        are already being fetched on background threads. Only those pages are
+        held in memory, however large the full result set. Iteration stops at
+        the first page with no records.
+
+        Args:
+            ri: The request for the endpoint; `page_param` is added to its params
+            read_ahead: Number of pages to fetch ahead of the current one
+            page_param: Query parameter holding the page number
+            records_key: Key of the records list in each page's response
+            start_page: Number of the first page
+        """
+        if read_ahead < 0:
+            raise ValueError("read_ahead must not be negative")
+        pages: deque[Future] = deque()
+        next_page = start_page
+        executor = self._shared_executor(max(read_ahead, 1))
+        try:
+            while True:
+                while len(pages) <= read_ahead:
+                    page_ri = self._page_request_info(ri, page_param, next_page)
+                    pages.append(executor.submit(self.make_request, page_ri))
+                    next_page += 1
+                records = self._page_records(pages.popleft().result(), records_key)
+                if not records:
+                    return
+                yield from records
+        finally:
+            self._cancel(pages)
+
+    @override
+    def stream(self, ri: RequestInfo) -> Generator[Any, None, None]:
+        """
+        Yield the items of a top-level JSON array or NDJSON body as they arrive
+
+        Only the item being received is held in memory, however large the body.
+        The request is retried and refreshed on a 401 like `make_request` until
+        the response starts; a failure partway through the body is raised as is.
+        Close the generator early to release the connection.
+
+        Args:
+            ri: The request; its `response_mode` is set to `ResponseMode.STREAM`
+        """
+        ri = ri.model_copy(update={"response_mode": ResponseMode.STREAM})
+        items = self.make_request(ri).data
+        try:
+            yield from items
+        finally:
+            items.close()
+
+    @override
+    def warm_up(self, connections: int = 1, load_api_key: bool = True) -> None:
+        """
+        Log in, load the API key and open connections to each base URL, concurrently
+
+        Steps that are already done (tokens or an API key passed in or loaded
+        from the token store) are skipped; an expired access token is refreshed.
+        Connections that fail to open are logged rather than raised. With a
+        session per thread (`concurrent=True`), only the calling thread's
+        session gets connections, one per base URL.
+
+        Args:
+            connections: Connections to open to each base URL; at most
+                the transport's pool size are kept
+            load_api_key: Also load an API key if there is none yet
+
+        Raises:
+            RequestError: If login, refresh or loading the API key fails
+        """
+        # Connections opened on another thread would go to that thread's session
+        per_thread_sessions = getattr(self.transport, "concurrent", False)
+        ris = self._warm_up_requests(min(connections, 1) if per_thread_sessions else connections)
+        auth_steps = self._warm_up_auth_steps(load_api_key)
+        executor = self._shared_executor(len(auth_steps) if per_thread_sessions else len(auth_steps) + len(ris))
+        auth = [executor.submit(step) for step in auth_steps]
+        if per_thread_sessions:
+            for ri in ris:
+                self._preconnect(ri)
+        else:
+            wait([executor.submit(self._preconnect, ri) for ri in ris])
+        for future in auth:
+            future.result()
+
+    def _warm_up_auth_steps(self, load_api_key: bool) -> list[Callable[[], None]]:
+        """The logins, refreshes and API key loads `warm_up` runs, each on a worker thread."""
+        return [lambda: self._warm_up_auth(load_api_key)]
+
+    def _warm_up_auth(self, load_api_key: bool) -> None:
+        tokens = self._tokens
+        if tokens is None:
+            if self._auth is None:
+                # API key only; there is nothing to log in with
+                return
+            self._login_single_flight()
+        elif tokens.access_token_expired():
+            self._refresh_single_flight(tokens)
+        if load_api_key and self.api_key is None:
+            self.api_key_header()
+
+    def _preconnect(self, ri: RequestInfo) -> None:
+        try:
+            self.transport.send(ri, self.json_decoder)
+        except (RequestError, *self.transport.errors) as e:
+            self._warm_up_failed(ri, e)
 
     @override
     def login(self) -> TokensInfo:
-        request_info = self.build_login_request_info()
-        response_info = self.make_request(request_info)
-        data = response_info.data
-        return TokensInfo(
-            access_token=data["access_token"],
-            refresh_token=data["refresh_token"]
-        )
+        return self._run(self._login_flow())
 
     @override
     def jwt_header(self) -> dict:
@@ -129,43 +478,41 @@ class AccessManagerSync(AccessManagerBase):
 
         """
         if self.api_key is None:
-            self.load_api_key()
+            with self._api_key_lock:
+                if self.api_key is None:
+                    self.load_api_key()
         return {
             "Authorization": f"Basic {self.api_key}"
         }
 
-    @override
-    def _expected_session_type(
-        self
-    ) -> type[Session]:
-        return Session
-
     @contextmanager
     def with_session(self) -> Generator["AccessManagerSync", Any, Any]:
         """Allows just the session lifecycle to be managed."""
-        created_session = False
-        if self._session is None:
-            self._session = self._initialize_session()
-            created_session = True
-
+        created_session = self.transport.open()
         try:
             yield self
         finally:
             if created_session:
-                self._session.close()
-                self._session = None
+                self.transport.close()
 
     def __enter__(self):
         """
-        Create session if not already set
+        Create session if not already set, and warm up if `warm_up_on_enter`
         """
-        if self._session is None:
-            self._session = self._initialize_session()
+        created_session = self.transport.open()
+        if not self.warm_up_on_enter:
+            return self
+        try:
+            self.warm_up()
+        except BaseException:
+            if created_session:
+                self.transport.close()
+            raise
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Close session
+        Stop the worker threads and close session
         """
-        if self._external_session is None and self._session is not None:
-            self._session.close()
\ No newline at end of file
+        self._shutdown_executor()
+        self.transport.close()
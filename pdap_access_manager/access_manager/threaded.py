@@ -0,0 +1,212 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Coroutine, Generator, Iterable, Optional, TypeVar
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.circuit_breaker import CircuitBreakerStats
+from pdap_access_manager.concurrency import ConcurrencyLimiterStats
+from pdap_access_manager.constants import DEFAULT_MAX_CONCURRENCY, DEFAULT_READ_AHEAD, DEFAULT_PAGE_PARAM, \
+    DEFAULT_RECORDS_KEY
+from pdap_access_manager.enums import RequestPriority
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+from pdap_access_manager.models.tokens import TokensInfo
+
+T = TypeVar("T")
+
+
+class AccessManagerThreaded:
+    """
+    A blocking interface to an `AccessManagerAsync` running on its own event loop thread
+
+    Every thread in the process can share one instance, and with it one
+    aiohttp connection pool and one set of tokens, so blocking code
+    (e.g. Django views or Celery tasks) can overlap requests without
+    a session per thread. `submit` returns a `concurrent.futures.Future`
+    for requests the caller does not want to wait on yet.
+
+    Takes the same arguments as `AccessManagerAsync`, except `session`:
+    an aiohttp session belongs to the loop it was created on, so the
+    manager creates its own. A `transport` passed in must not have
+    been used on another loop.
+
+    Call `close` (or use as a context manager) to close the session
+    and stop the thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get("session") is not None:
+            raise ValueError("AccessManagerThreaded creates its own session; pass a transport or nothing")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="pdap-access-manager-loop",
+            daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+        try:
+            self.access_manager: AccessManagerAsync = self._call(self._open(args, kwargs))
+        except BaseException:
+            self._stop()
+            raise
+
+    @staticmethod
+    async def _open(args: tuple, kwargs: dict) -> AccessManagerAsync:
+        # aiohttp sessions must be created on the loop that uses them
+        access_manager = AccessManagerAsync(*args, **kwargs)
+        access_manager.transport.open()
+        if access_manager.warm_up_on_enter:
+            try:
+                await access_manager.warm_up()
+            except BaseException:
+                await access_manager.__aexit__(None, None, None)
+                raise
+        return access_manager
+
+    def _submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        if self._closed:
+            coroutine.close()
+            raise RuntimeError("AccessManagerThreaded is closed")
+        if threading.current_thread() is self._thread:
+            # Blocking on the loop's own thread would deadlock it
+            coroutine.close()
+            raise RuntimeError("AccessManagerThreaded cannot be called from its event loop; use access_manager")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def _call(self, awaitable: Awaitable[T]) -> T:
+        async def _await() -> T:
+            return await awaitable
+        return self._submit(_await()).result()
+
+    def _iterate(self, items: AsyncIterator[T]) -> Generator[T, None, None]:
+        """Drive an async generator on the loop, one item per round trip."""
+        try:
+            while True:
+                try:
+                    yield self._call(anext(items))
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._closed:
+                self._call(items.aclose())
+
+    def submit(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> "Future[ResponseInfo]":
+        """
+        Start a request without waiting for it
+
+        Returns: A future for the `ResponseInfo`, which raises `RequestError`
+            from `result()` if the request fails. Cancelling it cancels the request.
+        """
+        return self._submit(self.access_manager.make_request(ri, allow_retry, priority))
+
+    def make_request(
+        self,
+        ri: RequestInfo,
+        allow_retry: bool = True,
+        priority: Optional[RequestPriority] = None
+    ) -> ResponseInfo:
+        """
+        Make request to PDAP, blocking until it completes
+
+        Raises:
+            RequestError: If request fails
+        """
+        return self.submit(ri, allow_retry, priority).result()
+
+    def make_requests(
+        self,
+        ris: Iterable[RequestInfo],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        ordered: bool = True
+    ) -> Generator[tuple[int, ResponseInfo | RequestError], None, None]:
+        """See `AccessManagerAsync.make_requests`; `ris` is consumed on the event loop thread."""
+        return self._iterate(self.access_manager.make_requests(ris, max_concurrency, ordered))
+
+    def paginate(
+        self,
+        ri: RequestInfo,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        page_param: str = DEFAULT_PAGE_PARAM,
+        records_key: str = DEFAULT_RECORDS_KEY,
+        start_page: int = 1
+    ) -> Generator[Any, None, None]:
+        """See `AccessManagerAsync.paginate`."""
+        return self._iterate(
+            self.access_manager.paginate(ri, read_ahead, page_param, records_key, start_page)
+        )
+
+    def stream(self, ri: RequestInfo) -> Generator[Any, None, None]:
+        """See `AccessManagerAsync.stream`. Close the generator early to release the connection."""
+        return self._iterate(self.access_manager.stream(ri))
+
+    @property
+    def tokens(self) -> TokensInfo:
+        return self.access_manager.tokens
+
+    @property
+    def access_token(self) -> str:
+        return self._call(self.access_manager.access_token)
+
+    @property
+    def refresh_token(self) -> str:
+        return self._call(self.access_manager.refresh_token)
+
+    def warm_up(self, connections: int = 1, load_api_key: bool = True) -> None:
+        """See `AccessManagerAsync.warm_up`; `warm_up_on_enter=True` runs it on construction."""
+        self._call(self.access_manager.warm_up(connections, load_api_key))
+
+    def login(self) -> TokensInfo:
+        return self._call(self.access_manager.login())
+
+    def load_api_key(self) -> None:
+        self._call(self.access_manager.load_api_key())
+
+    def refresh_access_token(self) -> None:
+        self._call(self.access_manager.refresh_access_token())
+
+    def jwt_header(self) -> dict:
+        return self._call(self.access_manager.jwt_header())
+
+    def refresh_jwt_header(self) -> dict:
+        return self._call(self.access_manager.refresh_jwt_header())
+
+    def api_key_header(self) -> dict:
+        return self._call(self.access_manager.api_key_header())
+
+    def connection_pool_stats(self) -> dict[str, int]:
+        return self.access_manager.connection_pool_stats()
+
+    def circuit_breaker_stats(self) -> dict[str, CircuitBreakerStats]:
+        return self.access_manager.circuit_breaker_stats()
+
+    def concurrency_stats(self) -> dict[str, ConcurrencyLimiterStats]:
+        return self.access_manager.concurrency_stats()
+
+    def close(self) -> None:
+        """Close the session, stop proactive refresh and stop the event loop thread."""
+        if self._closed:
+            return
+        try:
+            self._call(self.access_manager.__aexit__(None, None, None))
+        finally:
+            self._stop()
+
+    def _stop(self) -> None:
+        self._closed = True
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,101 @@
+"""
+Command line entry point for the benchmarks.
+
+    pdap-access-manager-benchmark --scenarios baseline token-storm --concurrency 1 10 50
+    python -m pdap_access_manager.benchmark --managers async --json results.json
+"""
+import argparse
+import json
+import platform
+import sys
+from dataclasses import asdict
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+from pdap_access_manager.benchmark.runner import MANAGERS, SCENARIOS, BenchmarkResult, run_benchmarks
+
+# Result field, column title, width and format
+_COLUMNS = (
+    ("manager", "manager", -8, ""),
+    ("scenario", "scenario", -13, ""),
+    ("concurrency", "concurrency", 11, ""),
+    ("requests", "requests", 8, ""),
+    ("errors", "errors", 6, ""),
+    ("requests_per_second", "req/s", 10, ".1f"),
+    ("p50_ms", "p50 ms", 8, ".2f"),
+    ("p99_ms", "p99 ms", 8, ".2f"),
+    ("peak_memory_mib", "peak MiB", 9, ".1f"),
+    ("logins", "logins", 6, ""),
+    ("refreshes", "refreshes", 9, ""),
+    ("rate_limited", "429s", 6, ""),
+    ("kib_sent", "sent KiB", 10, ".0f"),
+    ("kib_received", "recv KiB", 10, ".0f"),
+)
+
+
+def _package_version() -> Optional[str]:
+    try:
+        return version("pdap-access-manager")
+    except PackageNotFoundError:
+        return None
+
+
+def _cell(value: object, width: int, format_spec: str = "") -> str:
+    text = "-" if value is None else format(value, format_spec)
+    return text.ljust(-width) if width < 0 else text.rjust(width)
+
+
+def _header() -> str:
+    return "  ".join(_cell(title, width) for _, title, width, _ in _COLUMNS)
+
+
+def _row(result: BenchmarkResult) -> str:
+    return "  ".join(
+        _cell(getattr(result, name), width, format_spec)
+        for name, _, width, format_spec in _COLUMNS
+    )
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pdap-access-manager-benchmark",
+        description="Benchmark the access managers against a local stand-in PDAP server.",
+        epilog="Scenarios: " + "; ".join(f"{s.name}: {s.description}" for s in SCENARIOS.values())
+    )
+    parser.add_argument("--managers", nargs="+", choices=MANAGERS, default=list(MANAGERS))
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50], help="Concurrency levels")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per run")
+    parser.add_argument(
+        "--no-memory", action="store_true",
+        help="Skip memory tracing, which slows requests down"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON, to compare releases")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    print(_header(), flush=True)
+    results = run_benchmarks(
+        managers=args.managers,
+        scenarios=args.scenarios,
+        concurrency_levels=args.concurrency,
+        requests=args.requests,
+        trace_memory=not args.no_memory,
+        on_result=lambda result: print(_row(result), flush=True)
+    )
+    if args.json:
+        report = {
+            "version": _package_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": [asdict(result) for result in results],
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
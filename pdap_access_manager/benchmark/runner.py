@@ -0,0 +1,333 @@
+"""
+Throughput, latency and memory benchmarks of the access managers
+against the stand-in server in `pdap_access_manager.benchmark.server`.
+"""
+import asyncio
+import math
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.access_manager.threaded import AccessManagerThreaded
+from pdap_access_manager.benchmark.server import BENCH_EMAIL, BENCH_PASSWORD, ServerConfig, StandInServer
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.compression import CompressionConfig
+from pdap_access_manager.models.concurrency import AdaptiveConcurrencyConfig
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+from pdap_access_manager.models.transport import TransportConfig
+
+MANAGERS = ("async", "sync", "threaded")
+
+
+@dataclass
+class Scenario:
+    """A server behavior to benchmark, and the manager settings it calls for
+
+    Attributes:
+        upload_size: Approximate bytes of JSON each request POSTs, or 0 to send GETs
+    """
+    name: str
+    description: str
+    server: ServerConfig = field(default_factory=ServerConfig)
+    retry_policy: Optional[RetryPolicy] = None
+    compression: Optional[CompressionConfig] = None
+    upload_size: int = 0
+    adaptive_concurrency: Optional[AdaptiveConcurrencyConfig] = None
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("baseline", "Small JSON responses with no delay"),
+        Scenario("slow", "Responses delayed by 20 ms", ServerConfig(delay=0.02)),
+        Scenario("large", "Responses of about 1 MB", ServerConfig(records=5000, record_size=200)),
+        Scenario(
+            "large-gzip",
+            "Responses of about 1 MB, gzipped on the wire",
+            ServerConfig(records=5000, record_size=200, compress_responses=True),
+            compression=CompressionConfig(),
+        ),
+        Scenario("upload", "POSTs of about 256 KB of JSON", upload_size=256 * 1024),
+        Scenario(
+            "upload-gzip",
+            "POSTs of about 256 KB of JSON, gzipped on the wire",
+            compression=CompressionConfig(),
+            upload_size=256 * 1024,
+        ),
+        Scenario(
+            "rate-limited",
+            "Every 10th request gets a 429 and is retried",
+            ServerConfig(rate_limit_every=10),
+            RetryPolicy(max_attempts=5, backoff_base=0.01),
+        ),
+        Scenario(
+            "overload",
+            "A server that slows as it fills and sends 429s beyond 20 requests in flight",
+            ServerConfig(delay=0.01, capacity=20),
+            RetryPolicy(max_attempts=10, backoff_base=0.01),
+        ),
+        Scenario(
+            "overload-aimd",
+            "The overload server, with adaptive concurrency finding its capacity",
+            ServerConfig(delay=0.01, capacity=20),
+            RetryPolicy(max_attempts=10, backoff_base=0.01),
+            adaptive_concurrency=AdaptiveConcurrencyConfig(),
+        ),
+        Scenario(
+            "token-storm",
+            "All access tokens are revoked every 50 requests, so in-flight requests get 401s together",
+            ServerConfig(revoke_every=50, auth_delay=0.01),
+        ),
+    )
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one manager, scenario and concurrency level
+
+    Attributes:
+        peak_memory_mib: Peak Python memory allocated during the run, or None if not traced
+        logins: Logins the server handled during the run
+        refreshes: Token refreshes the server handled during the run
+        kib_sent: Request body KiB the server received, as sent on the wire
+        kib_received: Response body KiB the server sent, as sent on the wire
+        rate_limited: 429s the server sent during the run
+    """
+    manager: str
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    seconds: float
+    requests_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_memory_mib: Optional[float]
+    logins: int
+    refreshes: int
+    kib_sent: float
+    kib_received: float
+    rate_limited: int
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return math.nan
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class _Run:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+
+def _auth() -> AuthInfo:
+    return AuthInfo(email=BENCH_EMAIL, password=BENCH_PASSWORD)
+
+
+def _upload_body(size: int) -> Optional[dict]:
+    """Source-collector-like records adding up to about `size` bytes of JSON."""
+    if not size:
+        return None
+    records = []
+    length = 0
+    while length < size:
+        index = len(records)
+        record = {
+            "name": f"Police Department {index} Annual Report",
+            "url": f"https://city-{index % 97}.example.gov/police/reports/{index}.pdf",
+            "record_type": ("Annual & Monthly Reports", "Incident Reports", "Arrest Records")[index % 3],
+            "collector_metadata": {"batch": index // 100, "score": round(index * 0.37 % 1, 4)},
+        }
+        records.append(record)
+        length += len(str(record))
+    return {"records": records}
+
+
+def _request_info(api_url: str, index: int, headers: dict, body: Optional[dict]) -> RequestInfo:
+    return RequestInfo(
+        type_=RequestType.GET if body is None else RequestType.POST,
+        url=f"{api_url}/v2/bench/records/{index}",
+        headers=headers,
+        json_=body
+    )
+
+
+async def _run_async(api_url: str, scenario: Scenario, concurrency: int, requests: int) -> _Run:
+    run = _Run()
+    indexes = iter(range(requests))
+    body = _upload_body(scenario.upload_size)
+    am = AccessManagerAsync(
+        auth=_auth(),
+        data_sources_url=api_url,
+        retry_policy=scenario.retry_policy,
+        transport_config=TransportConfig(limit=concurrency),
+        compression=scenario.compression,
+        adaptive_concurrency=scenario.adaptive_concurrency
+    )
+    async with am:
+        # Log in before timing, so that runs measure steady-state requests
+        await am.jwt_header()
+
+        async def worker() -> None:
+            for index in indexes:
+                ri = _request_info(api_url, index, await am.jwt_header(), body)
+                start = time.perf_counter()
+                try:
+                    await am.make_request(ri)
+                except RequestError:
+                    run.errors += 1
+                run.latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        run.seconds = time.perf_counter() - start
+    return run
+
+
+def _run_sync(api_url: str, scenario: Scenario, concurrency: int, requests: int) -> _Run:
+    am = AccessManagerSync(
+        auth=_auth(),
+        data_sources_url=api_url,
+        retry_policy=scenario.retry_policy,
+        transport_config=TransportConfig(pool_maxsize=concurrency),
+        concurrent=concurrency > 1,
+        compression=scenario.compression,
+        adaptive_concurrency=scenario.adaptive_concurrency
+    )
+    with am:
+        return _run_threads(am, api_url, scenario, concurrency, requests)
+
+
+def _run_threaded(api_url: str, scenario: Scenario, concurrency: int, requests: int) -> _Run:
+    am = AccessManagerThreaded(
+        auth=_auth(),
+        data_sources_url=api_url,
+        retry_policy=scenario.retry_policy,
+        transport_config=TransportConfig(limit=concurrency),
+        compression=scenario.compression,
+        adaptive_concurrency=scenario.adaptive_concurrency
+    )
+    with am:
+        return _run_threads(am, api_url, scenario, concurrency, requests)
+
+
+def _run_threads(
+    am: AccessManagerSync | AccessManagerThreaded,
+    api_url: str,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int
+) -> _Run:
+    """`concurrency` threads making blocking calls on one shared manager."""
+    run = _Run()
+    indexes = iter(range(requests))
+    indexes_lock = threading.Lock()
+    body = _upload_body(scenario.upload_size)
+    am.jwt_header()
+
+    def worker() -> int:
+        """Returns: The requests that failed, counted per thread so no lock is needed."""
+        errors = 0
+        while True:
+            with indexes_lock:
+                index = next(indexes, None)
+            if index is None:
+                return errors
+            ri = _request_info(api_url, index, am.jwt_header(), body)
+            start = time.perf_counter()
+            try:
+                am.make_request(ri)
+            except RequestError:
+                errors += 1
+            # list.append is atomic, so workers need no lock here
+            run.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            run.errors += future.result()
+    run.seconds = time.perf_counter() - start
+    return run
+
+
+def run_benchmark(
+    manager: str,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    trace_memory: bool = True
+) -> BenchmarkResult:
+    """Benchmark one manager ("async", "sync" or "threaded") in one scenario against a fresh server."""
+    if manager not in MANAGERS:
+        raise ValueError(f"manager must be one of {MANAGERS}, not {manager!r}")
+    with StandInServer(scenario.server) as server:
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            if manager == "async":
+                run = asyncio.run(_run_async(server.api_url, scenario, concurrency, requests))
+            elif manager == "sync":
+                run = _run_sync(server.api_url, scenario, concurrency, requests)
+            else:
+                run = _run_threaded(server.api_url, scenario, concurrency, requests)
+            peak_memory_mib = None
+            if trace_memory:
+                peak_memory_mib = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+        stats = server.stats()
+
+    latencies = sorted(run.latencies)
+    return BenchmarkResult(
+        manager=manager,
+        scenario=scenario.name,
+        concurrency=concurrency,
+        requests=requests,
+        errors=run.errors,
+        seconds=run.seconds,
+        requests_per_second=requests / run.seconds if run.seconds else math.nan,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+        peak_memory_mib=peak_memory_mib,
+        logins=stats.logins,
+        refreshes=stats.refreshes,
+        kib_sent=stats.bytes_received / 1024,
+        kib_received=stats.bytes_sent / 1024,
+        rate_limited=stats.rate_limited,
+    )
+
+
+def run_benchmarks(
+    managers: Iterable[str] = MANAGERS,
+    scenarios: Iterable[str] = tuple(SCENARIOS),
+    concurrency_levels: Iterable[int] = (1, 10, 50),
+    requests: int = 1000,
+    trace_memory: bool = True,
+    on_result: Optional[Callable[[BenchmarkResult], None]] = None
+) -> list[BenchmarkResult]:
+    """Benchmark every combination of manager, scenario and concurrency level."""
+    results = []
+    for scenario_name in scenarios:
+        scenario = SCENARIOS[scenario_name]
+        for manager in managers:
+            for concurrency in concurrency_levels:
+                result = run_benchmark(manager, scenario, concurrency, requests, trace_memory)
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+    return results
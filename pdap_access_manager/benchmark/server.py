@@ -0,0 +1,288 @@
+"""
+A local stand-in for the PDAP API, used by the benchmarks.
+
+It mimics the `/v2/auth/login`, `/v2/auth/refresh-session` and `/v2/auth/api-key`
+endpoints with unsigned JWTs, and serves data under `/v2/bench/` with
+configurable delays, payload sizes, compression, rate limiting and token revocation.
+The server runs in its own process so that it does not compete with the
+client under test for the GIL or the event loop.
+"""
+import asyncio
+import base64
+import gzip
+import itertools
+import json
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.request import urlopen
+
+from aiohttp import web
+
+API_PREFIX = "/api"
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+@dataclass
+class ServerConfig:
+    """Behavior of the stand-in server
+
+    Attributes:
+        delay: Seconds each data response is delayed
+        auth_delay: Seconds each login and refresh is delayed
+        records: Number of records in each data response
+        record_size: Bytes of filler in each record
+        rate_limit_every: Answer every nth data request with a 429, 0 to never
+        retry_after: `Retry-After` seconds sent with each 429
+        revoke_every: Revoke all access tokens after every nth data request,
+            so that in-flight requests get 401s together, 0 to never
+        access_token_ttl: Seconds until an access token's `exp`
+        refresh_token_ttl: Seconds until a refresh token's `exp`
+        compress_responses: Gzip data responses for clients that accept gzip
+        capacity: Data requests handled at once; each one beyond it gets a 429
+            and each one in flight adds `delay` / `capacity` to the delay, 0 for no limit
+    """
+    delay: float = 0.0
+    auth_delay: float = 0.0
+    records: int = 10
+    record_size: int = 100
+    rate_limit_every: int = 0
+    retry_after: float = 0.0
+    revoke_every: int = 0
+    access_token_ttl: float = 900.0
+    refresh_token_ttl: float = 86400.0
+    compress_responses: bool = False
+    capacity: int = 0
+
+
+@dataclass
+class ServerStats:
+    """Counts kept by the server, read from `GET /_stats`
+
+    Attributes:
+        bytes_received: Body bytes of data requests as sent, i.e. compressed if they were
+        bytes_sent: Body bytes of data responses as sent
+    """
+    logins: int = 0
+    refreshes: int = 0
+    api_keys: int = 0
+    data_requests: int = 0
+    unauthorized: int = 0
+    rate_limited: int = 0
+    bytes_received: int = 0
+    bytes_sent: int = 0
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class StandInPDAP:
+    """Request handlers and token bookkeeping of the stand-in server"""
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.stats = ServerStats()
+        self._serial = itertools.count()
+        self._access_tokens: dict[str, float] = {}
+        self._refresh_tokens: dict[str, float] = {}
+        self._api_keys: set[str] = set()
+        self._in_flight = 0
+        self._payload = json.dumps({
+            "data": [
+                {"id": i, "name": f"record-{i}", "filler": "x" * config.record_size}
+                for i in range(config.records)
+            ],
+            "count": config.records,
+        }).encode()
+        self._gzipped_payload = gzip.compress(self._payload, mtime=0)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(f"{API_PREFIX}/v2/auth/login", self.login)
+        app.router.add_post(f"{API_PREFIX}/v2/auth/refresh-session", self.refresh_session)
+        app.router.add_post(f"{API_PREFIX}/v2/auth/api-key", self.api_key)
+        app.router.add_route("*", f"{API_PREFIX}/v2/bench/{{tail:.*}}", self.data)
+        app.router.add_get("/_stats", self.stats_handler)
+        return app
+
+    def _token(self, kind: str, ttl: float) -> tuple[str, float]:
+        exp = time.time() + ttl
+        header = _b64(json.dumps({"alg": "none", "typ": "JWT"}).encode())
+        payload = _b64(json.dumps({"sub": BENCH_EMAIL, "kind": kind, "jti": next(self._serial), "exp": exp}).encode())
+        return f"{header}.{payload}.", exp
+
+    def _issue_tokens(self) -> web.Response:
+        access_token, access_exp = self._token("access", self.config.access_token_ttl)
+        refresh_token, refresh_exp = self._token("refresh", self.config.refresh_token_ttl)
+        self._access_tokens[access_token] = access_exp
+        self._refresh_tokens[refresh_token] = refresh_exp
+        return web.json_response({"access_token": access_token, "refresh_token": refresh_token})
+
+    @staticmethod
+    def _valid(tokens: dict[str, float], request: web.Request) -> bool:
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return False
+        exp = tokens.get(authorization.removeprefix("Bearer "))
+        return exp is not None and exp > time.time()
+
+    def _authorized(self, request: web.Request) -> bool:
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Basic "):
+            return authorization.removeprefix("Basic ") in self._api_keys
+        return self._valid(self._access_tokens, request)
+
+    def _unauthorized(self) -> web.Response:
+        self.stats.unauthorized += 1
+        return web.json_response({"message": "Token is invalid or expired"}, status=401)
+
+    async def login(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        if self.config.auth_delay:
+            await asyncio.sleep(self.config.auth_delay)
+        if body.get("email") != BENCH_EMAIL or body.get("password") != BENCH_PASSWORD:
+            return self._unauthorized()
+        self.stats.logins += 1
+        return self._issue_tokens()
+
+    async def refresh_session(self, request: web.Request) -> web.Response:
+        if self.config.auth_delay:
+            await asyncio.sleep(self.config.auth_delay)
+        if not self._valid(self._refresh_tokens, request):
+            return self._unauthorized()
+        self.stats.refreshes += 1
+        return self._issue_tokens()
+
+    async def api_key(self, request: web.Request) -> web.Response:
+        if not self._valid(self._access_tokens, request):
+            return self._unauthorized()
+        self.stats.api_keys += 1
+        key = f"key-{next(self._serial)}"
+        self._api_keys.add(key)
+        return web.json_response({"api_key": key})
+
+    async def data(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return self._unauthorized()
+        self._in_flight += 1
+        try:
+            return await self._data(request)
+        finally:
+            self._in_flight -= 1
+
+    async def _data(self, request: web.Request) -> web.Response:
+        config = self.config
+        if request.body_exists:
+            self.stats.bytes_received += request.content_length or 0
+            # aiohttp decompresses gzip bodies as they are read
+            await request.read()
+        self.stats.data_requests += 1
+        count = self.stats.data_requests
+        if config.revoke_every and count % config.revoke_every == 0:
+            self._access_tokens.clear()
+        over_capacity = config.capacity and self._in_flight > config.capacity
+        if over_capacity or (config.rate_limit_every and count % config.rate_limit_every == 0):
+            self.stats.rate_limited += 1
+            return web.json_response(
+                {"message": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(config.retry_after)}
+            )
+        delay = config.delay
+        if config.capacity:
+            # Like a service slowing down as it fills up
+            delay += config.delay * self._in_flight / config.capacity
+        if delay:
+            await asyncio.sleep(delay)
+        if config.compress_responses and "gzip" in request.headers.get("Accept-Encoding", ""):
+            self.stats.bytes_sent += len(self._gzipped_payload)
+            return web.Response(
+                body=self._gzipped_payload,
+                content_type="application/json",
+                headers={"Content-Encoding": "gzip"}
+            )
+        self.stats.bytes_sent += len(self._payload)
+        return web.Response(body=self._payload, content_type="application/json")
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response(vars(self.stats))
+
+
+def serve(config: ServerConfig, host: str, port: int, ready: Optional[multiprocessing.Queue] = None) -> None:
+    """Run the stand-in server until the process is terminated, reporting the bound port to `ready`."""
+
+    async def _serve() -> None:
+        runner = web.AppRunner(StandInPDAP(config).app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port, backlog=1024)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.put(bound_port)
+        await asyncio.Event().wait()
+
+    asyncio.run(_serve())
+
+
+class StandInServer:
+    """
+    Runs the stand-in server in a child process for the duration of a `with` block.
+
+    Usage:
+        with StandInServer(ServerConfig(delay=0.01)) as server:
+            am = AccessManagerSync(auth, data_sources_url=server.api_url)
+    """
+
+    def __init__(self, config: Optional[ServerConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or ServerConfig()
+        self.host = host
+        self.port = port
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def api_url(self) -> str:
+        """URL to pass as `data_sources_url`"""
+        return f"{self.base_url}{API_PREFIX}"
+
+    def start(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        self._process = context.Process(
+            target=serve,
+            args=(self.config, self.host, self.port, ready),
+            daemon=True
+        )
+        self._process.start()
+        while True:
+            try:
+                self.port = ready.get(timeout=0.1)
+                return
+            except queue.Empty:
+                if not self._process.is_alive():
+                    raise RuntimeError(f"Stand-in server exited with code {self._process.exitcode}")
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        self._process.terminate()
+        self._process.join()
+        self._process = None
+
+    def stats(self) -> ServerStats:
+        with urlopen(f"{self.base_url}/_stats") as response:
+            return ServerStats(**json.load(response))
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
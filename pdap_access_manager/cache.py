@@ -0,0 +1,234 @@
+import copy
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Optional
+
+from pdap_access_manager.enums import RequestType, ResponseMode
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response and the validators needed to revalidate it."""
+    status_code: HTTPStatus
+    data: Any
+    # Wall-clock time, so entries stay meaningful in a backend shared across processes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now < self.expires_at
+
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses. Implementations must be thread-safe."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Bounded in-process LRU of cached responses."""
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    stores: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class ResponseCache:
+    """Cache for GET responses, shared by the access managers
+
+    Fresh entries are served without a network call. Stale entries that
+    carry an `ETag` or `Last-Modified` validator are revalidated with
+    `If-None-Match`/`If-Modified-Since`, so unchanged data costs only a 304.
+
+    Attributes:
+        backend: Where entries are stored; an in-memory LRU by default
+        ttl: Seconds an entry stays fresh, unless the response sends `Cache-Control: max-age`
+        vary_headers: Request headers included in the cache key, so that
+            responses for different credentials are never shared
+        copy_hits: Deep-copy cached data before returning it, so callers may mutate it
+    """
+    backend: CacheBackend = field(default_factory=InMemoryCacheBackend)
+    ttl: float = 60.0
+    vary_headers: tuple[str, ...] = ("Authorization",)
+    copy_hits: bool = True
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self):
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def accepts(ri: RequestInfo) -> bool:
+        return ri.type_ == RequestType.GET and ri.response_mode == ResponseMode.JSON
+
+    def key_for(self, ri: RequestInfo) -> str:
+        # Header names are case-insensitive
+        headers = {name.lower(): value for name, value in (ri.headers or {}).items()}
+        vary = "&".join(
+            f"{name.lower()}={headers.get(name.lower(), '')}" for name in self.vary_headers
+        )
+        return f"{ri.type_.value} {ri.url_with_query_params()} {vary}"
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Return the entry for `key`, fresh or stale, recording a hit or miss."""
+        entry = self.backend.get(key)
+        with self._stats_lock:
+            if entry is not None and entry.is_fresh():
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        return entry
+
+    @staticmethod
+    def conditional_request(ri: RequestInfo, entry: Optional[CachedResponse]) -> RequestInfo:
+        """Add revalidation headers for `entry` to a copy of `ri`."""
+        if entry is None or not entry.has_validators():
+            return ri
+        headers = dict(ri.headers or {})
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return ri.model_copy(update={"headers": headers})
+
+    def to_response(self, entry: CachedResponse) -> ResponseInfo:
+        data = copy.deepcopy(entry.data) if self.copy_hits else entry.data
+        return ResponseInfo.model_construct(status_code=entry.status_code, data=data)
+
+    def update(
+        self,
+        key: str,
+        entry: Optional[CachedResponse],
+        response_info: ResponseInfo
+    ) -> ResponseInfo:
+        """
+        Store a fresh response, or renew `entry` on a 304.
+
+        Responses marked `no-store`, or that `Vary` on request headers
+        outside `vary_headers`, are not stored. `no-cache` ones are stored
+        already stale, so they are revalidated before every use.
+
+        Returns: The response to hand to the caller.
+        """
+        headers = response_info.headers or {}
+        if response_info.status_code == HTTPStatus.NOT_MODIFIED:
+            if entry is None:
+                # Nothing to renew, and a 304 has no body worth keeping
+                return response_info
+            entry.expires_at = self._expires_at(headers)
+            self.backend.set(key, entry)
+            with self._stats_lock:
+                self.stats.revalidations += 1
+            return self.to_response(entry)
+        directives = _cache_directives(headers)
+        if "no-store" in directives or self._varies_beyond_key(headers):
+            self.backend.delete(key)
+            return response_info
+        self.backend.set(
+            key,
+            CachedResponse(
+                status_code=response_info.status_code,
+                data=copy.deepcopy(response_info.data) if self.copy_hits else response_info.data,
+                expires_at=self._expires_at(headers),
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified"),
+            )
+        )
+        with self._stats_lock:
+            self.stats.stores += 1
+        return response_info
+
+    def _varies_beyond_key(self, headers: dict) -> bool:
+        """Whether the response `Vary`s on a request header the cache key leaves out."""
+        varied = {name.strip().lower() for name in headers.get("vary", "").split(",")}
+        # Cached data is already decoded, so the content coding never matters
+        varied -= {"", "accept-encoding"}
+        return bool(varied - {name.lower() for name in self.vary_headers})
+
+    def _expires_at(self, headers: dict) -> float:
+        if "no-cache" in _cache_directives(headers):
+            return time.time()
+        ttl = self.ttl
+        match = _MAX_AGE_PATTERN.search(headers.get("cache-control", ""))
+        if match is not None:
+            ttl = float(match.group(1))
+        return time.time() + ttl
+
+
+def _cache_directives(headers: dict) -> set[str]:
+    """Names of the `Cache-Control` directives in `headers`, lowercased."""
+    return {
+        directive.split("=", 1)[0].strip().lower()
+        for directive in headers.get("cache-control", "").split(",")
+    }
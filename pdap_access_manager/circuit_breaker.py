@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from pdap_access_manager.enums import CircuitState
+from pdap_access_manager.exceptions import CircuitOpenError
+from pdap_access_manager.models.circuit_breaker import CircuitBreakerConfig
+
+
+@dataclass
+class CircuitBreakerStats:
+    """State and counts of one circuit breaker, for monitoring"""
+    state: CircuitState
+    consecutive_failures: int
+    error_rate: float
+    opened: int
+    rejected: int
+    seconds_until_probe: Optional[float]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one base URL.
+
+    Closed: attempts go through and their outcomes are recorded.
+    Open: attempts are rejected at once with `CircuitOpenError`,
+    until `reset_timeout` has passed.
+    Half-open: up to `half_open_max_calls` probe attempts go through;
+    `success_threshold` successes close the breaker and a failure reopens it.
+
+    Every `acquire()` that returns must be followed by `record()` or `release()`,
+    passed the generation it returned. Each state change starts a new
+    generation, so an attempt that outlives the state it was admitted in,
+    e.g. one sent while closed that finishes while half-open, is ignored.
+    """
+
+    def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None):
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=self.config.window_size)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and now - self._opened_at >= self.config.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._generation += 1
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        return self._state
+
+    def acquire(self) -> int:
+        """
+        Returns: The generation the attempt was admitted in, to pass to `record` or `release`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all probes in flight
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == CircuitState.CLOSED:
+                return self._generation
+            if (
+                state == CircuitState.HALF_OPEN
+                and self._probes_in_flight < self.config.half_open_max_calls
+            ):
+                self._probes_in_flight += 1
+                return self._generation
+            self.rejected += 1
+            retry_after = max(self._opened_at + self.config.reset_timeout - now, 0.0)
+        raise CircuitOpenError(
+            f"Circuit breaker for {self.name} is {state.value}",
+            retry_after=retry_after
+        )
+
+    def release(self, generation: int) -> None:
+        """Give back an acquired attempt whose outcome is unknown, e.g. a cancelled one."""
+        with self._lock:
+            if (
+                generation == self._generation
+                and self._state == CircuitState.HALF_OPEN
+                and self._probes_in_flight
+            ):
+                self._probes_in_flight -= 1
+
+    def record(self, generation: int, status_code: Optional[int]) -> None:
+        """
+        Record the outcome of an acquired attempt.
+
+        Args:
+            generation: The generation returned by `acquire`
+            status_code: The response status, or None if no response was received
+        """
+        failed = status_code is None or status_code in self.config.failure_statuses
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if generation != self._generation:
+                # Admitted before the last state change, so it says nothing about this one
+                return
+            if state == CircuitState.HALF_OPEN:
+                self._record_probe(failed, now)
+                return
+            self._outcomes.append(failed)
+            self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+            if failed and self._should_open():
+                self._open(now)
+
+    def _record_probe(self, failed: bool, now: float) -> None:
+        if self._probes_in_flight:
+            self._probes_in_flight -= 1
+        if failed:
+            self._open(now)
+            return
+        self._probe_successes += 1
+        if self._probe_successes >= self.config.success_threshold:
+            self._state = CircuitState.CLOSED
+            self._generation += 1
+            self._outcomes.clear()
+            self._consecutive_failures = 0
+
+    def _should_open(self) -> bool:
+        config = self.config
+        if self._consecutive_failures >= config.consecutive_failures:
+            return True
+        if config.error_rate is None or len(self._outcomes) < config.min_calls:
+            return False
+        return self._error_rate() >= config.error_rate
+
+    def _error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._generation += 1
+        self._opened_at = now
+        self.opened += 1
+
+    def stats(self) -> CircuitBreakerStats:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            seconds_until_probe = None
+            if state == CircuitState.OPEN:
+                seconds_until_probe = self._opened_at + self.config.reset_timeout - now
+            return CircuitBreakerStats(
+                state=state,
+                consecutive_failures=self._consecutive_failures,
+                error_rate=self._error_rate(),
+                opened=self.opened,
+                rejected=self.rejected,
+                seconds_until_probe=seconds_until_probe,
+            )
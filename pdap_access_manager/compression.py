@@ -0,0 +1,26 @@
+import gzip
+from typing import Optional
+
+from pdap_access_manager.enums import ContentEncoding
+
+# Favor speed over ratio: bodies are compressed on every send
+DEFAULT_GZIP_LEVEL = 1
+DEFAULT_ZSTD_LEVEL = 3
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def compress(body: bytes, encoding: ContentEncoding, level: Optional[int] = None) -> bytes:
+    """Compress a request body for the given `Content-Encoding`."""
+    if encoding == ContentEncoding.GZIP:
+        # A fixed mtime keeps the output identical for identical bodies
+        return gzip.compress(body, compresslevel=DEFAULT_GZIP_LEVEL if level is None else level, mtime=0)
+    import zstandard
+    # Compressors are not thread-safe, and creating one is cheap
+    return zstandard.ZstdCompressor(level=DEFAULT_ZSTD_LEVEL if level is None else level).compress(body)
@@ -0,0 +1,189 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from pdap_access_manager.models.concurrency import AdaptiveConcurrencyConfig
+from pdap_access_manager.waiters import Waiter, percentile_95, resolve
+
+
+@dataclass
+class ConcurrencyLimiterStats:
+    """Current limit and load of one adaptive concurrency limiter, for monitoring"""
+    limit: int
+    in_flight: int
+    waiting: int
+    p95_latency: Optional[float]
+    baseline_latency: Optional[float]
+    decreases: int
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on requests in flight to one base URL.
+
+    A limit's worth of healthy responses adds `increase_step` to the limit,
+    but only while callers are actually held back by it, so an idle client
+    does not inflate it. An overload (see `AdaptiveConcurrencyConfig`) multiplies it by
+    `decrease_factor`; responses to requests sent before the last cut report
+    the same overload and are ignored. Callers beyond the limit wait in FIFO
+    order. Threads and event loops may share one limiter.
+
+    Every `acquire()` or `acquire_async()` must be followed by `record()` or `release()`.
+    """
+
+    def __init__(self, name: str, config: Optional[AdaptiveConcurrencyConfig] = None):
+        self.name = name
+        self.config = config or AdaptiveConcurrencyConfig()
+        self._limit = self.config.initial_limit
+        self._healthy = 0
+        self._in_flight = 0
+        self._waiters: deque[Waiter] = deque()
+        self._latencies: deque[float] = deque(maxlen=self.config.latency_window)
+        self._new_latencies = 0
+        self._p95: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._limited = False
+        self._last_decrease = float("-inf")
+        self.decreases = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def _try_take(self) -> bool:
+        if self._waiters or self._in_flight >= self.limit:
+            self._limited = True
+            return False
+        self._in_flight += 1
+        return True
+
+    def _grant(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
+        if self._waiters:
+            self._limited = True
+
+    def acquire(self) -> float:
+        """
+        Wait for a slot, blocking the thread.
+
+        Returns: The time the slot was taken, to pass to `record`.
+        """
+        with self._lock:
+            if self._try_take():
+                return time.monotonic()
+            event = threading.Event()
+            self._waiters.append(Waiter(event.set))
+        event.wait()
+        return time.monotonic()
+
+    async def acquire_async(self) -> float:
+        """
+        Wait for a slot without blocking the event loop.
+
+        Returns: The time the slot was taken, to pass to `record`.
+        """
+        with self._lock:
+            if self._try_take():
+                return time.monotonic()
+            # Imported here so that the sync managers never load asyncio
+            import asyncio
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            # The slot may be freed by another thread, e.g. one sharing this limiter
+            waiter = Waiter(lambda: loop.call_soon_threadsafe(resolve, future))
+            self._waiters.append(waiter)
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._grant()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+        return time.monotonic()
+
+    def release(self) -> None:
+        """Give back a slot whose outcome says nothing about load, e.g. a cancelled request."""
+        with self._lock:
+            self._in_flight -= 1
+            self._grant()
+
+    def record(self, started: float, status_code: Optional[int]) -> None:
+        """
+        Give back a slot and adapt the limit to the outcome of its request.
+
+        Args:
+            started: The time returned by `acquire`
+            status_code: The response status, or None if no response was received
+        """
+        now = time.monotonic()
+        overloaded = status_code is None or status_code in self.config.overload_statuses
+        with self._lock:
+            self._in_flight -= 1
+            if started < self._last_decrease:
+                # Sent before the last cut, so it reflects the load that caused it
+                pass
+            elif overloaded:
+                self._decrease(now)
+            else:
+                self._observe_latency(now - started, now)
+                if self._limited:
+                    self._increase()
+            self._grant()
+
+    def _observe_latency(self, latency: float, now: float) -> None:
+        self._latencies.append(latency)
+        self._new_latencies += 1
+        if self._new_latencies < self.config.latency_window:
+            return
+        self._new_latencies = 0
+        p95 = self._p95 = percentile_95(list(self._latencies))
+        baseline = self._baseline
+        if baseline is None or p95 < baseline:
+            self._baseline = p95
+            return
+        # Let the baseline follow a lasting change in the service's latency
+        self._baseline = baseline + (p95 - baseline) * 0.1
+        if p95 > baseline * self.config.latency_tolerance:
+            self._decrease(now)
+
+    def _increase(self) -> None:
+        config = self.config
+        self._healthy += 1
+        if self._healthy < self._limit or self._limit >= config.max_limit:
+            return
+        self._limit = min(self._limit + config.increase_step, config.max_limit)
+        self._healthy = 0
+        # Grow again only once callers are held back by the new limit
+        self._limited = False
+
+    def _decrease(self, now: float) -> None:
+        config = self.config
+        self._limit = max(math.floor(self._limit * config.decrease_factor), config.min_limit)
+        self._healthy = 0
+        self._last_decrease = now
+        self._latencies.clear()
+        self._new_latencies = 0
+        self._limited = False
+        self.decreases += 1
+
+    def stats(self) -> ConcurrencyLimiterStats:
+        with self._lock:
+            return ConcurrencyLimiterStats(
+                limit=self.limit,
+                in_flight=self._in_flight,
+                waiting=len(self._waiters),
+                p95_latency=self._p95,
+                baseline_latency=self._baseline,
+                decreases=self.decreases,
+            )
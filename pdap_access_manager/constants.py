@@ -1,2 +1,16 @@
 DEFAULT_DATA_SOURCES_URL = "https://data-sources.pdap.io/api"
 DEFAULT_SOURCE_COLLECTOR_URL = "https://source-collector.pdap.io"
+
+# Seconds before a token's `exp` at which it is treated as expired
+DEFAULT_CLOCK_SKEW_SECONDS = 30.0
+
+# Default number of requests `make_requests` keeps in flight at once
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Defaults for paginating list and search endpoints
+DEFAULT_PAGE_PARAM = "page"
+DEFAULT_RECORDS_KEY = "data"
+DEFAULT_READ_AHEAD = 1
+
+# Bytes read from the network at a time for `ResponseMode.STREAM`
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
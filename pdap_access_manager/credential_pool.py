@@ -0,0 +1,166 @@
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Optional, Sequence
+
+from pdap_access_manager.enums import CredentialStrategy
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.token_store import TokenStore
+
+
+@dataclass(frozen=True)
+class Credential:
+    """One PDAP account for a pooled access manager
+
+    Attributes:
+        auth: Email and password, used to log in when there are no tokens
+        tokens: Tokens to start with, if any
+        api_key: API key to start with, if any
+        token_store: Shares this account's tokens with other processes;
+            must not be shared with another credential
+        name: Label in stats and logs; the email of `auth` if not given
+    """
+    auth: Optional[AuthInfo] = None
+    tokens: Optional[TokensInfo] = None
+    api_key: Optional[str] = None
+    token_store: Optional[TokenStore] = None
+    name: Optional[str] = None
+
+
+@dataclass
+class CredentialStats:
+    """Load and throttling of one credential, for monitoring
+
+    Attributes:
+        in_flight: Requests sent with the credential and not yet finished
+        requests: Requests sent with the credential since the pool was created
+        throttled: 429 responses received for the credential
+        seconds_throttled: Seconds until the credential is picked again, 0 if it is not throttled
+    """
+    in_flight: int
+    requests: int
+    throttled: int
+    seconds_throttled: float
+
+
+class _Slot:
+    __slots__ = ("in_flight", "requests", "throttled", "consecutive_throttles", "throttled_until")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.consecutive_throttles = 0
+        self.throttled_until = 0.0
+
+
+class CredentialPool:
+    """
+    Picks the credential for each request of a pooled access manager.
+
+    Credentials are picked by fewest requests in flight, or in turn with
+    `CredentialStrategy.ROUND_ROBIN`; ties go to the credential after the
+    last one picked. A 429 throttles its credential for the `Retry-After`,
+    or else for `throttle_cooldown` seconds, doubled for each 429 in a row
+    up to `max_throttle_cooldown`. Throttled credentials are skipped while
+    any other is free; when all are throttled, the one free soonest is picked.
+
+    Every `acquire()` must be followed by `release()`.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        strategy: CredentialStrategy = CredentialStrategy.LEAST_LOADED,
+        throttle_cooldown: float = 1.0,
+        max_throttle_cooldown: float = 60.0
+    ):
+        if not names:
+            raise ValueError("A credential pool needs at least one credential")
+        if len(set(names)) != len(names):
+            raise ValueError("Credential names must be unique")
+        if not 0 < throttle_cooldown <= max_throttle_cooldown:
+            raise ValueError("throttle_cooldown must be positive and at most max_throttle_cooldown")
+        self.names = list(names)
+        self.strategy = strategy
+        self.throttle_cooldown = throttle_cooldown
+        self.max_throttle_cooldown = max_throttle_cooldown
+        self._slots = [_Slot() for _ in names]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _pick(self, now: float) -> tuple[int, float]:
+        count = len(self._slots)
+        # Scanning from the one after the last pick breaks ties in turn
+        order = [(self._next + offset) % count for offset in range(count)]
+        free = [index for index in order if self._slots[index].throttled_until <= now]
+        if not free:
+            index = min(order, key=lambda i: self._slots[i].throttled_until)
+            return index, self._slots[index].throttled_until - now
+        if self.strategy == CredentialStrategy.ROUND_ROBIN:
+            return free[0], 0.0
+        return min(free, key=lambda i: self._slots[i].in_flight), 0.0
+
+    def choose(self) -> int:
+        """The index of the credential the next request would use, without reserving it."""
+        with self._lock:
+            return self._pick(time.monotonic())[0]
+
+    def acquire(self) -> tuple[int, float]:
+        """
+        Reserve a credential for one request.
+
+        Returns: The index of the credential, and the seconds to wait
+            before sending with it if every credential is throttled.
+        """
+        with self._lock:
+            index, wait = self._pick(time.monotonic())
+            slot = self._slots[index]
+            slot.in_flight += 1
+            slot.requests += 1
+            self._next = (index + 1) % len(self._slots)
+            return index, wait
+
+    def release(
+        self,
+        index: int,
+        status_code: Optional[int],
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Finish a request sent with credential `index`.
+
+        Args:
+            status_code: Status of the response, or None if none was received
+            retry_after: Seconds requested by a `Retry-After` header, if any
+        """
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots[index]
+            slot.in_flight -= 1
+            if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                slot.throttled += 1
+                slot.consecutive_throttles += 1
+                if retry_after is None:
+                    retry_after = min(
+                        self.throttle_cooldown * 2 ** (slot.consecutive_throttles - 1),
+                        self.max_throttle_cooldown
+                    )
+                slot.throttled_until = max(slot.throttled_until, now + retry_after)
+            elif status_code is not None:
+                slot.consecutive_throttles = 0
+
+    def stats(self) -> dict[str, CredentialStats]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: CredentialStats(
+                    in_flight=slot.in_flight,
+                    requests=slot.requests,
+                    throttled=slot.throttled,
+                    seconds_throttled=max(slot.throttled_until - now, 0.0)
+                )
+                for name, slot in zip(self.names, self._slots)
+            }
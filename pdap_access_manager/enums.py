@@ -6,3 +6,35 @@ class RequestType(str, Enum):
     PUT = "PUT"
     GET = "GET"
     DELETE = "DELETE"
+    HEAD = "HEAD"
+
+
+class ResponseMode(str, Enum):
+    JSON = "json"
+    BYTES = "bytes"
+    STREAM = "stream"
+
+
+class ContentEncoding(str, Enum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class RequestPriority(str, Enum):
+    """Scheduling class of a request; AUTH is used for login and token refresh"""
+    AUTH = "auth"
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
+class CredentialStrategy(str, Enum):
+    """How a pooled access manager picks the credential for a request"""
+    LEAST_LOADED = "least_loaded"
+    ROUND_ROBIN = "round_robin"
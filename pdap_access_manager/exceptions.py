@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from typing import Optional
 
 
 class TokensNotSetError(Exception):
@@ -23,7 +24,26 @@ class IncorrectSessionError(Exception):
 class RequestError(Exception):
     """
     Exception raised when a request fails.
-    """
-    def __init__(self, message, status_code: HTTPStatus):
+
+    `status_code` is None when no response was received,
+    e.g. on a connection error or timeout.
+    `retry_after` holds the seconds requested by a `Retry-After` header, if any.
+    """
+    def __init__(
+        self,
+        message,
+        status_code: Optional[HTTPStatus],
+        retry_after: Optional[float] = None
+    ):
         super().__init__(message)
-        self.status_code = status_code
\ No newline at end of file
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+class CircuitOpenError(RequestError):
+    """
+    Exception raised without sending a request because the circuit breaker
+    for its base URL is open. `retry_after` holds the seconds until
+    the breaker lets a probe request through.
+    """
+    def __init__(self, message, retry_after: Optional[float] = None):
+        super().__init__(message, status_code=None, retry_after=retry_after)
@@ -1,4 +1,70 @@
+import base64
+import json
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
 def authorization_from_token(token: str) -> dict:
     return {
         "Authorization": f"Bearer {token}"
     }
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """
+    Read the `exp` claim from a JWT without verifying its signature.
+
+    Returns: The expiry as a POSIX timestamp,
+        or None if the token is not a JWT or has no `exp` claim.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1]
+    payload += "=" * (-len(payload) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict):
+        return None
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        return None
+    return float(exp)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header given in seconds or as an HTTP date.
+
+    Returns: Seconds to wait, or None if the header is missing or malformed.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def lower_case_headers(headers: Mapping[str, str]) -> dict:
+    return {
+        name.lower(): value
+        for name, value in headers.items()
+    }
+
+
+def url_has_prefix(url: str, prefix: str) -> bool:
+    """
+    Whether `url` falls under `prefix`, matching whole path segments,
+    so `/v2/search` covers `/v2/search/1` and `/v2/search?q=1` but not `/v2/searches`.
+    """
+    return url.startswith(prefix) and url[len(prefix):len(prefix) + 1] in ("", "/", "?")
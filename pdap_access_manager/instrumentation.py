@@ -0,0 +1,255 @@
+import bisect
+import copy
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+from pdap_access_manager.models.request import RequestInfo
+
+# Path segments that identify a record rather than an endpoint
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$"
+)
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def url_template(path: str) -> str:
+    """Replace ID-like segments of a URL path with `{id}`, e.g. `/agencies/{id}`."""
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+def request_body_size(ri: RequestInfo) -> Optional[int]:
+    """Bytes of the body `ri` is sent with, serialized as the transports do."""
+    if ri.content is not None:
+        return len(ri.content)
+    if ri.json_ is not None:
+        return len(json.dumps(ri.json_).encode())
+    return None
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """One attempt at sending a request
+
+    Attributes:
+        method: HTTP method
+        host: Host the request was sent to
+        url_template: URL path with ID-like segments replaced by `{id}`
+        attempt: Attempt number, starting at 1
+        started_at: `time.monotonic()` when the attempt started
+        request_bytes: Size of the body as sent, i.e. after compression, if any
+        request_body_bytes: Size of the JSON body before compression, if any
+        duration: Seconds until the response or error, set when finished
+        status_code: Response status, or None if no response was received
+        response_bytes: `Content-Length` of the response, if known;
+            the compressed size for a compressed response
+        error: Exception raised by the attempt, if any
+    """
+    method: str
+    host: str
+    url_template: str
+    attempt: int
+    started_at: float
+    request_bytes: Optional[int] = None
+    request_body_bytes: Optional[int] = None
+    duration: Optional[float] = None
+    status_code: Optional[int] = None
+    response_bytes: Optional[int] = None
+    error: Optional[BaseException] = None
+
+    @classmethod
+    def start(cls, ri: RequestInfo, attempt: int, request_bytes: Optional[int] = None) -> "RequestEvent":
+        """`request_bytes` is measured from `ri` if not given; pass it to measure once for all attempts."""
+        parts = urlsplit(ri.url)
+        if request_bytes is None:
+            request_bytes = request_body_size(ri)
+        return cls(
+            method=ri.type_.value,
+            host=parts.netloc,
+            url_template=url_template(parts.path),
+            attempt=attempt,
+            started_at=time.monotonic(),
+            request_bytes=request_bytes,
+            request_body_bytes=request_bytes,
+        )
+
+    def finish(
+        self,
+        status_code: Optional[int],
+        error: Optional[BaseException] = None
+    ) -> None:
+        self.duration = time.monotonic() - self.started_at
+        self.status_code = status_code
+        self.error = error
+
+
+@dataclass(slots=True)
+class RetryEvent:
+    """A failed attempt that is about to be retried"""
+    method: str
+    url: str
+    attempt: int
+    status_code: Optional[int]
+    delay: float
+
+
+@dataclass(slots=True)
+class AuthEvent:
+    """A login or token refresh
+
+    Attributes:
+        kind: "login" or "refresh"
+        started_at: `time.monotonic()` when it started
+        duration: Seconds it took
+        success: Whether it completed without raising
+    """
+    kind: str
+    started_at: float
+    duration: float
+    success: bool
+
+
+class Hooks:
+    """
+    Callbacks for the request lifecycle of an access manager.
+    Override the methods of interest; the defaults do nothing.
+    Hooks run inline on the request path and must not block.
+    """
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        pass
+
+    def on_response(self, event: RequestEvent) -> None:
+        """Called when an attempt finishes, with a response or an error."""
+        pass
+
+    def on_retry(self, event: RetryEvent) -> None:
+        pass
+
+    def on_token_refresh(self, event: AuthEvent) -> None:
+        pass
+
+    def on_login(self, event: AuthEvent) -> None:
+        pass
+
+
+@dataclass
+class EndpointStats:
+    """Counts and a latency histogram for one method, host and URL template"""
+    buckets: tuple[float, ...]
+    count: int = 0
+    errors: int = 0
+    latency_sum: float = 0.0
+    bucket_counts: list[int] = field(default_factory=list)
+    statuses: dict[Optional[int], int] = field(default_factory=dict)
+    request_bytes: int = 0
+    request_body_bytes: int = 0
+    response_bytes: int = 0
+
+    def __post_init__(self):
+        if not self.bucket_counts:
+            # One extra bucket for observations above the largest bound
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, event: RequestEvent) -> None:
+        self.count += 1
+        if event.status_code is None or event.status_code >= 400:
+            self.errors += 1
+        self.statuses[event.status_code] = self.statuses.get(event.status_code, 0) + 1
+        self.latency_sum += event.duration
+        self.bucket_counts[bisect.bisect_left(self.buckets, event.duration)] += 1
+        self.request_bytes += event.request_bytes or 0
+        self.request_body_bytes += event.request_body_bytes or 0
+        self.response_bytes += event.response_bytes or 0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile `q`, or None if unknown."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return None
+
+
+class MetricsCollector(Hooks):
+    """
+    In-process metrics: per-endpoint latency histograms and status counts,
+    in-flight requests, retries, and login and refresh counts.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.endpoints: dict[tuple[str, str, str], EndpointStats] = {}
+        self.in_flight: dict[str, int] = {}
+        self.retries = 0
+        self.logins = 0
+        self.login_failures = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._lock = threading.Lock()
+
+    def on_request_start(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.in_flight[event.host] = self.in_flight.get(event.host, 0) + 1
+
+    def on_response(self, event: RequestEvent) -> None:
+        key = (event.method, event.host, event.url_template)
+        with self._lock:
+            self.in_flight[event.host] -= 1
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats(buckets=self.buckets)
+            stats.observe(event)
+
+    def on_retry(self, event: RetryEvent) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def on_token_refresh(self, event: AuthEvent) -> None:
+        with self._lock:
+            self.refreshes += 1
+            if not event.success:
+                self.refresh_failures += 1
+
+    def on_login(self, event: AuthEvent) -> None:
+        with self._lock:
+            self.logins += 1
+            if not event.success:
+                self.login_failures += 1
+
+    def snapshot(self) -> "MetricsCollector":
+        """A consistent copy of the collected metrics, for reporting."""
+        with self._lock:
+            snapshot = copy.copy(self)
+            snapshot.endpoints = copy.deepcopy(self.endpoints)
+            snapshot.in_flight = dict(self.in_flight)
+        snapshot._lock = threading.Lock()
+        return snapshot
+
+    def errors_by_status(self) -> dict[Optional[int], int]:
+        """Count of failed attempts per status; None for no response."""
+        totals: dict[Optional[int], int] = {}
+        with self._lock:
+            for stats in self.endpoints.values():
+                for status, count in stats.statuses.items():
+                    if status is None or status >= 400:
+                        totals[status] = totals.get(status, 0) + count
+        return totals
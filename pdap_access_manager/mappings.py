@@ -1,10 +1,18 @@
-from aiohttp import ClientSession
-
 from pdap_access_manager.enums import RequestType
 
-request_methods = {
-    RequestType.POST: ClientSession.post,
-    RequestType.PUT: ClientSession.put,
-    RequestType.GET: ClientSession.get,
-    RequestType.DELETE: ClientSession.delete,
-}
+
+def __getattr__(name: str):
+    # Built on first access so importing this module doesn't import aiohttp
+    if name != "request_methods":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from aiohttp import ClientSession
+
+    global request_methods
+    request_methods = {
+        RequestType.POST: ClientSession.post,
+        RequestType.PUT: ClientSession.put,
+        RequestType.GET: ClientSession.get,
+        RequestType.DELETE: ClientSession.delete,
+        RequestType.HEAD: ClientSession.head,
+    }
+    return request_methods
@@ -0,0 +1,29 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CircuitBreakerConfig(BaseModel):
+    """When the circuit breaker for a base URL opens, and how it recovers
+
+    A failure is a connection error, a timeout, or a response in `failure_statuses`.
+
+    Attributes:
+        consecutive_failures: int: Open after this many failures in a row
+        error_rate: Optional[float]: Open when this share of the last `window_size`
+            attempts failed, once at least `min_calls` were made; None to disable
+        window_size: int: Number of recent attempts the error rate is taken over
+        min_calls: int: Attempts needed in the window before the error rate is used
+        reset_timeout: float: Seconds the breaker stays open before letting probes through
+        half_open_max_calls: int: Probe requests allowed in flight while half-open
+        success_threshold: int: Successful probes needed to close the breaker
+        failure_statuses: frozenset[int]: Response statuses counted as failures
+    """
+    consecutive_failures: int = 5
+    error_rate: Optional[float] = 0.5
+    window_size: int = 20
+    min_calls: int = 10
+    reset_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    success_threshold: int = 1
+    failure_statuses: frozenset[int] = frozenset({500, 502, 503, 504})
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from pydantic import BaseModel, field_validator
+
+from pdap_access_manager.compression import zstd_available
+from pdap_access_manager.enums import ContentEncoding
+
+
+class CompressionConfig(BaseModel):
+    """Compression of request bodies, and negotiation of compressed responses
+
+    If the server answers a compressed body with 415 Unsupported Media Type,
+    the request is sent again uncompressed, and bodies to that host are no
+    longer compressed.
+
+    Attributes:
+        encoding: ContentEncoding: `Content-Encoding` of compressed request bodies;
+            zstd needs the `zstandard` package
+        min_size: int: JSON bodies smaller than this many bytes are sent as is
+        level: Optional[int]: Compression level, or None for a fast default
+        accept_encoding: bool: Send an `Accept-Encoding` header listing every
+            encoding the transport can decode, including zstd and brotli when installed
+    """
+    encoding: ContentEncoding = ContentEncoding.GZIP
+    min_size: int = 1024
+    level: Optional[int] = None
+    accept_encoding: bool = True
+
+    @field_validator("encoding")
+    @classmethod
+    def _encoding_available(cls, encoding: ContentEncoding) -> ContentEncoding:
+        if encoding == ContentEncoding.ZSTD and not zstd_available():
+            raise ValueError('zstd compression requires zstandard: pip install "pdap-access-manager[zstd]"')
+        return encoding
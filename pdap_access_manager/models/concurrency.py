@@ -0,0 +1,40 @@
+from pydantic import BaseModel, model_validator
+
+
+class AdaptiveConcurrencyConfig(BaseModel):
+    """How the adaptive limit on requests in flight to each base URL grows and shrinks
+
+    The limit grows additively while responses are healthy and the limit is
+    actually reached, and is cut multiplicatively on an overload signal:
+    a status in `overload_statuses`, a connection error or timeout, or a p95
+    latency over the last `latency_window` responses above `latency_tolerance`
+    times the baseline p95.
+
+    Attributes:
+        initial_limit: int: Requests allowed in flight at first
+        min_limit: int: Lowest limit an overload can cut to
+        max_limit: int: Highest limit healthy responses can grow to
+        increase_step: int: Added to the limit after a full limit's worth of healthy responses
+        decrease_factor: float: The limit is multiplied by this on an overload
+        latency_window: int: Responses the p95 latency is taken over
+        latency_tolerance: float: Ratio of p95 to baseline p95 treated as an overload
+        overload_statuses: frozenset[int]: Response statuses treated as an overload
+    """
+    initial_limit: int = 10
+    min_limit: int = 1
+    max_limit: int = 100
+    increase_step: int = 1
+    decrease_factor: float = 0.7
+    latency_window: int = 50
+    latency_tolerance: float = 2.0
+    overload_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+    @model_validator(mode="after")
+    def _check_limits(self) -> "AdaptiveConcurrencyConfig":
+        if not 1 <= self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < self.decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if self.latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be greater than 1")
+        return self
@@ -3,7 +3,7 @@ from typing import Optional
 from boltons import urlutils
 from pydantic import BaseModel
 
-from pdap_access_manager.enums import RequestType
+from pdap_access_manager.enums import RequestType, ResponseMode, RequestPriority
 
 
 class RequestInfo(BaseModel):
@@ -16,6 +16,14 @@ class RequestInfo(BaseModel):
         headers: Optional[dict] = None: Any headers to include in the request
         params: Optional[dict] = None: Any query parameters to include in the request
         timeout: Optional[int] = 10: The timeout for the request
+        content: Optional[bytes] = None: An encoded body, sent instead of `json_`
+        retryable: bool = False: Allow the retry policy to retry this request
+            even if its method is not retried by default (e.g. POST)
+        response_mode: ResponseMode = ResponseMode.JSON: How the body is returned
+            in `ResponseInfo.data`: decoded JSON, raw bytes, or an iterator
+            over the items of a JSON array or NDJSON body as they arrive
+        priority: Optional[RequestPriority] = None: Scheduling class for the
+            manager's `scheduler`; None for its default
 
     """
 
@@ -26,6 +34,10 @@ class RequestInfo(BaseModel):
     headers: Optional[dict] = None
     params: Optional[dict] = None
     timeout: Optional[int] = 10
+    content: Optional[bytes] = None
+    retryable: bool = False
+    response_mode: ResponseMode = ResponseMode.JSON
+    priority: Optional[RequestPriority] = None
 
     def kwargs(self) -> dict:
         d = {
@@ -33,6 +45,8 @@ class RequestInfo(BaseModel):
         }
         if self.json_ is not None:
             d['json'] = self.json_
+        if self.content is not None:
+            d['data'] = self.content
         if self.headers is not None:
             d['headers'] = self.headers
         if self.timeout is not None:
@@ -40,7 +54,7 @@ class RequestInfo(BaseModel):
         return d
 
     def url_with_query_params(self) -> str:
-        if self.params is None:
+        if not self.params:
             return self.url
         url = urlutils.URL(self.url)
         url.query_params.update(self.params)
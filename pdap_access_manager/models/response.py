@@ -1,9 +1,20 @@
 from http import HTTPStatus
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
 
 class ResponseInfo(BaseModel):
+    """Information about a given response
+
+    Attributes:
+        status_code: HTTPStatus: The status of the response
+        data: Any: The decoded JSON body, or None for a 304 or an empty body.
+            The raw bytes for `ResponseMode.BYTES`, and an iterator
+            (async for `AccessManagerAsync`) over the items for `ResponseMode.STREAM`
+        headers: Optional[dict] = None: Response headers with lower-cased names,
+            only captured when a feature such as the response cache needs them
+    """
     status_code: HTTPStatus
-    data: Optional[dict]
+    data: Any
+    headers: Optional[dict] = None
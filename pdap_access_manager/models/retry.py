@@ -0,0 +1,81 @@
+import random
+from http import HTTPStatus
+from typing import Optional
+
+from pydantic import BaseModel
+
+from pdap_access_manager.enums import RequestType
+
+
+class RetryPolicy(BaseModel):
+    """When and how long to wait before retrying a failed request
+
+    Subclass and override `next_delay` for custom behavior.
+
+    Attributes:
+        max_attempts: int: Total attempts per request, including the first
+        backoff_base: float: Seconds of backoff cap for the first retry, doubled per attempt
+        backoff_max: float: Upper bound in seconds on the backoff cap
+        retry_statuses: frozenset[int]: Response statuses that are retried
+        retry_methods: frozenset[RequestType]: Methods that are safe to retry;
+            others are retried only if `RequestInfo.retryable` is set
+        retry_connection_errors: bool: Retry when no response was received
+        respect_retry_after: bool: Wait for the `Retry-After` header when present
+        max_retry_after: float: Give up rather than wait longer than this for `Retry-After`
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: frozenset[int] = frozenset({
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    })
+    retry_methods: frozenset[RequestType] = frozenset({
+        RequestType.GET,
+        RequestType.HEAD,
+        RequestType.PUT,
+        RequestType.DELETE,
+    })
+    retry_connection_errors: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the retry after `attempt`."""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    def next_delay(
+        self,
+        type_: RequestType,
+        attempt: int,
+        status_code: Optional[int],
+        retry_after: Optional[float] = None,
+        retryable: bool = False
+    ) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to stop retrying.
+
+        Args:
+            type_: Method of the failed request
+            attempt: Number of the attempt that failed, starting at 1
+            status_code: Status of the failed response, or None if none was received
+            retry_after: Seconds requested by the `Retry-After` header, if any
+            retryable: Whether the caller opted in to retrying a non-idempotent request
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if type_ not in self.retry_methods and not retryable:
+            return None
+        if status_code is None:
+            if not self.retry_connection_errors:
+                return None
+        elif status_code not in self.retry_statuses:
+            return None
+        if retry_after is not None and self.respect_retry_after:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        return self.backoff(attempt)
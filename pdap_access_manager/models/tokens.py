@@ -1,6 +1,54 @@
-from pydantic import BaseModel
+import time
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+from pdap_access_manager.constants import DEFAULT_CLOCK_SKEW_SECONDS
+from pdap_access_manager.helpers import jwt_expiry
 
 
 class TokensInfo(BaseModel):
+    """Access and refresh tokens for PDAP
+
+    Attributes:
+        access_token: str: The JWT sent with authenticated requests
+        refresh_token: str: The JWT used to obtain new tokens
+        access_token_expires_at: Optional[float]: POSIX expiry of the access token,
+            decoded from its `exp` claim if not given
+        refresh_token_expires_at: Optional[float]: POSIX expiry of the refresh token,
+            decoded from its `exp` claim if not given
+        clock_skew: float: Seconds before expiry at which a token is treated as expired
+    """
     access_token: str
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
+    access_token_expires_at: Optional[float] = None
+    refresh_token_expires_at: Optional[float] = None
+    clock_skew: float = DEFAULT_CLOCK_SKEW_SECONDS
+
+    @model_validator(mode="after")
+    def _decode_expiry(self) -> "TokensInfo":
+        if self.access_token_expires_at is None:
+            self.access_token_expires_at = jwt_expiry(self.access_token)
+        if self.refresh_token_expires_at is None:
+            self.refresh_token_expires_at = jwt_expiry(self.refresh_token)
+        return self
+
+    def seconds_until_access_refresh(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until the access token should be refreshed,
+        or None if its expiry is unknown.
+        """
+        if self.access_token_expires_at is None:
+            return None
+        now = time.time() if now is None else now
+        return self.access_token_expires_at - self.clock_skew - now
+
+    def access_token_expired(self, now: Optional[float] = None) -> bool:
+        remaining = self.seconds_until_access_refresh(now)
+        return remaining is not None and remaining <= 0
+
+    def refresh_token_expired(self, now: Optional[float] = None) -> bool:
+        if self.refresh_token_expires_at is None:
+            return False
+        now = time.time() if now is None else now
+        return self.refresh_token_expires_at - self.clock_skew <= now
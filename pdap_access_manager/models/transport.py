@@ -0,0 +1,29 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class TransportConfig(BaseModel):
+    """Connection pooling settings, applied when a manager creates its own session
+
+    Attributes:
+        limit: int: Total simultaneous connections (aiohttp, httpx)
+        limit_per_host: int: Simultaneous connections per host, 0 for no limit (aiohttp)
+        keepalive_timeout: float: Seconds an idle connection is kept open (aiohttp, httpx)
+        ttl_dns_cache: Optional[int]: Seconds DNS results are cached, None to cache forever (aiohttp)
+        pool_connections: int: Number of host pools kept by the `HTTPAdapter` (requests)
+        pool_maxsize: int: Connections kept per host pool (requests)
+        pool_block: bool: Wait for a free connection instead of opening an
+            extra, unpooled one when a pool is exhausted (requests)
+        data_sources_limit: Optional[int]: Simultaneous connections to `data_sources_url`
+        source_collector_limit: Optional[int]: Simultaneous connections to `source_collector_url`
+    """
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    ttl_dns_cache: Optional[int] = 10
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    data_sources_limit: Optional[int] = None
+    source_collector_limit: Optional[int] = None
@@ -0,0 +1,283 @@
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from pdap_access_manager.enums import CircuitState
+from pdap_access_manager.instrumentation import MetricsCollector
+
+if TYPE_CHECKING:
+    from pdap_access_manager.access_manager._base import AccessManagerBase
+    from pdap_access_manager.cache import ResponseCache
+    from pdap_access_manager.scheduler import PriorityScheduler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: object) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + rendered + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class OpenMetricsExporter:
+    """
+    Renders access manager metrics in the OpenMetrics text format,
+    for scraping by Prometheus or any compatible collector.
+
+    Use `render()` for a plain string, or mount `wsgi_app`/`asgi_app`
+    in a web server. No metrics library is required.
+
+    Args:
+        metrics: Collector passed as `hooks` to the access managers
+        cache: Response cache to report hit ratios for, if any
+        managers: Access managers to report connection pool usage for
+        scheduler: Priority scheduler to report queue depths and waits for, if any
+        prefix: Prefix for every metric name
+    """
+
+    def __init__(
+        self,
+        metrics: MetricsCollector,
+        cache: Optional["ResponseCache"] = None,
+        managers: Iterable["AccessManagerBase"] = (),
+        scheduler: Optional["PriorityScheduler"] = None,
+        prefix: str = "pdap_access_manager"
+    ):
+        self.metrics = metrics
+        self.cache = cache
+        self.managers = list(managers)
+        self.scheduler = scheduler
+        self.prefix = prefix
+
+    def render(self) -> str:
+        lines: list[str] = []
+        snapshot = self.metrics.snapshot()
+        self._render_requests(lines, snapshot)
+        self._render_auth(lines, snapshot)
+        self._render_cache(lines)
+        self._render_pools(lines)
+        self._render_circuit_breakers(lines)
+        self._render_concurrency(lines)
+        self._render_scheduler(lines)
+        self._render_credentials(lines)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _family(self, lines: list[str], name: str, type_: str, help_: str) -> str:
+        full_name = f"{self.prefix}_{name}"
+        lines.append(f"# TYPE {full_name} {type_}")
+        lines.append(f"# HELP {full_name} {help_}")
+        return full_name
+
+    def _render_requests(self, lines: list[str], snapshot: MetricsCollector) -> None:
+        endpoints = sorted(snapshot.endpoints.items())
+
+        name = self._family(lines, "requests", "counter", "Request attempts by endpoint.")
+        for (method, host, template), stats in endpoints:
+            labels = _labels(method=method, host=host, endpoint=template)
+            lines.append(f"{name}_total{labels} {stats.count}")
+
+        name = self._family(
+            lines, "request_errors", "counter",
+            "Failed request attempts by endpoint and status; status is empty if no response was received."
+        )
+        for (method, host, template), stats in endpoints:
+            for status, count in sorted(stats.statuses.items(), key=lambda item: item[0] or 0):
+                if status is not None and status < 400:
+                    continue
+                labels = _labels(
+                    method=method, host=host, endpoint=template,
+                    status="" if status is None else int(status)
+                )
+                lines.append(f"{name}_total{labels} {count}")
+
+        name = self._family(
+            lines, "request_duration_seconds", "histogram", "Request attempt latency by endpoint."
+        )
+        for (method, host, template), stats in endpoints:
+            cumulative = 0
+            bounds = list(stats.buckets) + [float("inf")]
+            for bound, bucket_count in zip(bounds, stats.bucket_counts):
+                cumulative += bucket_count
+                labels = _labels(
+                    method=method, host=host, endpoint=template, le=_format_number(bound)
+                )
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = _labels(method=method, host=host, endpoint=template)
+            lines.append(f"{name}_count{labels} {stats.count}")
+            lines.append(f"{name}_sum{labels} {_format_number(stats.latency_sum)}")
+
+        for suffix, attribute, help_ in (
+            ("request_bytes", "request_bytes", "Request body bytes sent by endpoint, after compression."),
+            ("request_body_bytes", "request_body_bytes", "JSON request body bytes by endpoint, before compression."),
+            ("response_bytes", "response_bytes", "Response bytes received by endpoint, per Content-Length."),
+        ):
+            name = self._family(lines, suffix, "counter", help_)
+            for (method, host, template), stats in endpoints:
+                labels = _labels(method=method, host=host, endpoint=template)
+                lines.append(f"{name}_total{labels} {getattr(stats, attribute)}")
+
+        name = self._family(lines, "requests_in_flight", "gauge", "Request attempts in flight by host.")
+        for host, count in sorted(snapshot.in_flight.items()):
+            lines.append(f"{name}{_labels(host=host)} {count}")
+
+        name = self._family(lines, "retries", "counter", "Request attempts that were retried.")
+        lines.append(f"{name}_total {snapshot.retries}")
+
+    def _render_auth(self, lines: list[str], metrics: MetricsCollector) -> None:
+        for name, help_, total, failures in (
+            ("token_refreshes", "Token refreshes.", metrics.refreshes, metrics.refresh_failures),
+            ("logins", "Logins.", metrics.logins, metrics.login_failures),
+        ):
+            full_name = self._family(lines, name, "counter", help_)
+            lines.append(f"{full_name}_total{_labels(result='success')} {total - failures}")
+            lines.append(f"{full_name}_total{_labels(result='failure')} {failures}")
+
+    def _render_cache(self, lines: list[str]) -> None:
+        if self.cache is None:
+            return
+        stats = self.cache.stats
+        for name, help_, value in (
+            ("cache_hits", "Response cache hits.", stats.hits),
+            ("cache_misses", "Response cache misses.", stats.misses),
+            ("cache_revalidations", "Stale cache entries revalidated with a 304.", stats.revalidations),
+        ):
+            full_name = self._family(lines, name, "counter", help_)
+            lines.append(f"{full_name}_total {value}")
+        name = self._family(lines, "cache_hit_ratio", "gauge", "Share of cache lookups that were hits.")
+        lines.append(f"{name} {_format_number(stats.hit_ratio)}")
+
+    def _render_pools(self, lines: list[str]) -> None:
+        if not self.managers:
+            return
+        pools = []
+        for index, manager in enumerate(self.managers):
+            stats = manager.connection_pool_stats()
+            if stats:
+                pools.append((_labels(manager=f"{type(manager).__name__}-{index}"), stats))
+        name = self._family(lines, "connection_pool_limit", "gauge", "Connection pool size by manager.")
+        lines.extend(f"{name}{labels} {stats['limit']}" for labels, stats in pools)
+        name = self._family(
+            lines, "connection_pool_in_use", "gauge", "Connections checked out of the pool by manager."
+        )
+        lines.extend(f"{name}{labels} {stats['in_use']}" for labels, stats in pools if "in_use" in stats)
+
+    def _render_circuit_breakers(self, lines: list[str]) -> None:
+        breakers = [
+            (f"{type(manager).__name__}-{index}", base_url, stats)
+            for index, manager in enumerate(self.managers)
+            for base_url, stats in manager.circuit_breaker_stats().items()
+        ]
+        if not breakers:
+            return
+        name = self._family(
+            lines, "circuit_breaker_state", "stateset", "Circuit breaker state by manager and base URL."
+        )
+        for manager, base_url, stats in breakers:
+            for state in CircuitState:
+                # A stateset is labeled with its own name
+                labels = _labels(**{"manager": manager, "base_url": base_url, name: state.value})
+                lines.append(f"{name}{labels} {int(stats.state == state)}")
+        name = self._family(
+            lines, "circuit_breaker_rejected", "counter", "Requests rejected by an open circuit breaker."
+        )
+        for manager, base_url, stats in breakers:
+            lines.append(f"{name}_total{_labels(manager=manager, base_url=base_url)} {stats.rejected}")
+
+    def _render_concurrency(self, lines: list[str]) -> None:
+        limiters = [
+            (_labels(manager=f"{type(manager).__name__}-{index}", base_url=base_url), stats)
+            for index, manager in enumerate(self.managers)
+            for base_url, stats in manager.concurrency_stats().items()
+        ]
+        if not limiters:
+            return
+        name = self._family(
+            lines, "concurrency_limit", "gauge", "Adaptive limit on requests in flight by manager and base URL."
+        )
+        lines.extend(f"{name}{labels} {stats.limit}" for labels, stats in limiters)
+        name = self._family(
+            lines, "concurrency_in_flight", "gauge", "Requests holding an adaptive concurrency slot."
+        )
+        lines.extend(f"{name}{labels} {stats.in_flight}" for labels, stats in limiters)
+        name = self._family(
+            lines, "concurrency_waiting", "gauge", "Requests waiting for an adaptive concurrency slot."
+        )
+        lines.extend(f"{name}{labels} {stats.waiting}" for labels, stats in limiters)
+
+    def _render_scheduler(self, lines: list[str]) -> None:
+        if self.scheduler is None:
+            return
+        classes = [
+            (_labels(priority=priority.value), stats)
+            for priority, stats in self.scheduler.stats().items()
+        ]
+        name = self._family(lines, "scheduler_queue_depth", "gauge", "Requests waiting for a slot by priority.")
+        lines.extend(f"{name}{labels} {stats.waiting}" for labels, stats in classes)
+        name = self._family(lines, "scheduler_in_flight", "gauge", "Requests holding a slot by priority.")
+        lines.extend(f"{name}{labels} {stats.in_flight}" for labels, stats in classes)
+        name = self._family(
+            lines, "scheduler_wait_seconds", "summary", "Time requests waited for a slot by priority."
+        )
+        for labels, stats in classes:
+            lines.append(f"{name}_count{labels} {stats.started}")
+            lines.append(f"{name}_sum{labels} {_format_number(stats.wait_seconds)}")
+
+    def _render_credentials(self, lines: list[str]) -> None:
+        credentials = [
+            (_labels(manager=f"{type(manager).__name__}-{index}", credential=credential), stats)
+            for index, manager in enumerate(self.managers)
+            # Only pooled managers have several credentials
+            for credential, stats in getattr(manager, "credential_stats", dict)().items()
+        ]
+        if not credentials:
+            return
+        name = self._family(lines, "credential_in_flight", "gauge", "Requests in flight by pooled credential.")
+        lines.extend(f"{name}{labels} {stats.in_flight}" for labels, stats in credentials)
+        name = self._family(lines, "credential_requests", "counter", "Requests sent by pooled credential.")
+        lines.extend(f"{name}_total{labels} {stats.requests}" for labels, stats in credentials)
+        name = self._family(
+            lines, "credential_throttled", "counter", "429 responses by pooled credential."
+        )
+        lines.extend(f"{name}_total{labels} {stats.throttled}" for labels, stats in credentials)
+        name = self._family(
+            lines, "credential_throttled_seconds", "gauge", "Seconds until a throttled credential is used again."
+        )
+        lines.extend(
+            f"{name}{labels} {_format_number(stats.seconds_throttled)}" for labels, stats in credentials
+        )
+
+    def wsgi_app(self, environ, start_response) -> list[bytes]:
+        body = self.render().encode()
+        start_response(
+            "200 OK",
+            [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))]
+        )
+        return [body]
+
+    async def asgi_app(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        body = self.render().encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", CONTENT_TYPE.encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
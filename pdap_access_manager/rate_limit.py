@@ -0,0 +1,161 @@
+import threading
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Mapping, Optional
+
+from pdap_access_manager.helpers import url_has_prefix
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: `rate` requests per second, with bursts of up to `burst`
+
+    Attributes:
+        rate: Sustained requests per second
+        burst: Requests that may be sent at once after an idle period
+        min_rate: Lowest rate the limiter shrinks to after 429s;
+            a tenth of `rate` if not given
+    """
+    rate: float
+    burst: int = 1
+    min_rate: Optional[float] = None
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        if self.min_rate is not None and not 0 < self.min_rate <= self.rate:
+            raise ValueError("min_rate must be positive and at most rate")
+
+
+class _Bucket:
+    """
+    Token bucket kept as the time the next request may go out (GCRA),
+    so that a reservation is O(1) and never needs a timer.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.rate = limit.rate
+        self.min_rate = limit.min_rate or limit.rate / 10
+        # Time at which the bucket would be empty if every reservation were sent
+        self.empty_at = 0.0
+        self.last_decrease = float("-inf")
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.rate
+
+    def reserve(self, now: float) -> float:
+        tolerance = (self.limit.burst - 1) * self.interval
+        empty_at = max(self.empty_at, now)
+        self.empty_at = empty_at + self.interval
+        return max(empty_at - tolerance - now, 0.0)
+
+    def block_until(self, until: float) -> None:
+        tolerance = (self.limit.burst - 1) * self.interval
+        self.empty_at = max(self.empty_at, until + tolerance)
+
+
+class RateLimiter:
+    """
+    Client-side token-bucket rate limiter, keyed by URL prefix.
+
+    Keys are base URLs such as `data_sources_url`, or longer prefixes for
+    per-endpoint limits. A request takes a token from every bucket whose
+    prefix it matches, so an endpoint limit applies within its base URL's.
+    One limiter may be shared by several managers.
+
+    With `adaptive=True`, a 429 halves the rate of the matching buckets
+    (at most once per `decrease_cooldown` seconds, and not below `min_rate`),
+    a `Retry-After` holds them until it has passed, and each successful
+    response recovers `increase_step` of the configured rate.
+
+    Usage:
+        RateLimiter({
+            DEFAULT_DATA_SOURCES_URL: RateLimit(rate=10, burst=20),
+            f"{DEFAULT_DATA_SOURCES_URL}/v2/search": RateLimit(rate=2),
+        })
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit],
+        adaptive: bool = True,
+        decrease_factor: float = 0.5,
+        increase_step: float = 0.05,
+        decrease_cooldown: float = 1.0
+    ):
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step
+        self.decrease_cooldown = decrease_cooldown
+        self._buckets: dict[str, _Bucket] = {
+            prefix.rstrip("/"): _Bucket(limit) for prefix, limit in limits.items()
+        }
+        self._lock = threading.Lock()
+
+    def copy(self) -> "RateLimiter":
+        """A limiter with the same limits and settings, whose buckets start full and adapt on their own."""
+        return RateLimiter(
+            {prefix: bucket.limit for prefix, bucket in self._buckets.items()},
+            adaptive=self.adaptive,
+            decrease_factor=self.decrease_factor,
+            increase_step=self.increase_step,
+            decrease_cooldown=self.decrease_cooldown
+        )
+
+    def _matching(self, url: str) -> list[_Bucket]:
+        return [
+            bucket for prefix, bucket in self._buckets.items()
+            if url_has_prefix(url, prefix)
+        ]
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a token for a request to `url`.
+
+        Returns: Seconds the caller must wait before sending, 0 if it may send now.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return max(
+                (bucket.reserve(now) for bucket in self._matching(url)),
+                default=0.0
+            )
+
+    def observe(self, url: str, status_code: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Adapt the rates for `url` to the outcome of a request."""
+        if not self.adaptive:
+            return
+        rate_limited = status_code == HTTPStatus.TOO_MANY_REQUESTS
+        if status_code is None or (status_code >= 400 and not rate_limited):
+            return
+        now = time.monotonic()
+        with self._lock:
+            for bucket in self._matching(url):
+                if rate_limited:
+                    self._decrease(bucket, now, retry_after)
+                elif bucket.rate < bucket.limit.rate:
+                    bucket.rate = min(
+                        bucket.rate + bucket.limit.rate * self.increase_step,
+                        bucket.limit.rate
+                    )
+
+    def _decrease(self, bucket: _Bucket, now: float, retry_after: Optional[float]) -> None:
+        if retry_after is not None:
+            bucket.block_until(now + retry_after)
+        # The 429s of requests already in flight report the same overload
+        if now - bucket.last_decrease < self.decrease_cooldown:
+            return
+        bucket.last_decrease = now
+        bucket.rate = max(bucket.rate * self.decrease_factor, bucket.min_rate)
+
+    def current_rates(self) -> dict[str, float]:
+        """Current requests per second allowed for each prefix."""
+        with self._lock:
+            return {prefix: bucket.rate for prefix, bucket in self._buckets.items()}
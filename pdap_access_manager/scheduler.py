@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from pdap_access_manager.enums import RequestPriority
+from pdap_access_manager.waiters import Waiter, percentile_95, resolve
+
+DEFAULT_PRIORITY_WEIGHTS: Mapping[RequestPriority, int] = {
+    RequestPriority.INTERACTIVE: 8,
+    RequestPriority.NORMAL: 4,
+    RequestPriority.BULK: 1,
+}
+DEFAULT_PRIORITY_RESERVATIONS: Mapping[RequestPriority, int] = {
+    RequestPriority.INTERACTIVE: 2,
+}
+# Recent waits per class that the p95 wait is taken over
+_WAIT_WINDOW = 200
+
+
+@dataclass
+class PriorityClassStats:
+    """Queue depth and wait times of one priority class, for monitoring
+
+    Attributes:
+        waiting: Requests queued for a slot
+        in_flight: Requests holding a slot
+        started: Requests that got a slot since the scheduler was created
+        wait_seconds: Total time those requests spent queued
+        p95_wait_seconds: p95 wait of the most recent requests, None before the first
+    """
+    waiting: int
+    in_flight: int
+    started: int
+    wait_seconds: float
+    p95_wait_seconds: Optional[float]
+
+
+class _Queued(Waiter):
+    __slots__ = ("finish", "enqueued")
+
+    def __init__(self, wake, finish: float, enqueued: float):
+        super().__init__(wake)
+        self.finish = finish
+        self.enqueued = enqueued
+
+
+class _PriorityClass:
+    def __init__(self, weight: int, reserved: int):
+        self.weight = weight
+        self.reserved = reserved
+        self.queue: deque[_Queued] = deque()
+        self.in_flight = 0
+        self.last_finish = 0.0
+        self.started = 0
+        self.wait_seconds = 0.0
+        self.waits: deque[float] = deque(maxlen=_WAIT_WINDOW)
+
+
+class PriorityScheduler:
+    """
+    Shares `max_concurrency` request slots between priority classes.
+
+    When requests are queued, slots go to the classes in proportion to their
+    `weights` (weighted fair queuing), so bulk traffic keeps moving without
+    holding interactive requests back for long. `reserved` slots of a class
+    are never given to another one, so a burst of bulk requests cannot take
+    every slot. `RequestPriority.AUTH` requests (login and token refresh)
+    never wait: requests holding slots may be waiting on them.
+
+    The scheduler applies to each send, not to the backoff between retries.
+    Threads and event loops may share one scheduler, e.g. between managers.
+
+    Usage:
+        PriorityScheduler(
+            max_concurrency=20,
+            weights={RequestPriority.INTERACTIVE: 10, RequestPriority.BULK: 1},
+            reserved={RequestPriority.INTERACTIVE: 5},
+        )
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        weights: Mapping[RequestPriority, int] = DEFAULT_PRIORITY_WEIGHTS,
+        reserved: Mapping[RequestPriority, int] = DEFAULT_PRIORITY_RESERVATIONS,
+        default_priority: RequestPriority = RequestPriority.NORMAL
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if RequestPriority.AUTH in weights or RequestPriority.AUTH in reserved:
+            raise ValueError("AUTH requests are always sent first and take no weight or reservation")
+        if any(weight < 1 for weight in weights.values()):
+            raise ValueError("weights must be at least 1")
+        if sum(reserved.values()) >= max_concurrency:
+            raise ValueError("reserved slots must leave at least one slot unreserved")
+        self.max_concurrency = max_concurrency
+        self.default_priority = default_priority
+        self._classes: dict[RequestPriority, _PriorityClass] = {
+            priority: _PriorityClass(weights.get(priority, 1), reserved.get(priority, 0))
+            for priority in RequestPriority
+        }
+        self._in_flight = 0
+        # Finish tag of the last request given a slot; weighted fair queuing's virtual time
+        self._virtual_time = 0.0
+        self._lock = threading.Lock()
+
+    def _can_start(self, priority: RequestPriority) -> bool:
+        if priority == RequestPriority.AUTH:
+            return True
+        held_for_others = sum(
+            max(other.reserved - other.in_flight, 0)
+            for other_priority, other in self._classes.items()
+            if other_priority != priority
+        )
+        return self._in_flight + held_for_others < self.max_concurrency
+
+    def _dispatch(self) -> None:
+        """Give free slots to queued requests, AUTH first, then in order of finish tag."""
+        while True:
+            chosen: Optional[RequestPriority] = None
+            for priority, priority_class in self._classes.items():
+                if not priority_class.queue or not self._can_start(priority):
+                    continue
+                if priority == RequestPriority.AUTH:
+                    chosen = priority
+                    break
+                if chosen is None or priority_class.queue[0].finish < self._classes[chosen].queue[0].finish:
+                    chosen = priority
+            if chosen is None:
+                return
+            priority_class = self._classes[chosen]
+            queued = priority_class.queue.popleft()
+            priority_class.in_flight += 1
+            self._in_flight += 1
+            self._virtual_time = max(self._virtual_time, queued.finish)
+            wait = time.monotonic() - queued.enqueued
+            priority_class.started += 1
+            priority_class.wait_seconds += wait
+            priority_class.waits.append(wait)
+            queued.granted = True
+            queued.wake()
+
+    def _enqueue(self, priority: RequestPriority, wake) -> _Queued:
+        priority_class = self._classes[priority]
+        finish = max(self._virtual_time, priority_class.last_finish) + 1 / priority_class.weight
+        priority_class.last_finish = finish
+        queued = _Queued(wake, finish, time.monotonic())
+        priority_class.queue.append(queued)
+        self._dispatch()
+        return queued
+
+    def acquire(self, priority: Optional[RequestPriority] = None) -> RequestPriority:
+        """
+        Wait for a slot, blocking the thread.
+
+        Returns: The priority the slot was taken under, to pass to `release`.
+        """
+        priority = priority or self.default_priority
+        event = threading.Event()
+        with self._lock:
+            self._enqueue(priority, event.set)
+        event.wait()
+        return priority
+
+    async def acquire_async(self, priority: Optional[RequestPriority] = None) -> RequestPriority:
+        """
+        Wait for a slot without blocking the event loop.
+
+        Returns: The priority the slot was taken under, to pass to `release`.
+        """
+        priority = priority or self.default_priority
+        # Imported here so that the sync managers never load asyncio
+        import asyncio
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            queued = self._enqueue(priority, lambda: loop.call_soon_threadsafe(resolve, future))
+            if queued.granted:
+                return priority
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                if queued.granted:
+                    self._release(priority)
+                else:
+                    self._classes[priority].queue.remove(queued)
+            raise
+        return priority
+
+    def release(self, priority: RequestPriority) -> None:
+        """Give back a slot taken with `acquire` or `acquire_async`."""
+        with self._lock:
+            self._release(priority)
+
+    def _release(self, priority: RequestPriority) -> None:
+        self._classes[priority].in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    def stats(self) -> dict[RequestPriority, PriorityClassStats]:
+        """Queue depth and wait times of each priority class."""
+        with self._lock:
+            return {
+                priority: PriorityClassStats(
+                    waiting=len(priority_class.queue),
+                    in_flight=priority_class.in_flight,
+                    started=priority_class.started,
+                    wait_seconds=priority_class.wait_seconds,
+                    p95_wait_seconds=percentile_95(list(priority_class.waits)) if priority_class.waits else None,
+                )
+                for priority, priority_class in self._classes.items()
+            }
@@ -0,0 +1,155 @@
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+
+JsonDecoder = Callable[[bytes], Any]
+
+_WHITESPACE = b" \t\r\n"
+# Outside strings, only these bytes change the nesting or end an item
+_STRUCTURAL = re.compile(rb'[\[\]{}",]')
+_STRING_END = re.compile(rb'["\\]')
+
+
+class JsonItemDecoder:
+    """
+    Decodes the items of a JSON body fed in chunks of any size, so that each
+    item can be used and freed before the rest of the body has arrived.
+
+    A body starting with `[` is read as a top-level array and its elements
+    are decoded one by one. Any other body is read as NDJSON, one document
+    per line. Only the bytes of the item being received are buffered.
+
+    Usage:
+        decoder = JsonItemDecoder()
+        for chunk in chunks:
+            yield from decoder.feed(chunk)
+        yield from decoder.close()
+    """
+
+    def __init__(self, loads: JsonDecoder = json.loads):
+        self.loads = loads
+        self._buffer = bytearray()
+        # Index in `_buffer` up to which the bytes have been scanned
+        self._pos = 0
+        # None until the first byte, then True for an array, False for NDJSON
+        self._array = None
+        self._depth = 0
+        self._in_string = False
+        self._item_start = 0
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Add the next chunk of the body. Returns: The items it completed."""
+        self._buffer += chunk
+        if self._array is None:
+            stripped = self._buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self._array = stripped[:1] == b"["
+            if self._array:
+                self._pos = len(self._buffer) - len(stripped) + 1
+                self._item_start = self._pos
+        items = self._scan_array() if self._array else self._scan_lines()
+        # Drop the bytes of items already decoded
+        if self._item_start:
+            del self._buffer[:self._item_start]
+            self._pos -= self._item_start
+            self._item_start = 0
+        return items
+
+    def close(self) -> list[Any]:
+        """Finish the body. Returns: The last items, if any."""
+        if self._array is None:
+            return []
+        if self._array:
+            if not self._finished:
+                raise ValueError("JSON array body ended before its closing bracket")
+            return []
+        line = bytes(self._buffer[self._item_start:]).strip()
+        self._buffer.clear()
+        self._pos = self._item_start = 0
+        return [self.loads(line)] if line else []
+
+    def _scan_lines(self) -> list[Any]:
+        items = []
+        buffer = self._buffer
+        while True:
+            end = buffer.find(b"\n", self._pos)
+            if end < 0:
+                self._pos = len(buffer)
+                return items
+            line = bytes(buffer[self._item_start:end]).strip()
+            if line:
+                items.append(self.loads(line))
+            self._pos = self._item_start = end + 1
+
+    def _scan_array(self) -> list[Any]:
+        items = []
+        buffer = self._buffer
+        pos = self._pos
+        while not self._finished:
+            if self._in_string:
+                match = _STRING_END.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.end()
+                if match.group() == b"\\":
+                    if pos >= len(buffer):
+                        # The escaped byte is in the next chunk
+                        pos -= 1
+                        break
+                    pos += 1
+                else:
+                    self._in_string = False
+                continue
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            byte = match.group()
+            pos = match.end()
+            if byte == b'"':
+                self._in_string = True
+            elif byte in b"[{":
+                self._depth += 1
+            elif self._depth:
+                if byte in b"]}":
+                    self._depth -= 1
+            else:
+                # A comma or the closing bracket of the top-level array
+                item = bytes(buffer[self._item_start:pos - 1]).strip()
+                if item:
+                    items.append(self.loads(item))
+                self._item_start = pos
+                self._finished = byte == b"]"
+        self._pos = pos
+        return items
+
+
+def iter_items(chunks: Iterable[bytes], loads: JsonDecoder = json.loads) -> Iterator[Any]:
+    """Yield the items of a JSON array or NDJSON body from its chunks."""
+    decoder = JsonItemDecoder(loads)
+    try:
+        for chunk in chunks:
+            yield from decoder.feed(chunk)
+        yield from decoder.close()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+async def aiter_items(chunks: AsyncIterable[bytes], loads: JsonDecoder = json.loads) -> AsyncIterator[Any]:
+    """Yield the items of a JSON array or NDJSON body from its chunks as they arrive."""
+    decoder = JsonItemDecoder(loads)
+    try:
+        async for chunk in chunks:
+            for item in decoder.feed(chunk):
+                yield item
+        for item in decoder.close():
+            yield item
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,168 @@
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from pdap_access_manager.models.tokens import TokensInfo
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class StoredCredentials(BaseModel):
+    """Credentials shared between access managers through a `TokenStore`
+
+    Attributes:
+        email: The account the credentials belong to; None for managers
+            built from tokens or an API key without `auth`
+    """
+    email: Optional[str] = None
+    tokens: Optional[TokensInfo] = None
+    api_key: Optional[str] = None
+
+
+class StoreLock:
+    """Lock held while a manager refreshes tokens. The base class does not lock."""
+
+    def acquire(self) -> None:
+        pass
+
+    def release(self) -> None:
+        pass
+
+    def __enter__(self) -> "StoreLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+class FileLock(StoreLock):
+    """Exclusive advisory lock on a file, held across processes and threads."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+class TokenStore(ABC):
+    """
+    Persists tokens and the API key so that restarts and
+    worker processes can reuse them instead of logging in again.
+    """
+
+    @abstractmethod
+    def load(self) -> StoredCredentials:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(
+        self,
+        tokens: Optional[TokensInfo] = None,
+        api_key: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> None:
+        """
+        Persist whichever of `tokens` and `api_key` are given for the account `email`,
+        keeping the other if it belongs to the same account.
+        """
+        raise NotImplementedError
+
+    def refresh_lock(self) -> StoreLock:
+        """
+        Lock held by a manager while it refreshes or logs in,
+        so that other managers sharing the store wait and reuse the result.
+        """
+        return StoreLock()
+
+
+class FileTokenStore(TokenStore):
+    """
+    Stores credentials as JSON in a file shared by processes on one host.
+
+    Writes are atomic (write to a temporary file, then rename) and
+    serialized with a lock file, so readers never see a partial file.
+    The file is created with owner-only permissions.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._write_lock_path = self.path.with_name(self.path.name + ".lock")
+        self._refresh_lock_path = self.path.with_name(self.path.name + ".refresh.lock")
+
+    def load(self) -> StoredCredentials:
+        try:
+            raw = self.path.read_text()
+        except FileNotFoundError:
+            return StoredCredentials()
+        try:
+            return StoredCredentials.model_validate_json(raw)
+        except ValueError:
+            return StoredCredentials()
+
+    def save(
+        self,
+        tokens: Optional[TokensInfo] = None,
+        api_key: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> None:
+        with FileLock(self._write_lock_path):
+            credentials = self.load()
+            if credentials.email != email:
+                credentials = StoredCredentials(email=email)
+            if tokens is not None:
+                credentials.tokens = tokens
+            if api_key is not None:
+                credentials.api_key = api_key
+            self._write_atomic(credentials.model_dump_json())
+
+    def refresh_lock(self) -> StoreLock:
+        return FileLock(self._refresh_lock_path)
+
+    def _write_atomic(self, content: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.path.parent,
+            prefix=f".{self.path.name}.",
+            suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
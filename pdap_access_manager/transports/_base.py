@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.streaming import JsonDecoder
+
+
+@dataclass(slots=True)
+class TransportResponse:
+    """A successful response, in the same shape whichever HTTP library sent it
+
+    Attributes:
+        status_code: The HTTP status, below 400
+        headers: Response headers as sent by the server
+        data: The body in the form `RequestInfo.response_mode` asks for:
+            the decoded JSON (None for a 304 or an empty body), the raw bytes,
+            or an iterator over its chunks that releases the connection when done
+        content_length: Size of the body in bytes, if known
+    """
+    status_code: int
+    headers: Mapping[str, str]
+    data: Any = None
+    content_length: Optional[int] = None
+
+
+class _TransportBase(ABC):
+    # Failures with no response that are worth retrying, e.g. a refused connection
+    connection_errors: tuple[type[BaseException], ...] = ()
+    # Every failure the library raises, including `connection_errors`
+    errors: tuple[type[BaseException], ...] = ()
+    # Response encodings the library decodes, for `Accept-Encoding`; None if it decodes none
+    accept_encoding: Optional[str] = None
+
+    @property
+    def session(self) -> Any:
+        """The library's session or client, or None if it has none."""
+        return None
+
+    def open(self) -> bool:
+        """
+        Create the session if there is none yet.
+
+        Returns: True if a session was created, which `close` should then close.
+        """
+        return False
+
+    def pool_stats(self) -> dict[str, int]:
+        """
+        Pool size (`limit`) and connections checked out (`in_use`, left out
+        if the client library cannot tell), or an empty dict if there is no pool.
+        """
+        return {}
+
+
+class Transport(_TransportBase):
+    """
+    Sends requests for `AccessManagerSync`.
+
+    `send` returns a `TransportResponse` for a status below 400 and raises
+    `RequestError` with the status and `Retry-After` for any other.
+    Failures with no response are raised as the library's own exceptions,
+    listed in `errors`. JSON bodies are decoded with `loads` if given,
+    otherwise with the library's own decoder.
+    """
+
+    @abstractmethod
+    def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Close any session this transport created."""
+        pass
+
+
+class AsyncTransport(_TransportBase):
+    """
+    Sends requests for `AccessManagerAsync`.
+
+    `send` returns a `TransportResponse` for a status below 400 and raises
+    `RequestError` with the status and `Retry-After` for any other.
+    Failures with no response are raised as the library's own exceptions,
+    listed in `errors`. JSON bodies are decoded with `loads` if given,
+    otherwise with the library's own decoder.
+    """
+
+    @abstractmethod
+    async def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Close any session this transport created."""
+        pass
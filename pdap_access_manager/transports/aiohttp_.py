@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import re
+from http import HTTPStatus
+from typing import AsyncIterator, Optional
+from typing_extensions import override
+
+import aiohttp
+from aiohttp import compression_utils
+from aiohttp import ClientSession, ClientResponse, ClientResponseError, ClientError, ClientConnectionError, \
+    ClientTimeout, TCPConnector
+
+from pdap_access_manager.constants import DEFAULT_STREAM_CHUNK_SIZE
+from pdap_access_manager.enums import ResponseMode
+from pdap_access_manager.exceptions import IncorrectSessionError, RequestError
+from pdap_access_manager.helpers import parse_retry_after
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.transport import TransportConfig
+from pdap_access_manager.streaming import JsonDecoder
+from pdap_access_manager.transports._base import AsyncTransport, TransportResponse
+
+
+def _reads_acquired_connections() -> bool:
+    """
+    Whether `TCPConnector._acquired` is the set of checked-out connections on
+    the installed aiohttp. It is private, so it is only read on the versions
+    that tests/async_/test_transports.py checks.
+    """
+    version = tuple(int(part) for part in re.findall(r"\d+", aiohttp.__version__)[:2])
+    return (3, 11) <= version < (3, 15)
+
+
+_READS_ACQUIRED_CONNECTIONS = _reads_acquired_connections()
+
+
+def _accept_encoding() -> str:
+    encodings = ["gzip", "deflate"]
+    # Flags for optional decoders; older aiohttp versions lack the zstd one
+    if getattr(compression_utils, "HAS_BROTLI", False):
+        encodings.insert(0, "br")
+    if getattr(compression_utils, "HAS_ZSTD", False):
+        encodings.insert(0, "zstd")
+    return ", ".join(encodings)
+
+
+class AiohttpTransport(AsyncTransport):
+    """
+    Sends requests with an aiohttp `ClientSession`.
+
+    A session passed in is used as is and never closed.
+    Otherwise one is created from `config` when opened, or lazily on first use.
+    """
+    connection_errors = (ClientConnectionError, asyncio.TimeoutError)
+    errors = (ClientError, asyncio.TimeoutError)
+    accept_encoding = _accept_encoding()
+
+    def __init__(
+        self,
+        session: Optional[ClientSession] = None,
+        config: Optional[TransportConfig] = None
+    ):
+        if session is not None and not isinstance(session, ClientSession):
+            raise IncorrectSessionError(
+                f"Expected session type: {ClientSession.__name__}, "
+                f"got: {type(session).__name__}"
+            )
+        self.config = config or TransportConfig()
+        self._session = session
+        self._external_session = session
+        self.logger = logging.getLogger(__name__)
+
+    def _new_session(self) -> ClientSession:
+        config = self.config
+        connector = TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            ttl_dns_cache=config.ttl_dns_cache
+        )
+        return ClientSession(connector=connector)
+
+    @override
+    @property
+    def session(self) -> ClientSession:
+        if self._session is not None:
+            return self._session
+        self.logger.warning(
+            "No Session set, creating a new Session. "
+            "Please use the `with_session` context manager if possible or otherwise "
+            "pass in a Session to the constructor."
+        )
+        self._session = self._new_session()
+        return self._session
+
+    @override
+    def open(self) -> bool:
+        if self._session is not None:
+            return False
+        self._session = self._new_session()
+        return True
+
+    @override
+    async def close(self) -> None:
+        if self._external_session is None and self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    @override
+    def pool_stats(self) -> dict[str, int]:
+        connector = getattr(self._session, "connector", None)
+        if connector is None:
+            return {}
+        stats = {"limit": connector.limit}
+        # aiohttp has no public count of checked-out connections
+        if _READS_ACQUIRED_CONNECTIONS:
+            stats["in_use"] = len(connector._acquired)
+        return stats
+
+    @override
+    async def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        try:
+            method = getattr(self.session, ri.type_.value.lower())
+            if ri.response_mode == ResponseMode.STREAM:
+                return await self._open_stream(method(**self._stream_kwargs(ri)))
+            async with method(**ri.kwargs()) as response:
+                response.raise_for_status()
+                return TransportResponse(
+                    status_code=response.status,
+                    headers=response.headers,
+                    data=await self._read(response, ri.response_mode, loads),
+                    content_length=response.content_length
+                )
+        except ClientResponseError as e:
+            headers = e.headers or {}
+            raise RequestError(
+                message=f"Error making {ri.type_} request to {ri.url}: {e.message}",
+                status_code=HTTPStatus(e.status),
+                retry_after=parse_retry_after(headers.get("Retry-After"))
+            ) from e
+
+    @staticmethod
+    async def _read(
+        response: ClientResponse,
+        mode: ResponseMode,
+        loads: Optional[JsonDecoder]
+    ) -> object:
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            return None
+        if mode == ResponseMode.BYTES:
+            return await response.read()
+        if loads is None:
+            return await response.json()
+        body = await response.read()
+        return loads(body) if body else None
+
+    @staticmethod
+    def _stream_kwargs(ri: RequestInfo) -> dict:
+        """
+        A bare timeout becomes aiohttp's total, which would cut off long bodies;
+        a stream only needs each connect and read to finish in time.
+        """
+        kwargs = ri.kwargs()
+        timeout = kwargs.get("timeout")
+        if timeout is not None:
+            kwargs["timeout"] = ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        return kwargs
+
+    @staticmethod
+    async def _open_stream(pending) -> TransportResponse:
+        response: ClientResponse = await pending
+        try:
+            response.raise_for_status()
+        except BaseException:
+            response.release()
+            raise
+        return TransportResponse(
+            status_code=response.status,
+            headers=response.headers,
+            data=_iter_chunks(response),
+            content_length=response.content_length
+        )
+
+
+async def _iter_chunks(response: ClientResponse) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.content.iter_chunked(DEFAULT_STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        response.release()
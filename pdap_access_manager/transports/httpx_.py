@@ -0,0 +1,266 @@
+"""
+Transports built on httpx, which can multiplex requests over HTTP/2.
+
+Requires the `httpx` extra: `pip install "pdap-access-manager[httpx]"`.
+"""
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Iterator, Mapping, Optional
+from urllib.parse import urlsplit
+from typing_extensions import override
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        'The httpx transports require httpx: pip install "pdap-access-manager[httpx]"'
+    ) from e
+
+from pdap_access_manager.constants import DEFAULT_STREAM_CHUNK_SIZE
+from pdap_access_manager.enums import ResponseMode
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.helpers import parse_retry_after
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.transport import TransportConfig
+from pdap_access_manager.streaming import JsonDecoder
+from pdap_access_manager.transports._base import Transport, AsyncTransport, TransportResponse
+
+try:
+    from httpx._decoders import SUPPORTED_DECODERS
+    _ACCEPT_ENCODING = ", ".join(name for name in SUPPORTED_DECODERS if name != "identity")
+except ImportError:  # pragma: no cover
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+_CONNECTION_ERRORS = (httpx.NetworkError, httpx.TimeoutException, httpx.RemoteProtocolError)
+
+
+def _limits(config: TransportConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.limit,
+        keepalive_expiry=config.keepalive_timeout
+    )
+
+
+def _request_kwargs(ri: RequestInfo) -> dict[str, Any]:
+    return {
+        "method": ri.type_.value,
+        "url": ri.url_with_query_params(),
+        "json": ri.json_,
+        "content": ri.content,
+        "headers": ri.headers,
+        "timeout": httpx.USE_CLIENT_DEFAULT if ri.timeout is None else ri.timeout,
+    }
+
+
+def _raise_for_status(ri: RequestInfo, response: httpx.Response) -> None:
+    if response.is_error:
+        raise RequestError(
+            message=f"Error making {ri.type_} request to {ri.url}: {response.reason_phrase}",
+            status_code=HTTPStatus(response.status_code),
+            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+        )
+
+
+def _to_response(ri: RequestInfo, response: httpx.Response, loads: Optional[JsonDecoder]) -> TransportResponse:
+    _raise_for_status(ri, response)
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        data = None
+    elif ri.response_mode == ResponseMode.BYTES:
+        data = response.content
+    elif loads is not None:
+        data = loads(response.content) if response.content else None
+    else:
+        data = response.json()
+    # Bytes on the wire, before any Content-Encoding is decoded
+    content_length = response.headers.get("Content-Length")
+    return TransportResponse(
+        status_code=response.status_code,
+        headers=response.headers,
+        data=data,
+        content_length=int(content_length) if content_length else response.num_bytes_downloaded
+    )
+
+
+def _stream_response(response: httpx.Response, chunks: Iterator[bytes] | AsyncIterator[bytes]) -> TransportResponse:
+    content_length = response.headers.get("Content-Length")
+    return TransportResponse(
+        status_code=response.status_code,
+        headers=response.headers,
+        data=chunks,
+        content_length=int(content_length) if content_length else None
+    )
+
+
+def _iter_chunks(response: httpx.Response) -> Iterator[bytes]:
+    try:
+        yield from response.iter_bytes(DEFAULT_STREAM_CHUNK_SIZE)
+    finally:
+        response.close()
+
+
+async def _aiter_chunks(response: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.aiter_bytes(DEFAULT_STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+def _pool_stats(client: Optional[httpx.Client | httpx.AsyncClient]) -> dict[str, int]:
+    # httpx has no public view of its pools, so this reads httpcore's
+    pools = [
+        getattr(transport, "_pool", None)
+        for transport in (
+            [getattr(client, "_transport", None)]
+            + list(getattr(client, "_mounts", {}).values())
+        )
+    ]
+    pools = [pool for pool in pools if pool is not None]
+    if not pools:
+        return {}
+    return {
+        "limit": sum(pool._max_connections for pool in pools),
+        "in_use": sum(
+            not connection.is_idle()
+            for pool in pools
+            for connection in pool.connections
+        ),
+    }
+
+
+class HttpxTransport(Transport):
+    """
+    Sends requests with an `httpx.Client`, over HTTP/2 where the server supports it.
+
+    A client passed in is used as is and never closed.
+    Otherwise one is created from `config` when opened, or lazily on first use.
+
+    Args:
+        host_limits: Connections allowed per base URL, applied per host
+    """
+    connection_errors = _CONNECTION_ERRORS
+    errors = (httpx.HTTPError,)
+    accept_encoding = _ACCEPT_ENCODING
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        config: Optional[TransportConfig] = None,
+        http2: bool = True,
+        host_limits: Optional[Mapping[str, int]] = None
+    ):
+        self.config = config or TransportConfig()
+        self.http2 = http2
+        self.host_limits = dict(host_limits or {})
+        self._client = client
+        self._external_client = client
+
+    def _new_client(self) -> httpx.Client:
+        mounts = {}
+        for base_url, limit in self.host_limits.items():
+            parts = urlsplit(base_url)
+            mounts[f"{parts.scheme}://{parts.netloc}"] = httpx.HTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(max_connections=limit, keepalive_expiry=self.config.keepalive_timeout)
+            )
+        return httpx.Client(http2=self.http2, limits=_limits(self.config), mounts=mounts)
+
+    @override
+    @property
+    def session(self) -> httpx.Client:
+        if self._client is None:
+            self._client = self._new_client()
+        return self._client
+
+    @override
+    def open(self) -> bool:
+        if self._client is not None:
+            return False
+        self._client = self._new_client()
+        return True
+
+    @override
+    def close(self) -> None:
+        if self._external_client is None and self._client is not None:
+            client, self._client = self._client, None
+            client.close()
+
+    @override
+    def pool_stats(self) -> dict[str, int]:
+        return _pool_stats(self._client)
+
+    @override
+    def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        if ri.response_mode != ResponseMode.STREAM:
+            return _to_response(ri, self.session.request(**_request_kwargs(ri)), loads)
+        client = self.session
+        response = client.send(client.build_request(**_request_kwargs(ri)), stream=True)
+        try:
+            _raise_for_status(ri, response)
+        except BaseException:
+            response.close()
+            raise
+        return _stream_response(response, _iter_chunks(response))
+
+
+class AsyncHttpxTransport(AsyncTransport):
+    """
+    Sends requests with an `httpx.AsyncClient`, over HTTP/2 where the server
+    supports it, so concurrent requests to a host share one connection.
+
+    A client passed in is used as is and never closed.
+    Otherwise one is created from `config` when opened, or lazily on first use.
+    """
+    connection_errors = _CONNECTION_ERRORS
+    errors = (httpx.HTTPError,)
+    accept_encoding = _ACCEPT_ENCODING
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        config: Optional[TransportConfig] = None,
+        http2: bool = True
+    ):
+        self.config = config or TransportConfig()
+        self.http2 = http2
+        self._client = client
+        self._external_client = client
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(http2=self.http2, limits=_limits(self.config))
+
+    @override
+    @property
+    def session(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._new_client()
+        return self._client
+
+    @override
+    def open(self) -> bool:
+        if self._client is not None:
+            return False
+        self._client = self._new_client()
+        return True
+
+    @override
+    async def close(self) -> None:
+        if self._external_client is None and self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @override
+    def pool_stats(self) -> dict[str, int]:
+        return _pool_stats(self._client)
+
+    @override
+    async def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        if ri.response_mode != ResponseMode.STREAM:
+            return _to_response(ri, await self.session.request(**_request_kwargs(ri)), loads)
+        client = self.session
+        response = await client.send(client.build_request(**_request_kwargs(ri)), stream=True)
+        try:
+            _raise_for_status(ri, response)
+        except BaseException:
+            await response.aclose()
+            raise
+        return _stream_response(response, _aiter_chunks(response))
@@ -0,0 +1,118 @@
+"""
+Transports that answer requests by calling a function instead of the network,
+for tests and benchmarks of everything above the HTTP library.
+"""
+import dataclasses
+import inspect
+import json
+from http import HTTPStatus
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from typing_extensions import override
+
+from pdap_access_manager.constants import DEFAULT_STREAM_CHUNK_SIZE
+from pdap_access_manager.enums import ResponseMode
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.helpers import parse_retry_after, lower_case_headers
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.streaming import JsonDecoder
+from pdap_access_manager.transports._base import Transport, AsyncTransport, TransportResponse
+
+Handler = Callable[[RequestInfo], TransportResponse]
+AsyncHandler = Callable[[RequestInfo], TransportResponse | Awaitable[TransportResponse]]
+
+
+def _checked(ri: RequestInfo, response: TransportResponse) -> TransportResponse:
+    if response.status_code < 400:
+        return response
+    retry_after = lower_case_headers(response.headers).get("retry-after")
+    raise RequestError(
+        message=f"Error making {ri.type_} request to {ri.url}",
+        status_code=HTTPStatus(response.status_code),
+        retry_after=parse_retry_after(retry_after)
+    )
+
+
+def _body(data: object) -> bytes:
+    return data if isinstance(data, bytes) else json.dumps(data).encode()
+
+
+def _chunked(body: bytes) -> list[bytes]:
+    return [
+        body[start:start + DEFAULT_STREAM_CHUNK_SIZE]
+        for start in range(0, len(body), DEFAULT_STREAM_CHUNK_SIZE)
+    ]
+
+
+def _in_mode(ri: RequestInfo, response: TransportResponse, loads: Optional[JsonDecoder]) -> list[bytes] | object:
+    """
+    The handler's `data` in the form `ri.response_mode` asks for. It may be
+    JSON-compatible values or the encoded body; chunks are returned as a list.
+    """
+    data = response.data
+    if ri.response_mode == ResponseMode.JSON:
+        if isinstance(data, bytes):
+            return (loads or json.loads)(data) if data else None
+        return data
+    body = _body(data)
+    return body if ri.response_mode == ResponseMode.BYTES else _chunked(body)
+
+
+async def _aiter(chunks: list[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+class InMemoryTransport(Transport):
+    """
+    Answers each request with `handler(ri)`. Its `data` may be JSON-compatible
+    values or the encoded body, and is returned in the mode the request asks for.
+
+    The handler may return an error status, which is raised as `RequestError`
+    as for a real server, or raise `ConnectionError` or `TimeoutError`
+    to simulate a failure with no response. Requests are kept in `requests`.
+    """
+    connection_errors = (ConnectionError, TimeoutError)
+    errors = (ConnectionError, TimeoutError)
+
+    def __init__(self, handler: Handler):
+        self.handler = handler
+        self.requests: list[RequestInfo] = []
+
+    @override
+    def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        self.requests.append(ri)
+        response = _checked(ri, self.handler(ri))
+        data = _in_mode(ri, response, loads)
+        if ri.response_mode == ResponseMode.STREAM:
+            data = iter(data)
+        return dataclasses.replace(response, data=data)
+
+
+class AsyncInMemoryTransport(AsyncTransport):
+    """
+    Answers each request with `handler(ri)`, which may be a coroutine function.
+    Its `data` may be JSON-compatible values or the encoded body, and is
+    returned in the mode the request asks for.
+
+    The handler may return an error status, which is raised as `RequestError`
+    as for a real server, or raise `ConnectionError` or `TimeoutError`
+    to simulate a failure with no response. Requests are kept in `requests`.
+    """
+    connection_errors = (ConnectionError, TimeoutError)
+    errors = (ConnectionError, TimeoutError)
+
+    def __init__(self, handler: AsyncHandler):
+        self.handler = handler
+        self.requests: list[RequestInfo] = []
+
+    @override
+    async def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        self.requests.append(ri)
+        response = self.handler(ri)
+        if inspect.isawaitable(response):
+            response = await response
+        response = _checked(ri, response)
+        data = _in_mode(ri, response, loads)
+        if ri.response_mode == ResponseMode.STREAM:
+            data = _aiter(data)
+        return dataclasses.replace(response, data=data)
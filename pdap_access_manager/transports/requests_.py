@@ -0,0 +1,207 @@
+import logging
+import threading
+from http import HTTPStatus
+from typing import Iterator, Mapping, Optional
+from typing_extensions import override
+
+from requests import Session, Response, HTTPError, RequestException, Timeout, ConnectionError as RequestsConnectionError
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from pdap_access_manager.constants import DEFAULT_STREAM_CHUNK_SIZE
+from pdap_access_manager.enums import ResponseMode
+from pdap_access_manager.exceptions import IncorrectSessionError, RequestError
+from pdap_access_manager.helpers import parse_retry_after
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.transport import TransportConfig
+from pdap_access_manager.streaming import JsonDecoder
+from pdap_access_manager.transports._base import Transport, TransportResponse
+
+
+class RequestsTransport(Transport):
+    """
+    Sends requests with a requests `Session`.
+
+    A session passed in is used as is and never closed. Otherwise one is
+    created from `config` when opened, or lazily on first use; with
+    `concurrent=True`, each thread gets its own, which is closed once
+    its thread has ended.
+
+    Args:
+        host_limits: Connections allowed per base URL; requests beyond
+            the limit wait for a free connection.
+    """
+    connection_errors = (RequestsConnectionError, Timeout)
+    errors = (RequestException,)
+    # Includes br and zstd when urllib3 finds their decoders
+    accept_encoding = ACCEPT_ENCODING.replace(",", ", ")
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        config: Optional[TransportConfig] = None,
+        concurrent: bool = False,
+        host_limits: Optional[Mapping[str, int]] = None
+    ):
+        if session is not None and not isinstance(session, Session):
+            raise IncorrectSessionError(
+                f"Expected session type: {Session.__name__}, "
+                f"got: {type(session).__name__}"
+            )
+        self.config = config or TransportConfig()
+        self.concurrent = concurrent
+        self.host_limits = dict(host_limits or {})
+        self._session = session
+        self._external_session = session
+        self._session_lock = threading.RLock()
+        self._thread_local = threading.local()
+        self._thread_sessions: dict[threading.Thread, Session] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _new_session(self) -> Session:
+        config = self.config
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        for base_url, limit in self.host_limits.items():
+            # Longest prefix wins, so these take precedence for their base URL
+            session.mount(
+                base_url,
+                HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True)
+            )
+        return session
+
+    @override
+    @property
+    def session(self) -> Session:
+        if self._external_session is not None:
+            return self._external_session
+        if not self.concurrent:
+            with self._session_lock:
+                if self._session is None:
+                    self.logger.warning(
+                        "No Session set, creating a new Session. "
+                        "Please use the `with_session` context manager if possible or otherwise "
+                        "pass in a Session to the constructor."
+                    )
+                    self._session = self._new_session()
+                return self._session
+        session: Optional[Session] = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = self._new_session()
+            self._thread_local.session = session
+            with self._session_lock:
+                ended = self._prune_ended_threads()
+                self._thread_sessions[threading.current_thread()] = session
+            for ended_session in ended:
+                ended_session.close()
+        return session
+
+    def _prune_ended_threads(self) -> list[Session]:
+        """Forget the sessions of threads that have ended, returning them to be closed."""
+        ended = [thread for thread in self._thread_sessions if not thread.is_alive()]
+        return [self._thread_sessions.pop(thread) for thread in ended]
+
+    @override
+    def open(self) -> bool:
+        if self.concurrent:
+            # Each thread creates its own session on first use
+            return False
+        with self._session_lock:
+            if self._session is not None:
+                return False
+            self._session = self._new_session()
+            return True
+
+    @override
+    def close(self) -> None:
+        with self._session_lock:
+            sessions = list(self._thread_sessions.values())
+            self._thread_sessions = {}
+            self._thread_local = threading.local()
+            if self._external_session is None and self._session is not None:
+                sessions.append(self._session)
+                self._session = None
+        for session in sessions:
+            session.close()
+
+    @override
+    def pool_stats(self) -> dict[str, int]:
+        with self._session_lock:
+            sessions = list(self._thread_sessions.values())
+        if self._session is not None:
+            sessions.append(self._session)
+        if not sessions:
+            return {}
+        # One adapter may be mounted under several prefixes
+        adapters = {
+            id(adapter): adapter
+            for session in sessions
+            for adapter in session.adapters.values()
+        }
+        limit = 0
+        in_use = 0
+        for adapter in adapters.values():
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if pool_manager is None:
+                continue
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                # The queue holds idle connections and empty slots
+                limit += pool.pool.maxsize
+                in_use += pool.pool.maxsize - pool.pool.qsize()
+        return {"limit": limit, "in_use": in_use}
+
+    @override
+    def send(self, ri: RequestInfo, loads: Optional[JsonDecoder] = None) -> TransportResponse:
+        try:
+            method = getattr(self.session, ri.type_.value.lower())
+            if ri.response_mode == ResponseMode.STREAM:
+                response = method(stream=True, **ri.kwargs())
+                try:
+                    response.raise_for_status()
+                except BaseException:
+                    response.close()
+                    raise
+                data = _iter_chunks(response)
+            else:
+                response = method(**ri.kwargs())
+                response.raise_for_status()
+                data = self._read(response, ri.response_mode, loads)
+            content_length = response.headers.get("Content-Length")
+            return TransportResponse(
+                status_code=response.status_code,
+                headers=response.headers,
+                data=data,
+                content_length=int(content_length) if content_length else None
+            )
+        except HTTPError as e:
+            raise RequestError(
+                message=f"Error making {ri.type_} request to {ri.url}",
+                status_code=HTTPStatus(e.response.status_code),
+                retry_after=parse_retry_after(e.response.headers.get("Retry-After"))
+            ) from e
+
+    @staticmethod
+    def _read(response: Response, mode: ResponseMode, loads: Optional[JsonDecoder]) -> object:
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
+        if mode == ResponseMode.BYTES:
+            return response.content
+        if loads is None:
+            return response.json()
+        return loads(response.content) if response.content else None
+
+
+def _iter_chunks(response: Response) -> Iterator[bytes]:
+    try:
+        yield from response.iter_content(DEFAULT_STREAM_CHUNK_SIZE)
+    finally:
+        response.close()
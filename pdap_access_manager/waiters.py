@@ -0,0 +1,25 @@
+import math
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class Waiter:
+    """A caller queued for a slot; `wake` is called once the slot is theirs"""
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+
+
+def resolve(future: "asyncio.Future") -> None:
+    """Wake an event loop waiter, unless it has already given up."""
+    if not future.done():
+        future.set_result(None)
+
+
+def percentile_95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
@@ -0,0 +1,59 @@
+import asyncio
+from http import HTTPStatus
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.concurrency import AdaptiveConcurrencyLimiter
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.concurrency import AdaptiveConcurrencyConfig
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import AsyncInMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+async def test_make_request_waits_for_a_slot():
+    in_flight = [0, 0]  # current, peak
+    release = asyncio.Event()
+
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await release.wait()
+        in_flight[0] -= 1
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    access_manager = AccessManagerAsync(
+        tokens=TokensInfo(access_token="access", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=AsyncInMemoryTransport(handler),
+        adaptive_concurrency=AdaptiveConcurrencyConfig(initial_limit=2)
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies")
+
+    tasks = [asyncio.ensure_future(access_manager.make_request(ri)) for _ in range(6)]
+    await asyncio.sleep(0)
+    stats = access_manager.concurrency_stats()[URL]
+    assert (stats.in_flight, stats.waiting) == (2, 4)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert in_flight[1] == 2
+    assert access_manager.concurrency_stats()[URL].in_flight == 0
+
+
+async def test_cancelled_waiter_gives_up_its_place():
+    limiter = AdaptiveConcurrencyLimiter("ds", AdaptiveConcurrencyConfig(initial_limit=1, max_limit=1))
+    started = await limiter.acquire_async()
+    cancelled = asyncio.ensure_future(limiter.acquire_async())
+    waiting = asyncio.ensure_future(limiter.acquire_async())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    limiter.record(started, HTTPStatus.OK)
+    await asyncio.wait_for(waiting, timeout=1)
+
+    stats = limiter.stats()
+    assert (stats.in_flight, stats.waiting) == (1, 0)
@@ -0,0 +1,29 @@
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.circuit_breaker import CircuitBreaker
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import CircuitOpenError
+from pdap_access_manager.models.circuit_breaker import CircuitBreakerConfig
+from pdap_access_manager.models.request import RequestInfo
+
+
+async def test_make_request_fails_fast_while_open(access_manager: AccessManagerAsync):
+    access_manager.circuit_breakers = {
+        "https://ds.example": CircuitBreaker("https://ds.example", CircuitBreakerConfig(consecutive_failures=2))
+    }
+    mock_get = MagicMock()
+    mock_get.return_value.__aenter__.side_effect = ClientConnectionError("down")
+    access_manager.session.get = mock_get
+    ri = RequestInfo(type_=RequestType.GET, url="https://ds.example/api/agencies")
+
+    for _ in range(2):
+        with pytest.raises(ClientConnectionError):
+            await access_manager.make_request(ri)
+    with pytest.raises(CircuitOpenError):
+        await access_manager.make_request(ri)
+
+    assert mock_get.call_count == 2
@@ -0,0 +1,76 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+
+
+@pytest.fixture
+def slow_get(access_manager: AccessManagerAsync) -> MagicMock:
+    async def enter(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        response = AsyncMock()
+        response.status = HTTPStatus.OK
+        response.json.return_value = {"data": [{"id": 1}]}
+        response.raise_for_status = MagicMock(return_value=None)
+        return response
+
+    mock_get = MagicMock()
+    mock_get.return_value.__aenter__.side_effect = enter
+    access_manager.session.get = mock_get
+    return mock_get
+
+
+def _ri(token: str = "a") -> RequestInfo:
+    return RequestInfo(
+        type_=RequestType.GET,
+        url="https://ds.example/api/agencies/1",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+async def test_identical_gets_share_one_call(access_manager: AccessManagerAsync, slow_get: MagicMock):
+    access_manager.coalesce_requests = True
+
+    results = await asyncio.gather(*(access_manager.make_request(_ri()) for _ in range(5)))
+
+    assert slow_get.call_count == 1
+    assert all(result.data == {"data": [{"id": 1}]} for result in results)
+    # Each caller may mutate its own copy
+    assert len({id(result.data) for result in results}) == 5
+    assert access_manager._in_flight == {}
+
+
+async def test_different_auth_is_not_shared(access_manager: AccessManagerAsync, slow_get: MagicMock):
+    access_manager.coalesce_requests = True
+
+    await asyncio.gather(access_manager.make_request(_ri("a")), access_manager.make_request(_ri("b")))
+
+    assert slow_get.call_count == 2
+
+
+async def test_coalescing_is_opt_in(access_manager: AccessManagerAsync, slow_get: MagicMock):
+    await asyncio.gather(*(access_manager.make_request(_ri()) for _ in range(3)))
+
+    assert slow_get.call_count == 3
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call(
+    access_manager: AccessManagerAsync,
+    slow_get: MagicMock
+):
+    access_manager.coalesce_requests = True
+    first = asyncio.ensure_future(access_manager.make_request(_ri()))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(access_manager.make_request(_ri()))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    result = await second
+
+    assert result.data == {"data": [{"id": 1}]}
+    assert slow_get.call_count == 1
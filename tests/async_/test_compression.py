@@ -0,0 +1,43 @@
+import gzip
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.compression import CompressionConfig
+from pdap_access_manager.models.request import RequestInfo
+
+BODY = {"records": [{"name": f"Police Department {index}", "url": f"https://example.gov/{index}"} for index in range(100)]}
+
+
+async def _echo(request: web.Request) -> web.Response:
+    # aiohttp decompresses the request body as it is read
+    received = await request.json()
+    payload = json.dumps({
+        "received": received,
+        "content_encoding": request.headers.get("Content-Encoding"),
+        "wire_bytes": request.content_length,
+    }).encode()
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        return web.Response(
+            body=gzip.compress(payload),
+            content_type="application/json",
+            headers={"Content-Encoding": "gzip"}
+        )
+    return web.Response(body=payload, content_type="application/json")
+
+
+async def test_gzipped_body_and_response_round_trip():
+    app = web.Application()
+    app.router.add_post("/echo", _echo)
+    async with TestServer(app) as server:
+        async with AccessManagerAsync(compression=CompressionConfig()) as access_manager:
+            response_info = await access_manager.make_request(
+                RequestInfo(type_=RequestType.POST, url=str(server.make_url("/echo")), json_=BODY)
+            )
+
+    assert response_info.data["received"] == BODY
+    assert response_info.data["content_encoding"] == "gzip"
+    assert response_info.data["wire_bytes"] < len(json.dumps(BODY))
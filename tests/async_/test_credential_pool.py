@@ -0,0 +1,86 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+from pdap_access_manager.access_manager.pool import AccessManagerPoolAsync
+from pdap_access_manager.credential_pool import Credential
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.rate_limit import RateLimit, RateLimiter
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import AsyncInMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+async def test_concurrent_requests_are_spread_over_credentials():
+    logins = []
+    sent: dict[str, int] = {}
+
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.url.endswith("/v2/auth/login"):
+            email = ri.json_["email"]
+            logins.append(email)
+            await asyncio.sleep(0.01)
+            return TransportResponse(
+                status_code=HTTPStatus.OK,
+                headers={},
+                data={"access_token": f"access-{email}", "refresh_token": f"refresh-{email}"}
+            )
+        authorization = ri.headers["Authorization"]
+        sent[authorization] = sent.get(authorization, 0) + 1
+        await asyncio.sleep(0.001)
+        if authorization == "Bearer access-c":
+            return TransportResponse(status_code=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "60"})
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={"page": ri.params})
+
+    async with AccessManagerPoolAsync(
+        [AuthInfo(email=email, password="password") for email in ("a", "b", "c")],
+        data_sources_url=URL,
+        transport=AsyncInMemoryTransport(handler),
+        retry_policy=RetryPolicy(backoff_base=0)
+    ) as access_manager:
+        ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies", headers={"Authorization": "Bearer none"})
+        ris = [ri.model_copy(update={"params": {"page": page}}) for page in range(30)]
+        results = [result async for _, result in access_manager.make_requests(ris, max_concurrency=30)]
+
+    assert [result.data for result in results] == [{"page": {"page": page}} for page in range(30)]
+    # Each credential logged in once, although every request needed its tokens at the same time
+    assert sorted(logins) == ["a", "b", "c"]
+    # The burst was split evenly; the third sent with "c" were throttled and moved to the others
+    assert sent["Bearer access-c"] == 10
+    assert sent["Bearer access-a"] == sent["Bearer access-b"] == 15
+    stats = access_manager.credential_stats()
+    assert stats["c"].throttled == 10
+    assert stats["c"].seconds_throttled > 55
+
+
+async def _seconds_for_requests(credentials: int, requests: int) -> float:
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    access_manager = AccessManagerPoolAsync(
+        [
+            Credential(tokens=TokensInfo(access_token=f"access-{index}", refresh_token="refresh"))
+            for index in range(credentials)
+        ],
+        data_sources_url=URL,
+        transport=AsyncInMemoryTransport(handler),
+        rate_limiter=RateLimiter({URL: RateLimit(rate=100)})
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies")
+    start = time.monotonic()
+    async with access_manager:
+        await asyncio.gather(*(access_manager.make_request(ri) for _ in range(requests)))
+    return time.monotonic() - start
+
+
+async def test_rate_limit_applies_per_credential():
+    # 100 requests per second each: 40 requests take about 0.4s, 0.2s and 0.1s
+    one, two, four = [await _seconds_for_requests(credentials, 40) for credentials in (1, 2, 4)]
+
+    assert two < one * 0.7
+    assert four < two * 0.7
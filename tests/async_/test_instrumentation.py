@@ -0,0 +1,48 @@
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientResponseError
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.instrumentation import Hooks
+from pdap_access_manager.models.request import RequestInfo
+
+
+async def test_hooks_receive_attempt_events(access_manager: AccessManagerAsync):
+    events = []
+
+    class RecordingHooks(Hooks):
+        def on_request_start(self, event):
+            events.append(("start", event.attempt))
+
+        def on_response(self, event):
+            events.append(("response", event.status_code, event.request_bytes))
+
+    access_manager.hooks = RecordingHooks()
+    response = AsyncMock()
+    response.status = 200
+    response.content_length = 10
+    response.json.return_value = {}
+    response.raise_for_status = MagicMock(
+        side_effect=ClientResponseError(
+            request_info=MagicMock(),
+            history=(),
+            status=HTTPStatus.BAD_REQUEST,
+            message="Bad Request"
+        )
+    )
+    mock_post = MagicMock(name="mock_post")
+    mock_post.return_value.__aenter__.return_value = response
+    access_manager.session.post = mock_post
+
+    ri = RequestInfo(type_=RequestType.POST, url="https://example/api", json_={"a": 1})
+    with pytest.raises(RequestError):
+        await access_manager.make_request(ri, allow_retry=False)
+
+    assert events == [
+        ("start", 1),
+        ("response", HTTPStatus.BAD_REQUEST, len('{"a": 1}')),
+    ]
@@ -0,0 +1,95 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+
+
+def _request(i: int) -> RequestInfo:
+    return RequestInfo(type_=RequestType.GET, url=f"url/{i}")
+
+
+async def test_make_requests_ordered_with_errors(access_manager: AccessManagerAsync):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def make_request(ri: RequestInfo):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        i = int(ri.url.split("/")[-1])
+        await asyncio.sleep(0.001 * (i % 3))
+        in_flight -= 1
+        if i % 5 == 0:
+            raise RequestError("fail", HTTPStatus.INTERNAL_SERVER_ERROR)
+        return ResponseInfo(status_code=HTTPStatus.OK, data={"i": i})
+
+    access_manager.make_request = AsyncMock(side_effect=make_request)
+
+    results = [
+        item async for item in access_manager.make_requests(
+            (_request(i) for i in range(50)),
+            max_concurrency=4
+        )
+    ]
+
+    assert [index for index, _ in results] == list(range(50))
+    for index, result in results:
+        if index % 5 == 0:
+            assert isinstance(result, RequestError)
+        else:
+            assert result.data == {"i": index}
+    assert max_in_flight <= 4
+
+
+async def test_make_requests_unordered_from_async_iterable(
+    access_manager: AccessManagerAsync
+):
+    async def make_request(ri: RequestInfo):
+        i = int(ri.url.split("/")[-1])
+        await asyncio.sleep(0.01 if i == 0 else 0)
+        return ResponseInfo(status_code=HTTPStatus.OK, data={"i": i})
+
+    access_manager.make_request = AsyncMock(side_effect=make_request)
+
+    async def source():
+        for i in range(5):
+            yield _request(i)
+
+    results = [
+        item async for item in access_manager.make_requests(
+            source(),
+            max_concurrency=5,
+            ordered=False
+        )
+    ]
+
+    assert sorted(index for index, _ in results) == list(range(5))
+    assert results[-1][0] == 0
+    assert all(result.data == {"i": index} for index, result in results)
+
+
+async def test_make_requests_pulls_lazily(access_manager: AccessManagerAsync):
+    access_manager.make_request = AsyncMock(
+        return_value=ResponseInfo(status_code=HTTPStatus.OK, data={})
+    )
+    pulled = 0
+
+    def source():
+        nonlocal pulled
+        i = 0
+        while True:
+            pulled += 1
+            yield _request(i)
+            i += 1
+
+    batch = access_manager.make_requests(source(), max_concurrency=3)
+    for _ in range(10):
+        await anext(batch)
+    await batch.aclose()
+
+    assert pulled <= 10 + 3
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+from unittest.mock import AsyncMock
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+
+PAGE_SIZE = 3
+TOTAL_PAGES = 4
+
+
+async def _page(ri: RequestInfo) -> ResponseInfo:
+    page = ri.params["page"]
+    records = (
+        [{"page": page, "i": i} for i in range(PAGE_SIZE)]
+        if page <= TOTAL_PAGES else []
+    )
+    return ResponseInfo(status_code=HTTPStatus.OK, data={"data": records})
+
+
+async def test_paginate_yields_all_records(access_manager: AccessManagerAsync):
+    access_manager.make_request = AsyncMock(side_effect=_page)
+
+    ri = RequestInfo(
+        type_=RequestType.GET,
+        url="url",
+        params={"q": "search"}
+    )
+    records = [record async for record in access_manager.paginate(ri, read_ahead=2)]
+
+    assert len(records) == PAGE_SIZE * TOTAL_PAGES
+    assert records[0] == {"page": 1, "i": 0}
+    assert records[-1] == {"page": TOTAL_PAGES, "i": PAGE_SIZE - 1}
+    sent_params = [call.args[0].params for call in access_manager.make_request.call_args_list]
+    assert all(params["q"] == "search" for params in sent_params)
+    assert ri.params == {"q": "search"}
+
+
+async def test_paginate_prefetches_next_page(access_manager: AccessManagerAsync):
+    access_manager.make_request = AsyncMock(side_effect=_page)
+
+    ri = RequestInfo(type_=RequestType.GET, url="url")
+    pages = access_manager.paginate(ri, read_ahead=1)
+    await anext(pages)
+
+    requested_pages = [
+        call.args[0].params["page"]
+        for call in access_manager.make_request.call_args_list
+    ]
+    assert requested_pages == [1, 2]
+    await pages.aclose()
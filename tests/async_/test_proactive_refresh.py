@@ -0,0 +1,62 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.models.tokens import TokensInfo
+
+
+async def test_background_task_refreshes_before_expiry(
+    access_manager: AccessManagerAsync,
+    make_jwt
+):
+    access_manager.proactive_refresh = True
+    access_manager._tokens = TokensInfo(
+        access_token=make_jwt(time.time() + 0.05),
+        refresh_token=make_jwt(time.time() + 3600),
+        clock_skew=0
+    )
+
+    async def refresh():
+        access_manager._tokens = TokensInfo(
+            access_token=make_jwt(time.time() + 3600),
+            refresh_token=make_jwt(time.time() + 7200)
+        )
+
+    access_manager.refresh_access_token = AsyncMock(side_effect=refresh)
+
+    access_manager._ensure_proactive_refresh()
+    await asyncio.sleep(0.2)
+
+    access_manager.refresh_access_token.assert_called_once()
+    assert not access_manager.tokens.access_token_expired()
+
+    await access_manager._stop_proactive_refresh()
+    assert access_manager._proactive_refresh_task is None
+
+
+async def test_no_task_without_known_expiry(access_manager: AccessManagerAsync):
+    access_manager.proactive_refresh = True
+
+    access_manager._ensure_proactive_refresh()
+    assert access_manager._proactive_refresh_task is None
+
+    access_manager._tokens = TokensInfo(access_token="opaque", refresh_token="opaque")
+    access_manager._ensure_proactive_refresh()
+    assert access_manager._proactive_refresh_task is None
+
+
+async def test_one_pending_task_across_requests(access_manager: AccessManagerAsync, make_jwt):
+    access_manager.proactive_refresh = True
+    access_manager._tokens = TokensInfo(
+        access_token=make_jwt(time.time() + 3600),
+        refresh_token=make_jwt(time.time() + 7200)
+    )
+
+    access_manager._ensure_proactive_refresh()
+    task = access_manager._proactive_refresh_task
+    for _ in range(3):
+        access_manager._ensure_proactive_refresh()
+
+    assert access_manager._proactive_refresh_task is task
+    await access_manager._stop_proactive_refresh()
@@ -0,0 +1,37 @@
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.rate_limit import RateLimit, RateLimiter
+
+BASE_URL = "https://data-sources.example/api"
+
+
+async def test_make_request_waits_without_blocking(
+    access_manager: AccessManagerAsync,
+    monkeypatch
+):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("pdap_access_manager.access_manager.async_.asyncio.sleep", sleep)
+    monkeypatch.setattr("pdap_access_manager.rate_limit.time.monotonic", lambda: 1000.0)
+    access_manager.rate_limiter = RateLimiter({BASE_URL: RateLimit(rate=2, burst=2)})
+    response = AsyncMock()
+    response.status = HTTPStatus.OK
+    response.json.return_value = {}
+    response.raise_for_status = MagicMock(return_value=None)
+    mock_get = MagicMock()
+    mock_get.return_value.__aenter__.return_value = response
+    access_manager.session.get = mock_get
+    ri = RequestInfo(type_=RequestType.GET, url=f"{BASE_URL}/v2/agencies")
+
+    for _ in range(4):
+        await access_manager.make_request(ri)
+
+    assert mock_get.call_count == 4
+    assert sleeps == [0.5, 1.0]
@@ -0,0 +1,26 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.cache import ResponseCache
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+
+
+async def test_cached_get_sent_once(access_manager: AccessManagerAsync):
+    access_manager.response_cache = ResponseCache()
+    response = AsyncMock()
+    response.status = 200
+    response.json.return_value = {"agency": "a"}
+    response.raise_for_status = MagicMock(return_value=None)
+    response.headers = {"ETag": '"v1"'}
+    mock_get = MagicMock(name="mock_get")
+    mock_get.return_value.__aenter__.return_value = response
+    access_manager.session.get = mock_get
+
+    ri = RequestInfo(type_=RequestType.GET, url="url")
+    first = await access_manager.make_request(ri)
+    second = await access_manager.make_request(ri)
+
+    assert first.data == second.data == {"agency": "a"}
+    assert mock_get.call_count == 1
+    assert access_manager.response_cache.stats.hit_ratio == 0.5
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientResponseError
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+
+
+def _response(status: int, headers: dict = None) -> AsyncMock:
+    response = AsyncMock()
+    response.status = status
+    response.json.return_value = {"ok": True}
+    if status >= 400:
+        response.raise_for_status = MagicMock(
+            side_effect=ClientResponseError(
+                request_info=MagicMock(),
+                history=(),
+                status=status,
+                message="error",
+                headers=headers
+            )
+        )
+    else:
+        response.raise_for_status = MagicMock(return_value=None)
+    return response
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(
+        "pdap_access_manager.access_manager.async_.asyncio.sleep",
+        sleep
+    )
+    return sleeps
+
+
+async def test_retries_429_honoring_retry_after(
+    access_manager: AccessManagerAsync,
+    no_sleep
+):
+    access_manager.retry_policy = RetryPolicy()
+    mock_get = MagicMock(name="mock_get")
+    mock_get.return_value.__aenter__.side_effect = [
+        _response(HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "3"}),
+        _response(HTTPStatus.GATEWAY_TIMEOUT),
+        _response(HTTPStatus.OK),
+    ]
+    access_manager.session.get = mock_get
+
+    result = await access_manager.make_request(
+        RequestInfo(type_=RequestType.GET, url="url")
+    )
+
+    assert result.data == {"ok": True}
+    assert mock_get.call_count == 3
+    assert no_sleep[0] == 3
@@ -0,0 +1,61 @@
+import asyncio
+from http import HTTPStatus
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestPriority, RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.scheduler import PriorityScheduler
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import AsyncInMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+async def test_interactive_requests_overtake_a_bulk_backlog():
+    completed = []
+
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        await asyncio.sleep(0.001)
+        completed.append(ri.priority)
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    scheduler = PriorityScheduler(max_concurrency=4)
+    access_manager = AccessManagerAsync(
+        tokens=TokensInfo(access_token="access", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=AsyncInMemoryTransport(handler),
+        scheduler=scheduler
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies")
+
+    bulk = [
+        asyncio.ensure_future(access_manager.make_request(ri, priority=RequestPriority.BULK))
+        for _ in range(50)
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.stats()[RequestPriority.BULK].waiting == 48
+    interactive = [
+        asyncio.ensure_future(access_manager.make_request(ri, priority=RequestPriority.INTERACTIVE))
+        for _ in range(5)
+    ]
+    await asyncio.gather(*bulk, *interactive)
+
+    # Bulk requests used all but the two reserved slots; the rest went to interactive ones first
+    positions = [index for index, priority in enumerate(completed) if priority == RequestPriority.INTERACTIVE]
+    assert positions[-1] < 12
+
+
+async def test_cancelled_request_leaves_the_queue():
+    scheduler = PriorityScheduler(max_concurrency=1, reserved={})
+    held = await scheduler.acquire_async(RequestPriority.BULK)
+    waiting = asyncio.ensure_future(scheduler.acquire_async(RequestPriority.BULK))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    scheduler.release(held)
+
+    stats = scheduler.stats()[RequestPriority.BULK]
+    assert (stats.waiting, stats.in_flight) == (0, 0)
+    assert await scheduler.acquire_async() == RequestPriority.NORMAL
@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientResponseError
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+
+
+def _response_cm(status: int, json: dict) -> MagicMock:
+    response = AsyncMock()
+    response.status = status
+    response.json.return_value = json
+    if status >= 400:
+        response.raise_for_status = MagicMock(
+            side_effect=ClientResponseError(
+                request_info=MagicMock(),
+                history=(),
+                status=status,
+                message="Unauthorized"
+            )
+        )
+    else:
+        response.raise_for_status = MagicMock(return_value=None)
+    cm = MagicMock()
+    cm.__aenter__ = AsyncMock(return_value=response)
+    cm.__aexit__ = AsyncMock(return_value=None)
+    return cm
+
+
+async def test_concurrent_401s_trigger_single_refresh(
+    access_manager: AccessManagerAsync
+):
+    access_manager._tokens = TokensInfo(
+        access_token="old_access",
+        refresh_token="old_refresh"
+    )
+
+    def get(url, headers=None, **kwargs):
+        if headers == {"Authorization": "Bearer new_access"}:
+            return _response_cm(200, {"ok": True})
+        return _response_cm(401, {})
+
+    refresh_calls = 0
+
+    def post(url, headers=None, **kwargs):
+        nonlocal refresh_calls
+        refresh_calls += 1
+
+        class SlowRefresh:
+            async def __aenter__(self):
+                await asyncio.sleep(0.01)
+                return await _response_cm(
+                    200,
+                    {"access_token": "new_access", "refresh_token": "new_refresh"}
+                ).__aenter__()
+
+            async def __aexit__(self, *args):
+                return None
+
+        return SlowRefresh()
+
+    access_manager.session.get = MagicMock(side_effect=get)
+    access_manager.session.post = MagicMock(side_effect=post)
+
+    async def one_request():
+        ri = RequestInfo(
+            type_=RequestType.GET,
+            url="url",
+            headers=await access_manager.jwt_header()
+        )
+        return await access_manager.make_request(ri)
+
+    results = await asyncio.gather(*(one_request() for _ in range(50)))
+
+    assert all(result.data == {"ok": True} for result in results)
+    assert refresh_calls == 1
+    assert access_manager.tokens.access_token == "new_access"
+
+
+async def test_concurrent_lazy_logins_trigger_single_login(
+    access_manager: AccessManagerAsync
+):
+    async def slow_login():
+        await asyncio.sleep(0.01)
+        return TokensInfo(
+            access_token="access_token",
+            refresh_token="refresh_token"
+        )
+
+    access_manager.login = AsyncMock(side_effect=slow_login)
+
+    headers = await asyncio.gather(
+        *(access_manager.jwt_header() for _ in range(20))
+    )
+
+    assert access_manager.login.call_count == 1
+    assert all(h == {"Authorization": "Bearer access_token"} for h in headers)
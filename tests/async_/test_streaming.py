@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType, ResponseMode
+from pdap_access_manager.models.request import RequestInfo
+
+RECORDS = [{"id": index, "name": f"agency {index}"} for index in range(1000)]
+
+
+async def _export(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse()
+    await response.prepare(request)
+    if request.query.get("format") == "ndjson":
+        for record in RECORDS:
+            await response.write(json.dumps(record).encode() + b"\n")
+    else:
+        body = json.dumps(RECORDS).encode()
+        for start in range(0, len(body), 1000):
+            await response.write(body[start:start + 1000])
+    await response.write_eof()
+    return response
+
+
+async def test_stream_yields_items_from_aiohttp_response():
+    app = web.Application()
+    app.router.add_get("/export", _export)
+    async with TestServer(app) as server:
+        url = str(server.make_url("/export"))
+        async with AccessManagerAsync() as access_manager:
+            array = [item async for item in access_manager.stream(RequestInfo(type_=RequestType.GET, url=url))]
+            ndjson = [
+                item async for item in access_manager.stream(
+                    RequestInfo(type_=RequestType.GET, url=url, params={"format": "ndjson"})
+                )
+            ]
+            raw = await access_manager.make_request(
+                RequestInfo(type_=RequestType.GET, url=url, response_mode=ResponseMode.BYTES)
+            )
+
+    assert array == RECORDS
+    assert ndjson == RECORDS
+    assert json.loads(raw.data) == RECORDS
+
+
+async def test_stream_closed_early_releases_connection():
+    app = web.Application()
+    app.router.add_get("/export", _export)
+    async with TestServer(app) as server:
+        url = str(server.make_url("/export"))
+        async with AccessManagerAsync() as access_manager:
+            items = access_manager.stream(RequestInfo(type_=RequestType.GET, url=url))
+            assert await anext(items) == RECORDS[0]
+            await items.aclose()
+            assert access_manager.connection_pool_stats()["in_use"] == 0
+
+
+async def test_stream_outlasts_request_timeout():
+    async def slow_export(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b"[")
+        for index in range(6):
+            await asyncio.sleep(0.3)
+            await response.write((b"," if index else b"") + json.dumps({"id": index}).encode())
+        await response.write(b"]")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/export", slow_export)
+    async with TestServer(app) as server:
+        url = str(server.make_url("/export"))
+        async with AccessManagerAsync() as access_manager:
+            # Each read finishes within the 1 second timeout, the whole body does not
+            items = [item async for item in access_manager.stream(RequestInfo(type_=RequestType.GET, url=url, timeout=1))]
+
+    assert items == [{"id": index} for index in range(6)]
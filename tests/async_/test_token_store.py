@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.token_store import StoreLock, StoredCredentials, TokenStore
+
+
+class _SlowLock(StoreLock):
+
+    def __init__(self, may_acquire: threading.Event):
+        self.may_acquire = may_acquire
+        self.held = False
+        self.released = threading.Event()
+
+    def acquire(self) -> None:
+        self.may_acquire.wait(timeout=5)
+        self.held = True
+
+    def release(self) -> None:
+        self.held = False
+        self.released.set()
+
+
+class _LockOnlyStore(TokenStore):
+
+    def __init__(self, lock: StoreLock):
+        self.lock = lock
+
+    def load(self) -> StoredCredentials:
+        return StoredCredentials()
+
+    def save(self, tokens=None, api_key=None, email=None) -> None:
+        pass
+
+    def refresh_lock(self) -> StoreLock:
+        return self.lock
+
+
+async def test_lock_released_when_waiting_for_it_is_cancelled(access_manager: AccessManagerAsync):
+    lock = _SlowLock(threading.Event())
+    access_manager.token_store = _LockOnlyStore(lock)
+
+    async def hold():
+        async with access_manager._holding_store_lock():
+            pytest.fail("the lock was held after the wait was cancelled")
+
+    task = asyncio.create_task(hold())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The thread still gets the lock, and gives it back
+    lock.may_acquire.set()
+    assert await asyncio.to_thread(lock.released.wait, 5)
+    assert not lock.held
@@ -0,0 +1,62 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import ClientSession
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.transport import TransportConfig
+
+
+async def test_created_session_uses_transport_config():
+    access_manager = AccessManagerAsync(
+        auth=AuthInfo(email="email", password="password"),
+        transport_config=TransportConfig(limit=50, limit_per_host=20)
+    )
+
+    async with access_manager:
+        connector = access_manager.session.connector
+        assert connector.limit == 50
+        assert connector.limit_per_host == 20
+
+
+async def test_base_url_limit_caps_in_flight_requests():
+    in_flight = 0
+    max_in_flight = 0
+
+    class SlowResponse:
+        async def __aenter__(self):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = AsyncMock()
+            response.status = HTTPStatus.OK
+            response.json.return_value = {}
+            response.raise_for_status = MagicMock(return_value=None)
+            return response
+
+        async def __aexit__(self, *args):
+            return None
+
+    session = AsyncMock(spec=ClientSession)
+    session.get = MagicMock(side_effect=lambda **kwargs: SlowResponse())
+    access_manager = AccessManagerAsync(
+        auth=AuthInfo(email="email", password="password"),
+        session=session,
+        data_sources_url="https://data-sources.example/api",
+        transport_config=TransportConfig(data_sources_limit=3)
+    )
+
+    await asyncio.gather(*(
+        access_manager.make_request(
+            RequestInfo(type_=RequestType.GET, url="https://data-sources.example/api/x")
+        )
+        for _ in range(12)
+    ))
+
+    assert max_in_flight == 3
@@ -0,0 +1,101 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import AsyncInMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+async def test_in_memory_transport_logs_in_once_for_concurrent_requests():
+    logins = 0
+
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        nonlocal logins
+        if ri.url.endswith("/login"):
+            logins += 1
+            await asyncio.sleep(0.01)
+            return TransportResponse(
+                status_code=HTTPStatus.OK,
+                headers={},
+                data={"access_token": "access", "refresh_token": "refresh"}
+            )
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={"ok": True})
+
+    access_manager = AccessManagerAsync(
+        auth=AuthInfo(email="email", password="password"),
+        data_sources_url=URL,
+        transport=AsyncInMemoryTransport(handler)
+    )
+
+    async def get():
+        ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/x", headers=await access_manager.jwt_header())
+        return await access_manager.make_request(ri)
+
+    results = await asyncio.gather(*(get() for _ in range(10)))
+
+    assert logins == 1
+    assert all(result.data == {"ok": True} for result in results)
+
+
+async def test_httpx_transport_over_http2():
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    from pdap_access_manager.transports.httpx_ import AsyncHttpxTransport
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE, headers={"Retry-After": "5"})
+        return httpx.Response(HTTPStatus.OK, json={"method": request.method})
+
+    transport = AsyncHttpxTransport(http2=True)
+    assert transport.open()
+    await transport.close()
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AccessManagerAsync(transport=AsyncHttpxTransport(client)) as access_manager:
+        result = await access_manager.make_request(RequestInfo(type_=RequestType.GET, url=f"{URL}/x"))
+        assert result.data == {"method": "GET"}
+        with pytest.raises(RequestError) as e:
+            await access_manager.make_request(RequestInfo(type_=RequestType.POST, url=f"{URL}/x"))
+    assert e.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert e.value.retry_after == 5
+
+
+async def test_aiohttp_pool_stats_count_connections_in_use(monkeypatch):
+    from pdap_access_manager.transports import aiohttp_
+
+    if not aiohttp_._READS_ACQUIRED_CONNECTIONS:
+        pytest.skip("in_use is not read on this aiohttp version")
+    received = asyncio.Event()
+    respond = asyncio.Event()
+
+    async def slow(request: web.Request) -> web.Response:
+        received.set()
+        await respond.wait()
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/slow", slow)
+    async with TestServer(app) as server:
+        async with AccessManagerAsync() as access_manager:
+            request = asyncio.create_task(access_manager.make_request(
+                RequestInfo(type_=RequestType.GET, url=str(server.make_url("/slow")))
+            ))
+            await received.wait()
+            assert access_manager.connection_pool_stats()["in_use"] == 1
+            respond.set()
+            await request
+            assert access_manager.connection_pool_stats()["in_use"] == 0
+
+            monkeypatch.setattr(aiohttp_, "_READS_ACQUIRED_CONNECTIONS", False)
+            assert "in_use" not in access_manager.connection_pool_stats()
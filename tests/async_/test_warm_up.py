@@ -0,0 +1,58 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from pdap_access_manager.access_manager.async_ import AccessManagerAsync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+
+
+def _app(connections: set) -> web.Application:
+    async def login(request: web.Request) -> web.Response:
+        connections.add(id(request.transport))
+        # Slow enough that the connections open while it is in flight
+        await asyncio.sleep(0.05)
+        return web.json_response({"access_token": "access", "refresh_token": "refresh"})
+
+    async def api_key(request: web.Request) -> web.Response:
+        connections.add(id(request.transport))
+        return web.json_response({"api_key": "key"})
+
+    async def other(request: web.Request) -> web.Response:
+        connections.add(id(request.transport))
+        if request.method == "HEAD":
+            raise web.HTTPNotFound()
+        await asyncio.sleep(0.01)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/api/v2/auth/login", login)
+    app.router.add_post("/api/v2/auth/api-key", api_key)
+    app.router.add_route("*", "/{tail:.*}", other)
+    return app
+
+
+async def test_requests_after_warm_up_reuse_its_connections():
+    connections = set()
+    async with TestServer(_app(connections)) as server:
+        access_manager = AccessManagerAsync(
+            auth=AuthInfo(email="email", password="password"),
+            data_sources_url=str(server.make_url("/api")),
+            source_collector_url=str(server.make_url("/collector")),
+            warm_up_on_enter=True
+        )
+        async with access_manager:
+            assert access_manager.api_key == "key"
+            opened = len(connections)
+            # Login and the HEADs overlapped, each on its own connection
+            assert opened >= 3
+
+            ri = RequestInfo(
+                type_=RequestType.GET,
+                url=str(server.make_url("/api/agencies")),
+                headers=await access_manager.jwt_header()
+            )
+            await asyncio.gather(*(access_manager.make_request(ri) for _ in range(opened)))
+            assert len(connections) == opened
@@ -0,0 +1,18 @@
+import base64
+import json
+from typing import Callable
+
+import pytest
+
+
+def _make_jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(
+        json.dumps({"exp": exp}).encode()
+    ).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+@pytest.fixture
+def make_jwt() -> Callable[[float], str]:
+    """Builds an unsigned JWT whose `exp` claim is the given POSIX timestamp."""
+    return _make_jwt
@@ -21,3 +21,14 @@ def access_manager() -> AccessManagerSync:
         session=mock_session,
     )
     return access_manager
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    """
+    A fake `time.monotonic`, advanced by adding to `clock[0]`.
+    The modules under test all call it through the `time` module, so one patch covers them.
+    """
+    now = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    return now
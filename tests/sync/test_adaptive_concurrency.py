@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.concurrency import AdaptiveConcurrencyLimiter
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.instrumentation import MetricsCollector
+from pdap_access_manager.models.concurrency import AdaptiveConcurrencyConfig
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.openmetrics import OpenMetricsExporter
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+def _saturate(limiter: AdaptiveConcurrencyLimiter) -> list[float]:
+    """Take every slot, and note that a caller was held back."""
+    started = [limiter.acquire() for _ in range(limiter.limit)]
+    assert limiter._try_take() is False
+    return started
+
+
+def test_limit_grows_by_one_per_limit_of_healthy_responses_while_saturated(clock):
+    limiter = AdaptiveConcurrencyLimiter("ds", AdaptiveConcurrencyConfig(initial_limit=4, latency_window=1000))
+
+    for started in _saturate(limiter):
+        limiter.record(started, HTTPStatus.OK)
+    assert limiter.limit == 5
+
+    # Not held back: an idle client does not inflate the limit
+    for _ in range(20):
+        limiter.record(limiter.acquire(), HTTPStatus.OK)
+    assert limiter.limit == 5
+
+
+def test_overload_cuts_limit_once_per_window_of_requests_in_flight(clock):
+    limiter = AdaptiveConcurrencyLimiter("ds", AdaptiveConcurrencyConfig(initial_limit=10, decrease_factor=0.5))
+    started = _saturate(limiter)
+
+    clock[0] += 1
+    limiter.record(started[0], HTTPStatus.TOO_MANY_REQUESTS)
+    limiter.record(started[1], HTTPStatus.SERVICE_UNAVAILABLE)
+    limiter.record(started[2], None)
+    for other in started[3:]:
+        limiter.record(other, HTTPStatus.OK)
+    assert limiter.limit == 5
+    assert limiter.stats().decreases == 1
+
+    clock[0] += 1
+    limiter.record(limiter.acquire(), HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.limit == 2
+    # Client errors say nothing about load
+    clock[0] += 1
+    limiter.record(limiter.acquire(), HTTPStatus.NOT_FOUND)
+    assert limiter.limit == 2
+
+
+def test_limit_stays_within_bounds(clock):
+    limiter = AdaptiveConcurrencyLimiter(
+        "ds",
+        AdaptiveConcurrencyConfig(initial_limit=2, min_limit=2, max_limit=3, latency_window=1000)
+    )
+    for _ in range(5):
+        clock[0] += 1
+        limiter.record(limiter.acquire(), HTTPStatus.BAD_GATEWAY)
+    assert limiter.limit == 2
+
+    for _ in range(10):
+        for started in _saturate(limiter):
+            limiter.record(started, HTTPStatus.OK)
+    assert limiter.limit == 3
+
+
+def test_rising_p95_latency_cuts_limit(clock):
+    limiter = AdaptiveConcurrencyLimiter(
+        "ds",
+        AdaptiveConcurrencyConfig(initial_limit=10, latency_window=10, latency_tolerance=2.0, decrease_factor=0.5)
+    )
+
+    def respond(latency: float) -> None:
+        started = limiter.acquire()
+        clock[0] += latency
+        limiter.record(started, HTTPStatus.OK)
+
+    for _ in range(10):
+        respond(0.01)
+    assert limiter.stats().baseline_latency == pytest.approx(0.01)
+    for _ in range(10):
+        respond(0.05)
+
+    assert limiter.limit == 5
+    assert limiter.stats().p95_latency == pytest.approx(0.05)
+
+
+def test_waiting_threads_get_slots_in_order():
+    limiter = AdaptiveConcurrencyLimiter("ds", AdaptiveConcurrencyConfig(initial_limit=1, max_limit=1))
+    started = limiter.acquire()
+    order = []
+
+    def wait(index: int) -> None:
+        limiter.acquire()
+        order.append(index)
+        limiter.release()
+
+    threads = []
+    for index in range(3):
+        thread = threading.Thread(target=wait, args=(index,))
+        thread.start()
+        threads.append(thread)
+        while limiter.stats().waiting < index + 1:
+            time.sleep(0.001)
+
+    limiter.record(started, HTTPStatus.OK)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [0, 1, 2]
+    assert limiter.stats().in_flight == 0
+
+
+def test_manager_limits_threads_and_adapts_to_429s():
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+    release = threading.Event()
+
+    def handler(ri: RequestInfo) -> TransportResponse:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        release.wait(timeout=5)
+        with lock:
+            in_flight[0] -= 1
+        if ri.params and ri.params.get("busy"):
+            return TransportResponse(status_code=HTTPStatus.TOO_MANY_REQUESTS, headers={})
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    access_manager = AccessManagerSync(
+        tokens=TokensInfo(access_token="access", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=InMemoryTransport(handler),
+        adaptive_concurrency=AdaptiveConcurrencyConfig(initial_limit=3, decrease_factor=0.5)
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(access_manager.make_request, ri) for _ in range(8)]
+        while access_manager.concurrency_stats()[URL].waiting < 5:
+            time.sleep(0.001)
+        assert in_flight[0] == 3
+        release.set()
+        for future in futures:
+            future.result()
+    assert in_flight[1] == 3
+
+    # Healthy responses while callers were held back grew the limit
+    limit = access_manager.concurrency_stats()[URL].limit
+    assert limit > 3
+    with pytest.raises(RequestError):
+        access_manager.make_request(ri.model_copy(update={"params": {"busy": True}}))
+    assert access_manager.concurrency_stats()[URL].limit == limit // 2
+
+    exporter = OpenMetricsExporter(MetricsCollector(), managers=[access_manager])
+    rendered = exporter.render()
+    assert (
+        f'pdap_access_manager_concurrency_limit{{manager="AccessManagerSync-0",base_url="{URL}"}} {limit // 2}'
+        in rendered
+    )
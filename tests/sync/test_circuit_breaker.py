@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+from requests import ConnectionError
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.circuit_breaker import CircuitBreaker
+from pdap_access_manager.enums import CircuitState, RequestType
+from pdap_access_manager.exceptions import CircuitOpenError
+from pdap_access_manager.instrumentation import MetricsCollector
+from pdap_access_manager.models.circuit_breaker import CircuitBreakerConfig
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.openmetrics import OpenMetricsExporter
+
+
+def _fail(breaker: CircuitBreaker, times: int, status_code=None) -> None:
+    for _ in range(times):
+        breaker.record(breaker.acquire(), status_code)
+
+
+def test_opens_on_consecutive_failures_and_rejects(clock):
+    breaker = CircuitBreaker("ds", CircuitBreakerConfig(consecutive_failures=3, reset_timeout=10))
+
+    _fail(breaker, 2, HTTPStatus.SERVICE_UNAVAILABLE)
+    assert breaker.state == CircuitState.CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == CircuitState.OPEN
+
+    clock[0] += 4
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.acquire()
+    assert e.value.status_code is None
+    assert e.value.retry_after == pytest.approx(6)
+    assert breaker.stats().rejected == 1
+
+
+def test_opens_on_error_rate(clock):
+    breaker = CircuitBreaker(
+        "ds",
+        CircuitBreakerConfig(consecutive_failures=100, error_rate=0.5, window_size=10, min_calls=4)
+    )
+    for status_code in (200, None, 404, None):
+        breaker.record(breaker.acquire(), status_code)
+
+    # Client errors are not failures
+    assert breaker.stats().error_rate == 0.5
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    breaker = CircuitBreaker(
+        "ds",
+        CircuitBreakerConfig(consecutive_failures=1, reset_timeout=10, half_open_max_calls=1)
+    )
+    _fail(breaker, 1)
+    clock[0] += 10
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    probe = breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record(probe, None)
+    assert breaker.state == CircuitState.OPEN
+
+    clock[0] += 10
+    breaker.record(breaker.acquire(), HTTPStatus.OK)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_released_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker("ds", CircuitBreakerConfig(consecutive_failures=1, reset_timeout=1))
+    _fail(breaker, 1)
+    clock[0] += 1
+
+    breaker.release(breaker.acquire())
+    breaker.acquire()
+    assert breaker.state == CircuitState.HALF_OPEN
+
+
+def test_attempt_admitted_before_state_change_is_ignored(clock):
+    breaker = CircuitBreaker(
+        "ds",
+        CircuitBreakerConfig(consecutive_failures=1, reset_timeout=10, half_open_max_calls=1)
+    )
+    slow = breaker.acquire()
+    _fail(breaker, 1)
+    clock[0] += 10
+    probe = breaker.acquire()
+
+    # The slow attempt, sent while closed, neither counts as the probe nor frees its slot
+    breaker.record(slow, HTTPStatus.OK)
+    breaker.release(slow)
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.record(probe, HTTPStatus.OK)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_make_request_fails_fast_while_open(
+    access_manager: AccessManagerSync,
+    clock
+):
+    access_manager.circuit_breakers = {
+        "https://ds.example": CircuitBreaker("https://ds.example", CircuitBreakerConfig(consecutive_failures=2))
+    }
+    access_manager.session.get.side_effect = ConnectionError("down")
+    ri = RequestInfo(type_=RequestType.GET, url="https://ds.example/api/agencies")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            access_manager.make_request(ri)
+    with pytest.raises(CircuitOpenError):
+        access_manager.make_request(ri)
+
+    assert access_manager.session.get.call_count == 2
+    assert access_manager.circuit_breaker_stats()["https://ds.example"].state == CircuitState.OPEN
+
+    access_manager.connection_pool_stats = lambda: {}
+    text = OpenMetricsExporter(MetricsCollector(), managers=[access_manager]).render()
+    name = "pdap_access_manager_circuit_breaker_state"
+    assert f'{name}{{manager="AccessManagerSync-0",base_url="https://ds.example",{name}="open"}} 1' in text
+    assert f'{name}{{manager="AccessManagerSync-0",base_url="https://ds.example",{name}="closed"}} 0' in text
+
+
+def test_breakers_are_created_per_base_url():
+    manager = AccessManagerSync(
+        data_sources_url="https://ds.example",
+        source_collector_url="https://sc.example",
+        circuit_breaker=CircuitBreakerConfig()
+    )
+    assert set(manager.circuit_breaker_stats()) == {"https://ds.example", "https://sc.example"}
+
+
+def test_breaker_matches_whole_path_segments():
+    manager = AccessManagerSync(
+        data_sources_url="https://ds.example",
+        circuit_breaker=CircuitBreakerConfig()
+    )
+    breaker = manager.circuit_breakers["https://ds.example"]
+
+    assert manager._circuit_breaker_for("https://ds.example/api") is breaker
+    assert manager._circuit_breaker_for("https://ds.example?q=1") is breaker
+    assert manager._circuit_breaker_for("https://ds.example.evil/api") is None
@@ -0,0 +1,86 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from requests import HTTPError, Response
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+
+RI_KWARGS = dict(
+    type_=RequestType.GET,
+    url="https://ds.example/api/agencies/1",
+    headers={"Authorization": "Bearer a"}
+)
+
+
+def _wait_for_waiters(access_manager: AccessManagerSync, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        in_flight = list(access_manager._in_flight.values())
+        if in_flight and in_flight[0].waiters == count:
+            return
+        time.sleep(0.001)
+    raise AssertionError("callers did not join the in-flight request")
+
+
+def _run_concurrently(access_manager: AccessManagerSync, callers: int, release: threading.Event) -> list:
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [
+            executor.submit(access_manager.make_request, RequestInfo(**RI_KWARGS))
+            for _ in range(callers)
+        ]
+        _wait_for_waiters(access_manager, callers)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_identical_gets_share_one_call_across_threads(access_manager: AccessManagerSync):
+    access_manager.coalesce_requests = True
+    release = threading.Event()
+
+    def get(**kwargs):
+        release.wait()
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"data": [{"id": 1}]}
+        return response
+
+    access_manager.session.get.side_effect = get
+
+    results = _run_concurrently(access_manager, 4, release)
+
+    assert access_manager.session.get.call_count == 1
+    assert all(result.data == {"data": [{"id": 1}]} for result in results)
+    assert len({id(result.data) for result in results}) == 4
+    assert access_manager._in_flight == {}
+
+
+def test_errors_are_shared_with_waiting_threads(access_manager: AccessManagerSync):
+    access_manager.coalesce_requests = True
+    release = threading.Event()
+    error_response = Response()
+    error_response.status_code = 404
+
+    def get(**kwargs):
+        release.wait()
+        response = MagicMock()
+        response.raise_for_status.side_effect = HTTPError(response=error_response)
+        return response
+
+    access_manager.session.get.side_effect = get
+
+    results = _run_concurrently(access_manager, 3, release)
+
+    assert access_manager.session.get.call_count == 1
+    assert all(isinstance(result, RequestError) for result in results)
+
+
+def test_posts_are_not_coalesced(access_manager: AccessManagerSync):
+    access_manager.coalesce_requests = True
+    ri = RequestInfo(**{**RI_KWARGS, "type_": RequestType.POST})
+
+    assert access_manager._coalesce_key(ri) is None
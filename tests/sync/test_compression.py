@@ -0,0 +1,113 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import ContentEncoding, RequestType
+from pdap_access_manager.instrumentation import MetricsCollector
+from pdap_access_manager.models.compression import CompressionConfig
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+from pdap_access_manager.transports.requests_ import RequestsTransport
+
+URL = "https://ds.example/api"
+BODY = {"records": [{"name": f"Police Department {index}", "url": f"https://example.gov/{index}"} for index in range(100)]}
+
+
+def _ok(ri: RequestInfo) -> TransportResponse:
+    return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={"ok": True})
+
+
+def _access_manager(transport: InMemoryTransport, compression: CompressionConfig, **kwargs) -> AccessManagerSync:
+    return AccessManagerSync(
+        tokens=TokensInfo(access_token="access", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=transport,
+        compression=compression,
+        **kwargs
+    )
+
+
+def _post(body: dict) -> RequestInfo:
+    return RequestInfo(type_=RequestType.POST, url=f"{URL}/source-collector/data-sources", json_=body)
+
+
+def test_large_json_body_is_gzipped():
+    transport = InMemoryTransport(_ok)
+    access_manager = _access_manager(transport, CompressionConfig())
+
+    access_manager.make_request(_post(BODY))
+
+    sent = transport.requests[0]
+    assert sent.json_ is None
+    assert sent.headers["Content-Encoding"] == "gzip"
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(sent.content)) == BODY
+    assert len(sent.content) < len(json.dumps(BODY))
+
+
+def test_small_body_is_sent_as_is_with_accept_encoding():
+    transport = InMemoryTransport(_ok)
+    transport.accept_encoding = "gzip, deflate"
+    access_manager = _access_manager(transport, CompressionConfig(min_size=1024))
+
+    access_manager.make_request(_post({"name": "small"}))
+    access_manager.make_request(RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies", headers={"accept-encoding": "identity"}))
+
+    small, get = transport.requests
+    assert small.json_ == {"name": "small"}
+    assert small.content is None
+    assert "Content-Encoding" not in small.headers
+    assert small.headers["Accept-Encoding"] == "gzip, deflate"
+    # A caller's own header is left alone
+    assert get.headers == {"accept-encoding": "identity"}
+
+
+def test_unsupported_media_type_falls_back_to_identity_for_the_host():
+    def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.content is not None:
+            return TransportResponse(status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE, headers={})
+        return _ok(ri)
+
+    transport = InMemoryTransport(handler)
+    access_manager = _access_manager(transport, CompressionConfig())
+
+    assert access_manager.make_request(_post(BODY)).data == {"ok": True}
+    access_manager.make_request(_post(BODY))
+
+    assert [ri.content is not None for ri in transport.requests] == [True, False, False]
+    assert transport.requests[1].json_ == BODY
+
+
+def test_zstd_body():
+    zstandard = pytest.importorskip("zstandard")
+    transport = InMemoryTransport(_ok)
+    access_manager = _access_manager(transport, CompressionConfig(encoding=ContentEncoding.ZSTD))
+
+    access_manager.make_request(_post(BODY))
+
+    sent = transport.requests[0]
+    assert sent.headers["Content-Encoding"] == "zstd"
+    assert json.loads(zstandard.ZstdDecompressor().decompress(sent.content)) == BODY
+
+
+def test_metrics_record_bytes_before_and_after_compression():
+    metrics = MetricsCollector()
+    transport = InMemoryTransport(_ok)
+    access_manager = _access_manager(transport, CompressionConfig(), hooks=metrics)
+
+    access_manager.make_request(_post(BODY))
+
+    [stats] = metrics.endpoints.values()
+    assert stats.request_bytes == len(transport.requests[0].content)
+    assert stats.request_body_bytes == len(json.dumps(BODY, separators=(",", ":")))
+    assert stats.request_bytes < stats.request_body_bytes
+
+
+def test_transports_advertise_the_encodings_they_decode():
+    assert "gzip" in RequestsTransport.accept_encoding
+    assert InMemoryTransport.accept_encoding is None
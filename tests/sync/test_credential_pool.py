@@ -0,0 +1,174 @@
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.pool import AccessManagerPoolSync
+from pdap_access_manager.credential_pool import Credential, CredentialPool
+from pdap_access_manager.enums import CredentialStrategy, RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.instrumentation import MetricsCollector
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+from pdap_access_manager.openmetrics import OpenMetricsExporter
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+def test_least_loaded_picks_idle_credentials_in_turn(clock):
+    pool = CredentialPool(["a", "b", "c"])
+
+    first, _ = pool.acquire()
+    second, _ = pool.acquire()
+    pool.release(first, HTTPStatus.OK)
+    # "a" is idle again, but "c" is also idle and next in turn
+    assert pool.acquire() == (2, 0.0)
+    assert pool.acquire() == (0, 0.0)
+    assert (first, second) == (0, 1)
+
+
+def test_round_robin_ignores_load(clock):
+    pool = CredentialPool(["a", "b"], strategy=CredentialStrategy.ROUND_ROBIN)
+
+    assert [pool.acquire()[0] for _ in range(5)] == [0, 1, 0, 1, 0]
+
+
+def test_throttled_credentials_are_skipped_until_their_cooldown_ends(clock):
+    pool = CredentialPool(["a", "b"], throttle_cooldown=1.0)
+
+    index, _ = pool.acquire()
+    pool.release(index, HTTPStatus.TOO_MANY_REQUESTS, retry_after=10)
+    for _ in range(3):
+        index, _ = pool.acquire()
+        assert index == 1
+        pool.release(index, HTTPStatus.TOO_MANY_REQUESTS)
+    # Both are throttled: "b" for 4s after its third 429 in a row, "a" for 10s
+    assert pool.acquire() == (1, 4.0)
+    pool.release(1, HTTPStatus.OK)
+
+    stats = pool.stats()
+    assert stats["a"].throttled == 1
+    assert stats["a"].seconds_throttled == 10
+    assert stats["b"].throttled == 3
+
+    clock[0] += 4
+    index, wait = pool.acquire()
+    pool.release(index, HTTPStatus.TOO_MANY_REQUESTS)
+    # The success reset the backoff
+    assert (index, wait) == (1, 0.0)
+    assert pool.stats()["b"].seconds_throttled == 1
+
+
+def test_invalid_pools_are_rejected():
+    with pytest.raises(ValueError):
+        CredentialPool([])
+    with pytest.raises(ValueError):
+        CredentialPool(["a", "a"])
+    with pytest.raises(ValueError):
+        AccessManagerPoolSync([AuthInfo(email="a", password="p")], auth=AuthInfo(email="b", password="p"))
+
+
+def _handler(throttled: set[str], logins: list[str], sent: list[str]):
+    def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.url.endswith("/v2/auth/login"):
+            email = ri.json_["email"]
+            logins.append(email)
+            return TransportResponse(
+                status_code=HTTPStatus.OK,
+                headers={},
+                data={"access_token": f"access-{email}", "refresh_token": f"refresh-{email}"}
+            )
+        authorization = ri.headers["Authorization"]
+        sent.append(authorization)
+        if any(authorization.endswith(email) for email in throttled):
+            return TransportResponse(status_code=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "30"})
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={"ok": True})
+
+    return handler
+
+
+def test_throttled_request_moves_to_another_credential():
+    logins, sent = [], []
+    access_manager = AccessManagerPoolSync(
+        [AuthInfo(email=email, password="password") for email in ("a", "b", "c")],
+        data_sources_url=URL,
+        transport=InMemoryTransport(_handler({"a"}, logins, sent)),
+        retry_policy=RetryPolicy(backoff_base=0)
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies", headers=access_manager.jwt_header())
+
+    for _ in range(4):
+        assert access_manager.make_request(ri).data == {"ok": True}
+
+    assert sent == ["Bearer access-a", "Bearer access-b", "Bearer access-c", "Bearer access-b", "Bearer access-c"]
+    # Each credential logs in for itself, once
+    assert sorted(logins) == ["a", "b", "c"]
+    stats = access_manager.credential_stats()
+    assert stats["a"].throttled == 1
+    assert stats["a"].seconds_throttled > 25
+    assert [stats[name].in_flight for name in "abc"] == [0, 0, 0]
+
+    rendered = OpenMetricsExporter(MetricsCollector(), managers=[access_manager]).render()
+    assert 'pdap_access_manager_credential_throttled_total{manager="AccessManagerPoolSync-0",credential="a"} 1' \
+           in rendered
+    assert 'pdap_access_manager_credential_requests_total{manager="AccessManagerPoolSync-0",credential="b"} 2' \
+           in rendered
+
+
+def test_throttling_is_raised_without_a_retry_policy():
+    access_manager = AccessManagerPoolSync(
+        [AuthInfo(email=email, password="password") for email in ("a", "b")],
+        data_sources_url=URL,
+        transport=InMemoryTransport(_handler({"a"}, [], []))
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies", headers=access_manager.jwt_header())
+
+    with pytest.raises(RequestError) as e:
+        access_manager.make_request(ri)
+    assert e.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    # The next request avoids the throttled credential
+    assert access_manager.make_request(ri).data == {"ok": True}
+
+
+def test_api_key_requests_use_each_credentials_key():
+    sent = []
+
+    def handler(ri: RequestInfo) -> TransportResponse:
+        sent.append((ri.headers or {}).get("Authorization"))
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    access_manager = AccessManagerPoolSync(
+        [Credential(api_key="key-1", name="first"), Credential(api_key="key-2", name="second")],
+        data_sources_url=URL,
+        transport=InMemoryTransport(handler),
+        strategy=CredentialStrategy.ROUND_ROBIN
+    )
+    ri = RequestInfo(
+        type_=RequestType.GET,
+        url=f"{URL}/agencies",
+        headers={**access_manager.api_key_header(), "X-Trace": "1"}
+    )
+    unauthenticated = RequestInfo(type_=RequestType.GET, url=f"{URL}/health")
+
+    for _ in range(3):
+        access_manager.make_request(ri)
+    access_manager.make_request(unauthenticated)
+
+    assert sent == ["Basic key-1", "Basic key-2", "Basic key-1", None]
+    assert set(access_manager.credential_stats()) == {"first", "second"}
+
+
+def test_login_keeps_the_manager_contract():
+    logins = []
+    access_manager = AccessManagerPoolSync(
+        [AuthInfo(email=email, password="password") for email in ("a", "b")],
+        data_sources_url=URL,
+        transport=InMemoryTransport(_handler(set(), logins, []))
+    )
+
+    assert access_manager.login().access_token == "access-a"
+    assert [tokens.access_token for tokens in access_manager.login_all()] == ["access-a", "access-b"]
+    assert [manager.tokens.access_token for manager in access_manager.managers] == ["access-a", "access-b"]
+    assert logins == ["a", "a", "b"]
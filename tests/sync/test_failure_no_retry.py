@@ -27,7 +27,7 @@ def test_access_manager_refresh_access_token_failure_no_retry(
         )
     )
     post_response = MagicMock(name="post_response")
-    post_response.status = 200
+    post_response.status_code = 200
     response = Response()
     response.status_code = HTTPStatus.UNAUTHORIZED
     post_response.raise_for_status.side_effect = HTTPError(
@@ -36,7 +36,7 @@ def test_access_manager_refresh_access_token_failure_no_retry(
 
     mock_session_post = MagicMock(name="mock_session_post")
     mock_session_post.return_value = post_response
-    access_manager._session.post = mock_session_post
+    access_manager.session.post = mock_session_post
 
     access_manager.refresh_access_token()
 
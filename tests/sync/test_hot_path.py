@@ -0,0 +1,54 @@
+import pytest
+from boltons import urlutils
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+
+
+def _boltons_url(url: str, params: dict) -> str:
+    parsed = urlutils.URL(url)
+    parsed.query_params.update(params)
+    return parsed.to_text()
+
+
+@pytest.mark.parametrize("params", [
+    {"n": None},
+    {"ids": [1, 2]},
+    {"q": "a b"},
+    {"q": "é/ü&=+#"},
+    {"state": "PA", "page": 2},
+])
+@pytest.mark.parametrize("url", [
+    "https://data-sources.example/api/search",
+    "https://data-sources.example/api/search?state=PA",
+])
+def test_url_with_query_params_matches_boltons(url: str, params: dict):
+    ri = RequestInfo(type_=RequestType.GET, url=url, params=params)
+
+    assert ri.url_with_query_params() == _boltons_url(url, params)
+
+
+def test_url_with_query_params_merges_existing_query():
+    ri = RequestInfo(
+        type_=RequestType.GET,
+        url="https://data-sources.example/api/search?state=PA",
+        params={"page": "2", "n": None}
+    )
+
+    assert ri.url_with_query_params() == (
+        "https://data-sources.example/api/search?state=PA&page=2&n"
+    )
+
+
+def test_headers_are_not_shared_between_calls(access_manager: AccessManagerSync):
+    access_manager._tokens = TokensInfo(access_token="one", refresh_token="r")
+    access_manager.api_key = "key"
+
+    for get_header in (access_manager.jwt_header, access_manager.refresh_jwt_header, access_manager.api_key_header):
+        header = get_header()
+        header["Authorization"] = "changed"
+        header["X-Extra"] = "1"
+        assert "X-Extra" not in get_header()
+        assert get_header()["Authorization"] != "changed"
@@ -0,0 +1,120 @@
+import json
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+from requests import HTTPError, Response
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.instrumentation import Hooks, MetricsCollector, RequestEvent, request_body_size, url_template
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+
+
+def _response(status: int, json: dict = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = json
+    response.headers = {"Content-Length": "42"}
+    if status >= 400:
+        error_response = Response()
+        error_response.status_code = status
+        response.raise_for_status.side_effect = HTTPError(response=error_response)
+    return response
+
+
+def test_url_template_replaces_ids():
+    assert url_template("/api/v2/agencies/123") == "/api/v2/agencies/{id}"
+    assert url_template(
+        "/api/v2/data-sources/0f8fad5b-d9cb-469f-a165-70867728950e/related-agencies"
+    ) == "/api/v2/data-sources/{id}/related-agencies"
+
+
+def test_metrics_collector_records_requests_retries_and_logins(
+    access_manager: AccessManagerSync,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        "pdap_access_manager.access_manager.sync.time.sleep",
+        lambda _: None
+    )
+    metrics = MetricsCollector()
+    access_manager.hooks = metrics
+    access_manager.retry_policy = RetryPolicy()
+    access_manager.session.post.return_value = _response(
+        HTTPStatus.OK,
+        {"access_token": "a", "refresh_token": "r"}
+    )
+    access_manager.session.get.side_effect = [
+        _response(HTTPStatus.SERVICE_UNAVAILABLE),
+        _response(HTTPStatus.OK, {}),
+        _response(HTTPStatus.OK, {}),
+    ]
+
+    for agency_id in (1, 2):
+        access_manager.make_request(
+            RequestInfo(
+                type_=RequestType.GET,
+                url=f"https://data-sources.example/api/v2/agencies/{agency_id}",
+                headers=access_manager.jwt_header()
+            )
+        )
+
+    agencies = metrics.endpoints[
+        ("GET", "data-sources.example", "/api/v2/agencies/{id}")
+    ]
+    assert agencies.count == 3
+    assert agencies.errors == 1
+    assert agencies.statuses == {HTTPStatus.SERVICE_UNAVAILABLE: 1, HTTPStatus.OK: 2}
+    assert agencies.response_bytes == 84
+    assert agencies.quantile(0.99) is not None
+    assert metrics.retries == 1
+    assert metrics.logins == 1
+    assert metrics.refreshes == 0
+    assert metrics.in_flight == {"data-sources.pdap.io": 0, "data-sources.example": 0}
+    assert metrics.errors_by_status() == {HTTPStatus.SERVICE_UNAVAILABLE: 1}
+
+
+def test_request_size_measured_once_for_all_attempts(
+    access_manager: AccessManagerSync,
+    monkeypatch
+):
+    monkeypatch.setattr(
+        "pdap_access_manager.access_manager.sync.time.sleep",
+        lambda _: None
+    )
+    measured = []
+
+    def counting_request_body_size(ri: RequestInfo):
+        measured.append(ri)
+        return request_body_size(ri)
+
+    monkeypatch.setattr(
+        "pdap_access_manager.access_manager._base.request_body_size",
+        counting_request_body_size
+    )
+    events = []
+
+    class _Recorder(Hooks):
+        def on_request_start(self, event: RequestEvent) -> None:
+            events.append(event)
+
+    access_manager.hooks = _Recorder()
+    access_manager.retry_policy = RetryPolicy()
+    access_manager.session.post.side_effect = [
+        _response(HTTPStatus.SERVICE_UNAVAILABLE),
+        _response(HTTPStatus.OK, {}),
+    ]
+    body = {"name": "agency", "ids": [1, 2, 3]}
+
+    access_manager.make_request(
+        RequestInfo(
+            type_=RequestType.POST,
+            url="https://data-sources.example/api/v2/agencies",
+            json_=body,
+            retryable=True
+        )
+    )
+
+    assert [event.request_bytes for event in events] == [len(json.dumps(body).encode())] * 2
+    assert len(measured) == 1
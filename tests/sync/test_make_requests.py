@@ -0,0 +1,101 @@
+import threading
+import time
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+from requests import ConnectionError
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.constants import DEFAULT_MAX_CONCURRENCY
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+
+def _request(i: int) -> RequestInfo:
+    return RequestInfo(type_=RequestType.GET, url=f"url/{i}")
+
+
+def test_make_requests_ordered_with_errors(access_manager: AccessManagerSync):
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def make_request(ri: RequestInfo):
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        i = int(ri.url.split("/")[-1])
+        time.sleep(0.001 * (i % 3))
+        with lock:
+            in_flight -= 1
+        if i % 5 == 0:
+            raise RequestError("fail", HTTPStatus.INTERNAL_SERVER_ERROR)
+        if i % 7 == 0:
+            raise ConnectionError("reset")
+        return ResponseInfo(status_code=HTTPStatus.OK, data={"i": i})
+
+    access_manager.make_request = MagicMock(side_effect=make_request)
+
+    results = list(
+        access_manager.make_requests(
+            (_request(i) for i in range(50)),
+            max_concurrency=4
+        )
+    )
+
+    assert [index for index, _ in results] == list(range(50))
+    for index, result in results:
+        if index % 5 == 0:
+            assert result.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        elif index % 7 == 0:
+            assert isinstance(result, RequestError)
+            assert result.status_code is None
+        else:
+            assert result.data == {"i": index}
+    assert max_in_flight <= 4
+
+
+def test_make_requests_unordered(access_manager: AccessManagerSync):
+    def make_request(ri: RequestInfo):
+        i = int(ri.url.split("/")[-1])
+        time.sleep(0.05 if i == 0 else 0)
+        return ResponseInfo(status_code=HTTPStatus.OK, data={"i": i})
+
+    access_manager.make_request = MagicMock(side_effect=make_request)
+
+    results = list(
+        access_manager.make_requests(
+            [_request(i) for i in range(5)],
+            max_concurrency=5,
+            ordered=False
+        )
+    )
+
+    assert sorted(index for index, _ in results) == list(range(5))
+    assert results[-1][0] == 0
+
+
+def test_batches_reuse_worker_threads():
+    threads = set()
+
+    def handler(ri: RequestInfo) -> TransportResponse:
+        threads.add(threading.current_thread())
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    with AccessManagerSync(transport=InMemoryTransport(handler)) as access_manager:
+        for _ in range(5):
+            assert len(list(access_manager.make_requests(_request(i) for i in range(16)))) == 16
+        records = access_manager.paginate(_request(0), read_ahead=2)
+        assert list(records) == []
+        # One pool's worth of threads served all six batches
+        assert len(threads) <= DEFAULT_MAX_CONCURRENCY
+        executor = access_manager._executor
+
+    assert access_manager._executor is None
+    assert executor._shutdown
+    assert not any(thread.is_alive() for thread in threads)
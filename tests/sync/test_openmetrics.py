@@ -0,0 +1,88 @@
+import asyncio
+
+from pdap_access_manager.cache import ResponseCache
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.instrumentation import AuthEvent, MetricsCollector, RequestEvent
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.openmetrics import CONTENT_TYPE, OpenMetricsExporter
+
+
+def _observe(metrics: MetricsCollector, url: str, status: int, duration: float) -> None:
+    event = RequestEvent.start(RequestInfo(type_=RequestType.GET, url=url), attempt=1)
+    metrics.on_request_start(event)
+    event.finish(status)
+    event.duration = duration
+    metrics.on_response(event)
+
+
+def _exporter() -> OpenMetricsExporter:
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    _observe(metrics, "https://ds.example/api/agencies/1", 200, 0.05)
+    _observe(metrics, "https://ds.example/api/agencies/2", 500, 0.5)
+    metrics.on_login(AuthEvent(kind="login", started_at=0.0, duration=0.1, success=True))
+    metrics.on_token_refresh(AuthEvent(kind="refresh", started_at=0.0, duration=0.1, success=False))
+    cache = ResponseCache()
+    cache.stats.hits = 3
+    cache.stats.misses = 1
+    return OpenMetricsExporter(metrics, cache=cache)
+
+
+def test_render_histogram_counters_and_cache():
+    text = _exporter().render()
+    labels = 'method="GET",host="ds.example",endpoint="/api/agencies/{id}"'
+
+    assert f"pdap_access_manager_requests_total{{{labels}}} 2" in text
+    assert f'pdap_access_manager_request_errors_total{{{labels},status="500"}} 1' in text
+    assert f'pdap_access_manager_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'pdap_access_manager_request_duration_seconds_bucket{{{labels},le="1"}} 2' in text
+    assert f'pdap_access_manager_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"pdap_access_manager_request_duration_seconds_count{{{labels}}} 2" in text
+    assert 'pdap_access_manager_requests_in_flight{host="ds.example"} 0' in text
+    assert 'pdap_access_manager_logins_total{result="success"} 1' in text
+    assert 'pdap_access_manager_token_refreshes_total{result="failure"} 1' in text
+    assert "pdap_access_manager_cache_hit_ratio 0.75" in text
+    assert text.endswith("# EOF\n")
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsCollector()
+    _observe(metrics, 'https://ds.example/a"b', 200, 0.01)
+    text = OpenMetricsExporter(metrics).render()
+    assert 'endpoint="/a\\"b"' in text
+
+
+def test_wsgi_and_asgi_apps_serve_render():
+    exporter = _exporter()
+    started = {}
+
+    def start_response(status, headers):
+        started["status"] = status
+        started["headers"] = dict(headers)
+
+    body = b"".join(exporter.wsgi_app({}, start_response))
+    assert started["status"] == "200 OK"
+    assert started["headers"]["Content-Type"] == CONTENT_TYPE
+    assert body.decode() == exporter.render()
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(exporter.asgi_app({"type": "http"}, None, send))
+    assert messages[0]["status"] == 200
+    assert (b"content-type", CONTENT_TYPE.encode()) in messages[0]["headers"]
+    assert messages[1]["body"].decode() == exporter.render()
+
+
+def test_connection_pool_gauges(access_manager):
+    access_manager.connection_pool_stats = lambda: {"limit": 10, "in_use": 2}
+    text = OpenMetricsExporter(MetricsCollector(), managers=[access_manager]).render()
+    name = f"{type(access_manager).__name__}-0"
+    assert f'pdap_access_manager_connection_pool_limit{{manager="{name}"}} 10' in text
+    assert f'pdap_access_manager_connection_pool_in_use{{manager="{name}"}} 2' in text
+
+    access_manager.connection_pool_stats = lambda: {"limit": 10}
+    text = OpenMetricsExporter(MetricsCollector(), managers=[access_manager]).render()
+    assert f'pdap_access_manager_connection_pool_limit{{manager="{name}"}} 10' in text
+    assert f'pdap_access_manager_connection_pool_in_use{{manager="{name}"}}' not in text
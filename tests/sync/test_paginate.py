@@ -0,0 +1,35 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.response import ResponseInfo
+
+PAGE_SIZE = 3
+TOTAL_PAGES = 4
+
+
+def _page(ri: RequestInfo) -> ResponseInfo:
+    page = ri.params["page"]
+    records = (
+        [{"page": page, "i": i} for i in range(PAGE_SIZE)]
+        if page <= TOTAL_PAGES else []
+    )
+    return ResponseInfo(status_code=HTTPStatus.OK, data={"data": records})
+
+
+def test_paginate_yields_all_records(access_manager: AccessManagerSync):
+    access_manager.make_request = MagicMock(side_effect=_page)
+
+    ri = RequestInfo(type_=RequestType.GET, url="url")
+    records = list(access_manager.paginate(ri, read_ahead=2))
+
+    assert len(records) == PAGE_SIZE * TOTAL_PAGES
+    assert records[0] == {"page": 1, "i": 0}
+    assert records[-1] == {"page": TOTAL_PAGES, "i": PAGE_SIZE - 1}
+    requested_pages = sorted(
+        call.args[0].params["page"]
+        for call in access_manager.make_request.call_args_list
+    )
+    assert requested_pages[:TOTAL_PAGES + 1] == list(range(1, TOTAL_PAGES + 2))
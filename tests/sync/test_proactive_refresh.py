@@ -0,0 +1,71 @@
+import time
+from unittest.mock import MagicMock
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+
+
+def test_tokens_info_decodes_expiry(make_jwt):
+    exp = time.time() + 3600
+    tokens = TokensInfo(
+        access_token=make_jwt(exp),
+        refresh_token="not-a-jwt"
+    )
+    assert tokens.access_token_expires_at == exp
+    assert tokens.refresh_token_expires_at is None
+    assert not tokens.access_token_expired()
+    assert tokens.access_token_expired(now=exp - tokens.clock_skew)
+    assert not tokens.refresh_token_expired()
+
+
+def test_proactive_refresh_before_request(access_manager: AccessManagerSync, make_jwt):
+    access_manager.proactive_refresh = True
+    stale_access = make_jwt(time.time() + 5)
+    access_manager._tokens = TokensInfo(
+        access_token=stale_access,
+        refresh_token=make_jwt(time.time() + 3600)
+    )
+
+    def refresh():
+        access_manager._tokens = TokensInfo(
+            access_token=make_jwt(time.time() + 3600),
+            refresh_token=make_jwt(time.time() + 7200)
+        )
+
+    access_manager.refresh_access_token = MagicMock(side_effect=refresh)
+
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"key": "value"}
+    access_manager.session.get.return_value = response
+
+    ri = RequestInfo(
+        type_=RequestType.GET,
+        url="url",
+        headers={"Authorization": f"Bearer {stale_access}"}
+    )
+    access_manager.make_request(ri)
+
+    access_manager.refresh_access_token.assert_called_once()
+    sent_headers = access_manager.session.get.call_args.kwargs["headers"]
+    assert sent_headers == access_manager.jwt_header()
+
+
+def test_no_refresh_when_token_is_fresh(access_manager: AccessManagerSync, make_jwt):
+    access_manager.proactive_refresh = True
+    access_manager._tokens = TokensInfo(
+        access_token=make_jwt(time.time() + 3600),
+        refresh_token=make_jwt(time.time() + 7200)
+    )
+    access_manager.refresh_access_token = MagicMock()
+
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {}
+    access_manager.session.get.return_value = response
+
+    access_manager.make_request(RequestInfo(type_=RequestType.GET, url="url"))
+
+    access_manager.refresh_access_token.assert_not_called()
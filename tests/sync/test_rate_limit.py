@@ -0,0 +1,119 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from requests import HTTPError, Response
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.rate_limit import RateLimit, RateLimiter
+
+BASE_URL = "https://data-sources.example/api"
+
+
+def test_bucket_allows_burst_then_paces(clock):
+    limiter = RateLimiter({BASE_URL: RateLimit(rate=10, burst=3)})
+
+    waits = [limiter.reserve(f"{BASE_URL}/v2/agencies") for _ in range(5)]
+
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1)
+    assert waits[4] == pytest.approx(0.2)
+    assert limiter.reserve("https://other.example/api") == 0
+
+
+def test_endpoint_limit_applies_within_base_limit(clock):
+    limiter = RateLimiter({
+        BASE_URL: RateLimit(rate=100),
+        f"{BASE_URL}/v2/search": RateLimit(rate=2),
+    })
+
+    assert limiter.reserve(f"{BASE_URL}/v2/search") == 0
+    assert limiter.reserve(f"{BASE_URL}/v2/search") == pytest.approx(0.5)
+    assert limiter.reserve(f"{BASE_URL}/v2/agencies") == pytest.approx(0.02)
+
+
+def test_prefix_matches_whole_path_segments(clock):
+    limiter = RateLimiter({f"{BASE_URL}/v2/search": RateLimit(rate=1)})
+
+    assert limiter.reserve(f"{BASE_URL}/v2/search") == 0
+    assert limiter.reserve(f"{BASE_URL}/v2/search/") == pytest.approx(1)
+    assert limiter.reserve(f"{BASE_URL}/v2/search?q=a") == pytest.approx(2)
+    assert limiter.reserve(f"{BASE_URL}/v2/search/federal") == pytest.approx(3)
+    assert limiter.reserve(f"{BASE_URL}/v2/searches") == 0
+    assert limiter.reserve(f"{BASE_URL}-staging/v2/search") == 0
+
+
+def test_429_shrinks_rate_and_successes_recover_it(clock):
+    limiter = RateLimiter({BASE_URL: RateLimit(rate=10)}, increase_step=0.1)
+    url = f"{BASE_URL}/v2/agencies"
+
+    limiter.observe(url, HTTPStatus.TOO_MANY_REQUESTS)
+    # Other in-flight requests report the same overload
+    limiter.observe(url, HTTPStatus.TOO_MANY_REQUESTS)
+    assert limiter.current_rates() == {BASE_URL: 5}
+
+    clock[0] += 2
+    for _ in range(3):
+        limiter.observe(url, HTTPStatus.OK)
+    assert limiter.current_rates()[BASE_URL] == pytest.approx(8)
+
+    for _ in range(10):
+        limiter.observe(url, HTTPStatus.OK)
+    assert limiter.current_rates()[BASE_URL] == 10
+
+
+def test_retry_after_holds_bucket(clock):
+    limiter = RateLimiter({BASE_URL: RateLimit(rate=10)})
+    url = f"{BASE_URL}/v2/agencies"
+
+    limiter.observe(url, HTTPStatus.TOO_MANY_REQUESTS, retry_after=3)
+
+    assert limiter.reserve(url) == pytest.approx(3)
+
+
+def test_non_adaptive_limiter_keeps_rate(clock):
+    limiter = RateLimiter({BASE_URL: RateLimit(rate=10)}, adaptive=False)
+    limiter.observe(f"{BASE_URL}/x", HTTPStatus.TOO_MANY_REQUESTS, retry_after=3)
+    assert limiter.current_rates() == {BASE_URL: 10}
+    assert limiter.reserve(f"{BASE_URL}/x") == 0
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        RateLimit(rate=0)
+    with pytest.raises(ValueError):
+        RateLimit(rate=1, burst=0)
+
+
+def test_make_request_waits_for_rate_limiter(
+    access_manager: AccessManagerSync,
+    clock,
+    monkeypatch
+):
+    sleeps = []
+    monkeypatch.setattr("pdap_access_manager.access_manager.sync.time.sleep", sleeps.append)
+    access_manager.rate_limiter = RateLimiter({BASE_URL: RateLimit(rate=4)})
+    ok = MagicMock()
+    ok.status_code = 200
+    ok.json.return_value = {}
+    error = Response()
+    error.status_code = HTTPStatus.TOO_MANY_REQUESTS
+    error.headers["Retry-After"] = "2"
+    rate_limited = MagicMock()
+    rate_limited.raise_for_status.side_effect = HTTPError(response=error)
+    access_manager.session.get.side_effect = [ok, ok, rate_limited, ok]
+    ri = RequestInfo(type_=RequestType.GET, url=f"{BASE_URL}/v2/agencies")
+
+    access_manager.make_request(ri)
+    access_manager.make_request(ri)
+    with pytest.raises(RequestError):
+        access_manager.make_request(ri)
+    access_manager.make_request(ri)
+
+    assert sleeps[0] == pytest.approx(0.25)
+    assert sleeps[1] == pytest.approx(0.5)
+    # The 429's Retry-After holds later requests
+    assert sleeps[2] == pytest.approx(2.0)
@@ -26,7 +26,7 @@ def test_access_manager_refresh_on_401(access_manager: AccessManagerSync):
 
     # Second response succeeds
     second_get_response = MagicMock(name="second_get_response")
-    second_get_response.status = 200
+    second_get_response.status_code = 200
     second_get_response.raise_for_status.return_value = None
     second_get_response.json.return_value = {"retried": True}
 
@@ -35,7 +35,7 @@ def test_access_manager_refresh_on_401(access_manager: AccessManagerSync):
         first_get_response,
         second_get_response
     ]
-    access_manager._session.get = mock_session_get
+    access_manager.session.get = mock_session_get
 
     ri = RequestInfo(
         type_=RequestType.GET,
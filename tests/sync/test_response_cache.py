@@ -0,0 +1,182 @@
+import time
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.cache import ResponseCache, InMemoryCacheBackend
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.request import RequestInfo
+
+
+def _response(status: int, json: dict = None, headers: dict = None) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = json
+    response.headers = headers or {}
+    return response
+
+
+def _get(url: str = "url", token: str = "token") -> RequestInfo:
+    return RequestInfo(
+        type_=RequestType.GET,
+        url=url,
+        params={"id": 1},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def test_fresh_entry_served_without_request(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache(ttl=60)
+    access_manager.session.get.return_value = _response(
+        HTTPStatus.OK, {"agency": "a"}
+    )
+
+    first = access_manager.make_request(_get())
+    first.data["agency"] = "mutated"
+    second = access_manager.make_request(_get())
+
+    assert second.data == {"agency": "a"}
+    assert access_manager.session.get.call_count == 1
+    stats = access_manager.response_cache.stats
+    assert (stats.hits, stats.misses, stats.stores) == (1, 1, 1)
+
+
+def test_cache_key_varies_on_authorization(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache()
+    access_manager.session.get.return_value = _response(HTTPStatus.OK, {})
+
+    access_manager.make_request(_get(token="one"))
+    access_manager.make_request(_get(token="two"))
+
+    assert access_manager.session.get.call_count == 2
+
+
+def test_stale_entry_revalidated_with_etag(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache(ttl=0)
+    access_manager.session.get.side_effect = [
+        _response(HTTPStatus.OK, {"agency": "a"}, {"ETag": '"v1"'}),
+        _response(HTTPStatus.NOT_MODIFIED, headers={"ETag": '"v1"'}),
+    ]
+
+    access_manager.make_request(_get())
+    result = access_manager.make_request(_get())
+
+    assert result.status_code == HTTPStatus.OK
+    assert result.data == {"agency": "a"}
+    revalidation_headers = access_manager.session.get.call_args.kwargs["headers"]
+    assert revalidation_headers["If-None-Match"] == '"v1"'
+    assert access_manager.response_cache.stats.revalidations == 1
+
+
+def test_no_store_and_non_get_not_cached(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache()
+    access_manager.session.get.return_value = _response(
+        HTTPStatus.OK, {}, {"Cache-Control": "no-store"}
+    )
+    access_manager.session.post.return_value = _response(HTTPStatus.OK, {})
+
+    access_manager.make_request(_get())
+    access_manager.make_request(_get())
+    post = RequestInfo(type_=RequestType.POST, url="url")
+    access_manager.make_request(post)
+    access_manager.make_request(post)
+
+    assert access_manager.session.get.call_count == 2
+    assert access_manager.session.post.call_count == 2
+
+
+def test_cache_key_vary_header_names_ignore_case():
+    cache = ResponseCache()
+    ri = _get()
+    lower = ri.model_copy(update={"headers": {"authorization": ri.headers["Authorization"]}})
+    other = ri.model_copy(update={"headers": {"AUTHORIZATION": "Bearer other"}})
+
+    assert cache.key_for(ri) == cache.key_for(lower)
+    assert cache.key_for(ri) != cache.key_for(other)
+
+
+def test_private_response_cached(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache()
+    access_manager.session.get.return_value = _response(
+        HTTPStatus.OK, {"agency": "a"}, {"Cache-Control": "private, max-age=60"}
+    )
+
+    access_manager.make_request(_get())
+    access_manager.make_request(_get())
+
+    assert access_manager.session.get.call_count == 1
+
+
+def test_no_cache_response_revalidated_before_use(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache()
+    access_manager.session.get.side_effect = [
+        _response(HTTPStatus.OK, {"agency": "a"}, {"Cache-Control": "no-cache", "ETag": '"v1"'}),
+        _response(HTTPStatus.NOT_MODIFIED, headers={"Cache-Control": "no-cache"}),
+    ]
+
+    access_manager.make_request(_get())
+    result = access_manager.make_request(_get())
+
+    assert access_manager.session.get.call_count == 2
+    assert access_manager.session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert result.data == {"agency": "a"}
+    assert access_manager.response_cache.stats.revalidations == 1
+
+
+def test_response_varying_beyond_cache_key_not_stored(access_manager: AccessManagerSync):
+    access_manager.response_cache = ResponseCache()
+    access_manager.session.get.side_effect = [
+        _response(HTTPStatus.OK, {"lang": "en"}, {"Vary": "Accept-Language"}),
+        _response(HTTPStatus.OK, {"lang": "fr"}, {"Vary": "Accept-Language"}),
+        _response(HTTPStatus.OK, {}, {"Vary": "authorization, Accept-Encoding"}),
+    ]
+
+    access_manager.make_request(_get())
+    result = access_manager.make_request(_get())
+    access_manager.make_request(_get("other"))
+    access_manager.make_request(_get("other"))
+
+    assert result.data == {"lang": "fr"}
+    # Authorization is in the key and the data is decoded, so the last response is reused
+    assert access_manager.session.get.call_count == 3
+    assert access_manager.response_cache.stats.stores == 1
+
+
+def test_expiry_is_wall_clock_time():
+    cache = ResponseCache(ttl=60)
+    key = cache.key_for(_get())
+    cache.update(key, None, MagicMock(status_code=HTTPStatus.OK, data={}, headers={}))
+
+    entry = cache.backend.get(key)
+    assert time.time() + 59 < entry.expires_at <= time.time() + 60
+
+
+def test_not_modified_without_entry_not_stored():
+    cache = ResponseCache()
+    key = cache.key_for(_get())
+    response_info = MagicMock(status_code=HTTPStatus.NOT_MODIFIED, data=None, headers={})
+
+    assert cache.update(key, None, response_info) is response_info
+    assert cache.backend.get(key) is None
+    assert cache.stats.stores == 0
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(max_entries=2)
+    cache = ResponseCache(backend=backend)
+    for url in ("a", "b"):
+        cache.update(
+            cache.key_for(_get(url)),
+            None,
+            MagicMock(status_code=HTTPStatus.OK, data={}, headers={})
+        )
+    backend.get(cache.key_for(_get("a")))
+    cache.update(
+        cache.key_for(_get("c")),
+        None,
+        MagicMock(status_code=HTTPStatus.OK, data={}, headers={})
+    )
+
+    assert backend.get(cache.key_for(_get("b"))) is None
+    assert backend.get(cache.key_for(_get("a"))) is not None
+    assert backend.evictions == 1
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from requests import ConnectionError, HTTPError, Response
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+
+
+def _error_response(status: int, headers: dict = None) -> MagicMock:
+    response = Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    mock = MagicMock()
+    mock.raise_for_status.side_effect = HTTPError(response=response)
+    return mock
+
+
+def _ok_response() -> MagicMock:
+    mock = MagicMock()
+    mock.status_code = 200
+    mock.json.return_value = {"ok": True}
+    return mock
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(
+        "pdap_access_manager.access_manager.sync.time.sleep",
+        sleeps.append
+    )
+    return sleeps
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(max_attempts=3, backoff_base=1, max_retry_after=10)
+
+    assert 0 <= policy.next_delay(RequestType.GET, 1, HTTPStatus.SERVICE_UNAVAILABLE) <= 1
+    assert policy.next_delay(RequestType.GET, 1, HTTPStatus.TOO_MANY_REQUESTS, retry_after=5) == 5
+    assert policy.next_delay(RequestType.GET, 1, HTTPStatus.TOO_MANY_REQUESTS, retry_after=50) is None
+    assert policy.next_delay(RequestType.GET, 3, HTTPStatus.SERVICE_UNAVAILABLE) is None
+    assert policy.next_delay(RequestType.GET, 1, HTTPStatus.BAD_REQUEST) is None
+    assert policy.next_delay(RequestType.POST, 1, HTTPStatus.SERVICE_UNAVAILABLE) is None
+    assert policy.next_delay(
+        RequestType.POST, 1, HTTPStatus.SERVICE_UNAVAILABLE, retryable=True
+    ) is not None
+    assert policy.next_delay(RequestType.GET, 1, None) is not None
+    assert policy.next_delay(RequestType.HEAD, 1, HTTPStatus.SERVICE_UNAVAILABLE) is not None
+
+
+def test_retries_429_honoring_retry_after(access_manager: AccessManagerSync, no_sleep):
+    access_manager.retry_policy = RetryPolicy()
+    access_manager.session.get.side_effect = [
+        _error_response(HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "2"}),
+        _error_response(HTTPStatus.BAD_GATEWAY),
+        _ok_response(),
+    ]
+
+    result = access_manager.make_request(RequestInfo(type_=RequestType.GET, url="url"))
+
+    assert result.data == {"ok": True}
+    assert access_manager.session.get.call_count == 3
+    assert no_sleep[0] == 2
+
+
+def test_gives_up_after_max_attempts(access_manager: AccessManagerSync, no_sleep):
+    access_manager.retry_policy = RetryPolicy(max_attempts=2)
+    access_manager.session.get.side_effect = [
+        _error_response(HTTPStatus.SERVICE_UNAVAILABLE),
+        _error_response(HTTPStatus.SERVICE_UNAVAILABLE),
+        _ok_response(),
+    ]
+
+    with pytest.raises(RequestError) as exc_info:
+        access_manager.make_request(RequestInfo(type_=RequestType.GET, url="url"))
+
+    assert exc_info.value.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert access_manager.session.get.call_count == 2
+
+
+def test_post_retried_only_when_opted_in(access_manager: AccessManagerSync, no_sleep):
+    access_manager.retry_policy = RetryPolicy()
+    access_manager.session.post.side_effect = [
+        ConnectionError("reset"),
+        _ok_response(),
+    ]
+
+    with pytest.raises(ConnectionError):
+        access_manager.make_request(RequestInfo(type_=RequestType.POST, url="url"))
+
+    access_manager.session.post.side_effect = [
+        ConnectionError("reset"),
+        _ok_response(),
+    ]
+    result = access_manager.make_request(
+        RequestInfo(type_=RequestType.POST, url="url", retryable=True)
+    )
+    assert result.data == {"ok": True}
+
+
+def test_no_retry_without_policy(access_manager: AccessManagerSync, no_sleep):
+    access_manager.session.get.side_effect = [
+        _error_response(HTTPStatus.SERVICE_UNAVAILABLE),
+        _ok_response(),
+    ]
+
+    with pytest.raises(RequestError):
+        access_manager.make_request(RequestInfo(type_=RequestType.GET, url="url"))
+    assert no_sleep == []
@@ -0,0 +1,137 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestPriority, RequestType
+from pdap_access_manager.instrumentation import MetricsCollector
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.openmetrics import OpenMetricsExporter
+from pdap_access_manager.scheduler import PriorityScheduler
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+URL = "https://ds.example/api"
+INTERACTIVE = RequestPriority.INTERACTIVE
+BULK = RequestPriority.BULK
+
+
+def _queue(scheduler: PriorityScheduler, priorities: list[RequestPriority], order: list) -> list[threading.Thread]:
+    """Start a thread per priority that takes a slot, notes its priority and gives the slot back."""
+    threads = []
+    for index, priority in enumerate(priorities):
+        def take(priority=priority) -> None:
+            scheduler.acquire(priority)
+            order.append(priority)
+            scheduler.release(priority)
+
+        thread = threading.Thread(target=take)
+        thread.start()
+        threads.append(thread)
+        while sum(stats.waiting for stats in scheduler.stats().values()) < index + 1:
+            time.sleep(0.001)
+    return threads
+
+
+def test_queued_classes_share_slots_by_weight():
+    scheduler = PriorityScheduler(max_concurrency=1, weights={INTERACTIVE: 3, BULK: 1}, reserved={})
+    held = scheduler.acquire(BULK)
+    order = []
+    threads = _queue(scheduler, [BULK] * 4 + [INTERACTIVE] * 6, order)
+
+    scheduler.release(held)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # Three interactive requests for each bulk one, although the bulk ones queued first
+    assert order[:8] == [INTERACTIVE, INTERACTIVE, INTERACTIVE, BULK, INTERACTIVE, INTERACTIVE, INTERACTIVE, BULK]
+    stats = scheduler.stats()
+    assert stats[INTERACTIVE].started == 6
+    assert stats[BULK].started == 5
+    assert stats[BULK].p95_wait_seconds >= stats[INTERACTIVE].p95_wait_seconds
+
+
+def test_reserved_slots_are_kept_for_their_class():
+    scheduler = PriorityScheduler(max_concurrency=3, reserved={INTERACTIVE: 1})
+    scheduler.acquire(BULK)
+    scheduler.acquire(BULK)
+    blocked = threading.Thread(target=scheduler.acquire, args=(BULK,))
+    blocked.start()
+    while scheduler.stats()[BULK].waiting < 1:
+        time.sleep(0.001)
+
+    # The last slot is only for interactive requests
+    assert scheduler.acquire(INTERACTIVE) == INTERACTIVE
+    assert scheduler.stats()[BULK].waiting == 1
+
+    scheduler.release(BULK)
+    blocked.join(timeout=5)
+    assert scheduler.stats()[BULK].in_flight == 2
+
+
+def test_auth_requests_never_wait():
+    scheduler = PriorityScheduler(max_concurrency=1, reserved={})
+    scheduler.acquire(BULK)
+
+    assert scheduler.acquire(RequestPriority.AUTH) == RequestPriority.AUTH
+
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        PriorityScheduler(max_concurrency=2, reserved={INTERACTIVE: 2})
+    with pytest.raises(ValueError):
+        PriorityScheduler(weights={RequestPriority.AUTH: 1})
+
+
+def test_manager_sends_by_priority_and_refresh_skips_the_queue():
+    release = threading.Event()
+    sent = []
+
+    def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.url.endswith("/v2/auth/refresh-session"):
+            return TransportResponse(
+                status_code=HTTPStatus.OK, headers={}, data={"access_token": "new", "refresh_token": "refresh"}
+            )
+        sent.append(ri.priority)
+        release.wait(timeout=5)
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    scheduler = PriorityScheduler(max_concurrency=1, reserved={})
+    access_manager = AccessManagerSync(
+        tokens=TokensInfo(access_token="old", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=InMemoryTransport(handler),
+        scheduler=scheduler
+    )
+    ri = RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies")
+
+    first = threading.Thread(target=access_manager.make_request, args=(ri,))
+    first.start()
+    while not sent:
+        time.sleep(0.001)
+    bulk = threading.Thread(target=access_manager.make_request, args=(ri.model_copy(update={"priority": BULK}),))
+    bulk.start()
+    while scheduler.stats()[BULK].waiting < 1:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=access_manager.make_request, args=(ri,), kwargs={"priority": INTERACTIVE})
+    interactive.start()
+    while scheduler.stats()[INTERACTIVE].waiting < 1:
+        time.sleep(0.001)
+
+    # The only slot is taken and two requests are queued, yet the refresh goes out at once
+    access_manager.refresh_access_token()
+    assert access_manager.tokens.access_token == "new"
+
+    release.set()
+    for thread in (first, bulk, interactive):
+        thread.join(timeout=5)
+
+    assert sent == [None, INTERACTIVE, BULK]
+    assert scheduler.stats()[RequestPriority.AUTH].started == 1
+
+    rendered = OpenMetricsExporter(MetricsCollector(), scheduler=scheduler).render()
+    assert 'pdap_access_manager_scheduler_queue_depth{priority="bulk"} 0' in rendered
+    assert 'pdap_access_manager_scheduler_wait_seconds_count{priority="interactive"} 1' in rendered
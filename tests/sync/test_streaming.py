@@ -0,0 +1,56 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType, ResponseMode
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.streaming import JsonItemDecoder, iter_items
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+RECORDS = [{"id": 1, "name": "a, [b]"}, {"id": 2, "name": "c \"d\" }"}, [], None, 3.5]
+
+
+def _chunks(body: bytes, size: int) -> list[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 1000])
+def test_array_items_are_decoded_across_chunk_boundaries(size: int):
+    body = json.dumps(RECORDS, indent=2).encode()
+    assert list(iter_items(_chunks(body, size))) == RECORDS
+
+
+def test_ndjson_items_are_decoded():
+    body = b"\n".join(json.dumps(record).encode() for record in RECORDS) + b"\n"
+    assert list(iter_items(_chunks(body, 5))) == RECORDS
+
+
+def test_items_are_yielded_before_the_body_ends():
+    decoder = JsonItemDecoder()
+    assert decoder.feed(b'[{"id": 1}, {"id"') == [{"id": 1}]
+    assert decoder.feed(b': 2}]') == [{"id": 2}]
+    assert decoder.close() == []
+
+
+def test_truncated_array_raises():
+    decoder = JsonItemDecoder()
+    decoder.feed(b'[1, 2')
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def test_response_modes():
+    transport = InMemoryTransport(
+        lambda ri: TransportResponse(status_code=HTTPStatus.OK, headers={}, data=RECORDS)
+    )
+    access_manager = AccessManagerSync(transport=transport, json_decoder=json.loads)
+    ri = RequestInfo(type_=RequestType.GET, url="https://ds.example/export")
+
+    assert access_manager.make_request(ri).data == RECORDS
+    raw = access_manager.make_request(ri.model_copy(update={"response_mode": ResponseMode.BYTES}))
+    assert json.loads(raw.data) == RECORDS
+    assert list(access_manager.stream(ri)) == RECORDS
+    assert transport.requests[-1].response_mode == ResponseMode.STREAM
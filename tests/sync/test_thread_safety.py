@@ -0,0 +1,147 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+from requests import HTTPError, Response, Session
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+
+WORKERS = 32
+
+
+def _response(status: int, json: dict) -> MagicMock:
+    response = MagicMock()
+    response.status_code = status
+    response.json.return_value = json
+    if status >= 400:
+        error_response = Response()
+        error_response.status_code = status
+        response.raise_for_status.side_effect = HTTPError(response=error_response)
+    return response
+
+
+def test_concurrent_401s_trigger_single_refresh(access_manager: AccessManagerSync):
+    access_manager._tokens = TokensInfo(
+        access_token="old_access",
+        refresh_token="old_refresh"
+    )
+
+    def get(url, headers=None, **kwargs):
+        if headers == {"Authorization": "Bearer new_access"}:
+            return _response(HTTPStatus.OK, {"ok": True})
+        return _response(HTTPStatus.UNAUTHORIZED, {})
+
+    refresh_calls = 0
+    refresh_lock = threading.Lock()
+
+    def post(url, headers=None, **kwargs):
+        nonlocal refresh_calls
+        with refresh_lock:
+            refresh_calls += 1
+        time.sleep(0.01)
+        return _response(
+            HTTPStatus.OK,
+            {"access_token": "new_access", "refresh_token": "new_refresh"}
+        )
+
+    access_manager.session.get = MagicMock(side_effect=get)
+    access_manager.session.post = MagicMock(side_effect=post)
+
+    def one_request(_):
+        ri = RequestInfo(
+            type_=RequestType.GET,
+            url="url",
+            headers=access_manager.jwt_header()
+        )
+        return access_manager.make_request(ri)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(one_request, range(WORKERS * 4)))
+
+    assert all(result.data == {"ok": True} for result in results)
+    assert refresh_calls == 1
+
+
+def test_concurrent_lazy_login_and_api_key(access_manager: AccessManagerSync):
+    def slow_login():
+        time.sleep(0.01)
+        return TokensInfo(
+            access_token="access_token",
+            refresh_token="refresh_token"
+        )
+
+    def slow_load_api_key():
+        time.sleep(0.01)
+        access_manager.api_key = "api_key"
+
+    access_manager.login = MagicMock(side_effect=slow_login)
+    access_manager.load_api_key = MagicMock(side_effect=slow_load_api_key)
+
+    def both(_):
+        return access_manager.jwt_header(), access_manager.api_key_header()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(both, range(WORKERS * 4)))
+
+    assert access_manager.login.call_count == 1
+    assert access_manager.load_api_key.call_count == 1
+    assert all(
+        result == (
+            {"Authorization": "Bearer access_token"},
+            {"Authorization": "Basic api_key"}
+        )
+        for result in results
+    )
+
+
+def test_concurrent_mode_gives_each_thread_its_own_session():
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="email", password="password"),
+        concurrent=True
+    )
+    access_manager.transport._new_session = lambda: MagicMock(spec=Session)
+    barrier = threading.Barrier(WORKERS)
+
+    def get_session(_):
+        barrier.wait()
+        return access_manager.session, access_manager.session
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        pairs = list(executor.map(get_session, range(WORKERS)))
+
+    assert all(first is second for first, second in pairs)
+    sessions = {id(first) for first, _ in pairs}
+    assert len(sessions) == WORKERS
+
+    created = list(access_manager.transport._thread_sessions.values())
+    access_manager.transport.close()
+    for session in created:
+        session.close.assert_called_once()
+
+
+def test_sessions_of_ended_threads_are_closed():
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="email", password="password"),
+        concurrent=True
+    )
+    transport = access_manager.transport
+    transport._new_session = lambda: MagicMock(spec=Session)
+    assert not transport.open()
+
+    batches = []
+    for _ in range(5):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            batches.append(set(executor.map(lambda _: access_manager.session, range(8))))
+
+    # Each batch's threads ended before the next batch created its sessions
+    assert 0 < len(transport._thread_sessions) <= 4
+    live = set(transport._thread_sessions.values())
+    for session in set().union(*batches) - live:
+        session.close.assert_called_once()
+    assert transport._session is None
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.threaded import AccessManagerThreaded
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import AsyncInMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+def _ok(data: object) -> TransportResponse:
+    return TransportResponse(status_code=HTTPStatus.OK, headers={}, data=data)
+
+
+async def _handler(ri: RequestInfo) -> TransportResponse:
+    if ri.url.endswith("/v2/auth/login"):
+        return _ok({"access_token": "access", "refresh_token": "refresh"})
+    if ri.url.endswith("/missing"):
+        return TransportResponse(status_code=HTTPStatus.NOT_FOUND, headers={})
+    await asyncio.sleep(0.01)
+    return _ok({"thread": threading.current_thread().name, "params": ri.params})
+
+
+def _access_manager(transport: AsyncInMemoryTransport) -> AccessManagerThreaded:
+    return AccessManagerThreaded(
+        auth=AuthInfo(email="email", password="password"),
+        data_sources_url=URL,
+        transport=transport
+    )
+
+
+def _get(path: str, **kwargs) -> RequestInfo:
+    return RequestInfo(type_=RequestType.GET, url=f"{URL}{path}", **kwargs)
+
+
+def test_threads_share_one_loop_and_one_login():
+    transport = AsyncInMemoryTransport(_handler)
+    with _access_manager(transport) as access_manager:
+        def call(_) -> dict:
+            ri = _get("/agencies", headers=access_manager.jwt_header())
+            return access_manager.make_request(ri).data
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(call, range(32)))
+
+    assert {result["thread"] for result in results} == {"pdap-access-manager-loop"}
+    logins = [ri for ri in transport.requests if ri.url.endswith("/v2/auth/login")]
+    assert len(logins) == 1
+
+
+def test_submit_returns_futures_that_overlap():
+    transport = AsyncInMemoryTransport(_handler)
+    with _access_manager(transport) as access_manager:
+        headers = access_manager.jwt_header()
+        futures = [access_manager.submit(_get("/agencies", headers=headers)) for _ in range(20)]
+
+        assert all(isinstance(future, Future) for future in futures)
+        assert [future.result(timeout=5).status_code for future in futures] == [HTTPStatus.OK] * 20
+
+        with pytest.raises(RequestError) as e:
+            access_manager.submit(_get("/missing", headers=headers)).result(timeout=5)
+        assert e.value.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_generators_are_iterated_from_blocking_code():
+    async def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.url.endswith("/v2/auth/login"):
+            return await _handler(ri)
+        page = ri.params["page"]
+        return _ok({"data": [page] if page <= 3 else []})
+
+    with _access_manager(AsyncInMemoryTransport(handler)) as access_manager:
+        ri = _get("/agencies", headers=access_manager.jwt_header())
+        records = list(access_manager.paginate(ri))
+        results = list(access_manager.make_requests(
+            _get("/agencies", params={"page": page}, headers=ri.headers) for page in range(1, 4)
+        ))
+
+    assert records == [1, 2, 3]
+    assert [(index, response.data["data"]) for index, response in results] == [(0, [1]), (1, [2]), (2, [3])]
+
+
+def test_close_stops_the_loop_thread():
+    access_manager = _access_manager(AsyncInMemoryTransport(_handler))
+    thread = access_manager._thread
+
+    access_manager.close()
+    access_manager.close()
+
+    assert not thread.is_alive()
+    with pytest.raises(RuntimeError):
+        access_manager.make_request(_get("/agencies"))
+
+
+def test_session_is_rejected():
+    with pytest.raises(ValueError):
+        AccessManagerThreaded(session=object())
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from requests import Session
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.token_store import FileTokenStore
+
+
+def _manager(store: FileTokenStore) -> AccessManagerSync:
+    return AccessManagerSync(
+        auth=AuthInfo(email="email", password="password"),
+        session=MagicMock(spec=Session),
+        token_store=store
+    )
+
+
+def test_file_token_store_round_trip(tmp_path):
+    store = FileTokenStore(tmp_path / "tokens.json")
+    assert store.load().tokens is None
+
+    store.save(tokens=TokensInfo(access_token="a", refresh_token="r"))
+    store.save(api_key="key")
+
+    stored = FileTokenStore(tmp_path / "tokens.json").load()
+    assert stored.tokens.access_token == "a"
+    assert stored.api_key == "key"
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_manager_starts_from_stored_tokens(tmp_path):
+    store = FileTokenStore(tmp_path / "tokens.json")
+    store.save(
+        tokens=TokensInfo(access_token="a", refresh_token="r"),
+        api_key="key",
+        email="email"
+    )
+    access_manager = _manager(store)
+    access_manager.login = MagicMock()
+
+    assert access_manager.jwt_header() == {"Authorization": "Bearer a"}
+    assert access_manager.api_key_header() == {"Authorization": "Basic key"}
+    access_manager.login.assert_not_called()
+
+
+def test_managers_sharing_store_log_in_once(tmp_path):
+    store = FileTokenStore(tmp_path / "tokens.json")
+    logins = 0
+    lock = threading.Lock()
+
+    def slow_login():
+        nonlocal logins
+        with lock:
+            logins += 1
+        time.sleep(0.02)
+        return TokensInfo(access_token="a", refresh_token="r")
+
+    managers = [_manager(store) for _ in range(8)]
+    for access_manager in managers:
+        access_manager.login = MagicMock(side_effect=slow_login)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        headers = list(executor.map(lambda am: am.jwt_header(), managers))
+
+    assert logins == 1
+    assert all(header == {"Authorization": "Bearer a"} for header in headers)
+
+
+def test_refresh_adopts_tokens_saved_by_other_manager(tmp_path):
+    store = FileTokenStore(tmp_path / "tokens.json")
+    stale = TokensInfo(access_token="old", refresh_token="old_r")
+    store.save(tokens=stale, email="email")
+    first = _manager(store)
+    second = _manager(store)
+
+    def refresh():
+        first._set_tokens(TokensInfo(access_token="new", refresh_token="new_r"))
+
+    first.refresh_access_token = MagicMock(side_effect=refresh)
+    second.refresh_access_token = MagicMock()
+
+    first._refresh_single_flight(first._tokens)
+    second._refresh_single_flight(second._tokens)
+
+    first.refresh_access_token.assert_called_once()
+    second.refresh_access_token.assert_not_called()
+    assert second.tokens.access_token == "new"
+
+
+def test_credentials_of_another_account_are_ignored(tmp_path):
+    store = FileTokenStore(tmp_path / "tokens.json")
+    store.save(
+        tokens=TokensInfo(access_token="other", refresh_token="r"),
+        api_key="other-key",
+        email="other"
+    )
+    access_manager = _manager(store)
+    access_manager.login = MagicMock(return_value=TokensInfo(access_token="a", refresh_token="r"))
+
+    assert access_manager.api_key is None
+    assert access_manager.jwt_header() == {"Authorization": "Bearer a"}
+    access_manager.login.assert_called_once()
+    # Replaced by this account's tokens, without the other account's API key
+    stored = store.load()
+    assert (stored.email, stored.tokens.access_token, stored.api_key) == ("email", "a", None)
+
+    # A refresh does not adopt tokens another account saves meanwhile
+    store.save(tokens=TokensInfo(access_token="other", refresh_token="r"), email="other")
+    assert not access_manager._adopt_stored_tokens(access_manager._tokens)
@@ -0,0 +1,27 @@
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.transport import TransportConfig
+
+
+def test_created_session_uses_transport_config():
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="email", password="password"),
+        data_sources_url="https://data-sources.example/api",
+        transport_config=TransportConfig(
+            pool_maxsize=32,
+            pool_block=True,
+            data_sources_limit=4
+        )
+    )
+
+    with access_manager.with_session():
+        session = access_manager.session
+        default_adapter = session.get_adapter("https://other.example/")
+        data_sources_adapter = session.get_adapter(
+            "https://data-sources.example/api/v2/data-sources"
+        )
+
+        assert default_adapter._pool_maxsize == 32
+        assert default_adapter._pool_block is True
+        assert data_sources_adapter._pool_maxsize == 4
+        assert data_sources_adapter._pool_block is True
@@ -0,0 +1,125 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.retry import RetryPolicy
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+URL = "https://ds.example/api"
+
+
+def _ok(data: dict) -> TransportResponse:
+    return TransportResponse(status_code=HTTPStatus.OK, headers={}, data=data)
+
+
+def test_in_memory_transport_refreshes_on_401_and_replays():
+    def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.url.endswith("/refresh-session"):
+            return _ok({"access_token": "new", "refresh_token": "refresh"})
+        if ri.headers["Authorization"] == "Bearer old":
+            return TransportResponse(status_code=HTTPStatus.UNAUTHORIZED, headers={})
+        return _ok({"agencies": []})
+
+    transport = InMemoryTransport(handler)
+    access_manager = AccessManagerSync(
+        tokens=TokensInfo(access_token="old", refresh_token="refresh"),
+        data_sources_url=URL,
+        transport=transport
+    )
+
+    response_info = access_manager.make_request(
+        RequestInfo(type_=RequestType.GET, url=f"{URL}/agencies", headers=access_manager.jwt_header())
+    )
+
+    assert response_info.data == {"agencies": []}
+    assert [ri.url for ri in transport.requests] == [
+        f"{URL}/agencies", f"{URL}/v2/auth/refresh-session", f"{URL}/agencies"
+    ]
+
+
+def test_in_memory_transport_connection_errors_are_retried(monkeypatch):
+    monkeypatch.setattr("pdap_access_manager.access_manager.sync.time.sleep", lambda _: None)
+    responses = iter([ConnectionError("refused"), _ok({"ok": True})])
+
+    def handler(ri: RequestInfo) -> TransportResponse:
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="email", password="password"),
+        transport=InMemoryTransport(handler),
+        retry_policy=RetryPolicy()
+    )
+
+    result = access_manager.make_request(RequestInfo(type_=RequestType.GET, url=f"{URL}/x"))
+
+    assert result.data == {"ok": True}
+
+
+def test_in_memory_transport_raises_error_statuses_with_retry_after():
+    access_manager = AccessManagerSync(
+        transport=InMemoryTransport(
+            lambda ri: TransportResponse(status_code=HTTPStatus.TOO_MANY_REQUESTS, headers={"Retry-After": "3"})
+        )
+    )
+
+    with pytest.raises(RequestError) as e:
+        access_manager.make_request(RequestInfo(type_=RequestType.GET, url=f"{URL}/x"))
+
+    assert e.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert e.value.retry_after == 3
+
+
+def test_session_and_transport_are_exclusive():
+    with pytest.raises(ValueError):
+        AccessManagerSync(
+            session=object(),
+            transport=InMemoryTransport(lambda ri: _ok({}))
+        )
+
+
+def test_httpx_transport():
+    httpx = pytest.importorskip("httpx")
+    from pdap_access_manager.transports.httpx_ import HttpxTransport
+
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(HTTPStatus.NOT_FOUND)
+        return httpx.Response(HTTPStatus.OK, json={"page": request.url.params["page"]})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    access_manager = AccessManagerSync(transport=HttpxTransport(client))
+
+    result = access_manager.make_request(
+        RequestInfo(type_=RequestType.GET, url="https://ds.example/records", params={"page": 2})
+    )
+    assert result.data == {"page": "2"}
+    with pytest.raises(RequestError) as e:
+        access_manager.make_request(RequestInfo(type_=RequestType.GET, url="https://ds.example/missing"))
+    assert e.value.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_httpx_transport_reports_wire_size_of_compressed_bodies():
+    httpx = pytest.importorskip("httpx")
+    from pdap_access_manager.transports.httpx_ import HttpxTransport
+
+    body = gzip.compress(json.dumps({"agencies": ["a"] * 100}).encode())
+    client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(HTTPStatus.OK, content=body, headers={"Content-Encoding": "gzip"})
+    ))
+
+    response = HttpxTransport(client).send(RequestInfo(type_=RequestType.GET, url=URL))
+
+    assert response.data == {"agencies": ["a"] * 100}
+    assert response.content_length == len(body)
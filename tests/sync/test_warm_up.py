@@ -0,0 +1,120 @@
+import logging
+import threading
+from http import HTTPStatus
+
+import pytest
+
+from pdap_access_manager.access_manager.pool import AccessManagerPoolSync
+from pdap_access_manager.access_manager.sync import AccessManagerSync
+from pdap_access_manager.enums import RequestType
+from pdap_access_manager.exceptions import RequestError
+from pdap_access_manager.models.auth import AuthInfo
+from pdap_access_manager.models.request import RequestInfo
+from pdap_access_manager.models.tokens import TokensInfo
+from pdap_access_manager.transports._base import TransportResponse
+from pdap_access_manager.transports.memory import InMemoryTransport
+
+DATA_SOURCES_URL = "https://ds.example/api"
+SOURCE_COLLECTOR_URL = "https://sc.example"
+
+
+def _handler(connected: threading.Event, failing_hosts: tuple[str, ...] = ()):
+    """Answer like PDAP; login waits for a connection to be opened first, so it only succeeds if they overlap."""
+    def handler(ri: RequestInfo) -> TransportResponse:
+        if ri.type_ == RequestType.HEAD:
+            if ri.url in failing_hosts:
+                raise ConnectionError("refused")
+            connected.set()
+            return TransportResponse(status_code=HTTPStatus.NOT_FOUND, headers={})
+        if ri.url.endswith("/v2/auth/login"):
+            if not connected.wait(timeout=5):
+                raise TimeoutError("login was sent before any connection was opened")
+            email = ri.json_["email"]
+            return TransportResponse(
+                status_code=HTTPStatus.OK,
+                headers={},
+                data={"access_token": f"access-{email}", "refresh_token": f"refresh-{email}"}
+            )
+        if ri.url.endswith("/v2/auth/api-key"):
+            return TransportResponse(
+                status_code=HTTPStatus.OK, headers={}, data={"api_key": f"key-{ri.headers['Authorization']}"}
+            )
+        return TransportResponse(status_code=HTTPStatus.OK, headers={}, data={})
+
+    return handler
+
+
+def test_warm_up_logs_in_and_connects_at_the_same_time():
+    transport = InMemoryTransport(_handler(threading.Event()))
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="a", password="password"),
+        data_sources_url=DATA_SOURCES_URL,
+        source_collector_url=SOURCE_COLLECTOR_URL,
+        transport=transport
+    )
+
+    access_manager.warm_up(connections=2)
+
+    assert access_manager.tokens.access_token == "access-a"
+    assert access_manager.api_key == "key-Bearer access-a"
+    heads = sorted(ri.url for ri in transport.requests if ri.type_ == RequestType.HEAD)
+    assert heads == [DATA_SOURCES_URL] * 2 + [SOURCE_COLLECTOR_URL] * 2
+
+
+def test_warm_up_on_enter_skips_what_is_already_done():
+    transport = InMemoryTransport(_handler(threading.Event()))
+    access_manager = AccessManagerSync(
+        tokens=TokensInfo(access_token="access", refresh_token="refresh"),
+        api_key="key",
+        data_sources_url=DATA_SOURCES_URL,
+        transport=transport,
+        warm_up_on_enter=True
+    )
+
+    with access_manager:
+        pass
+
+    assert [ri.type_ for ri in transport.requests] == [RequestType.HEAD, RequestType.HEAD]
+
+
+def test_connection_failures_are_logged_and_login_failures_raised(caplog):
+    connected = threading.Event()
+    connected.set()
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="a", password="password"),
+        data_sources_url=DATA_SOURCES_URL,
+        source_collector_url=SOURCE_COLLECTOR_URL,
+        transport=InMemoryTransport(_handler(connected, failing_hosts=(SOURCE_COLLECTOR_URL,)))
+    )
+
+    with caplog.at_level(logging.INFO):
+        access_manager.warm_up(load_api_key=False)
+    assert access_manager.api_key is None
+    assert f"Could not open a connection to {SOURCE_COLLECTOR_URL}" in caplog.text
+
+    def rejecting(ri: RequestInfo) -> TransportResponse:
+        status = HTTPStatus.NOT_FOUND if ri.type_ == RequestType.HEAD else HTTPStatus.UNAUTHORIZED
+        return TransportResponse(status_code=status, headers={})
+
+    access_manager = AccessManagerSync(
+        auth=AuthInfo(email="a", password="wrong"),
+        transport=InMemoryTransport(rejecting),
+        warm_up_on_enter=True
+    )
+    with pytest.raises(RequestError):
+        with access_manager:
+            pass
+
+
+def test_pool_warms_up_every_credential():
+    transport = InMemoryTransport(_handler(threading.Event()))
+    access_manager = AccessManagerPoolSync(
+        [AuthInfo(email=email, password="password") for email in ("a", "b")],
+        data_sources_url=DATA_SOURCES_URL,
+        source_collector_url=SOURCE_COLLECTOR_URL,
+        transport=transport
+    )
+
+    access_manager.warm_up()
+
+    assert [manager.api_key for manager in access_manager.managers] == ["key-Bearer access-a", "key-Bearer access-b"]
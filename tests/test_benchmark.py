@@ -0,0 +1,54 @@
+"""
+Smoke test of the benchmark suite against the stand-in server.
+Run the benchmarks themselves with `pdap-access-manager-benchmark`.
+"""
+import pytest
+
+from pdap_access_manager.benchmark.runner import SCENARIOS, percentile, run_benchmark
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+
+
+@pytest.mark.parametrize("manager", ["async", "sync", "threaded"])
+def test_baseline_run_logs_in_once(manager: str):
+    result = run_benchmark(manager, SCENARIOS["baseline"], concurrency=4, requests=40)
+
+    assert result.errors == 0
+    assert result.logins == 1
+    assert result.refreshes == 0
+    assert result.requests_per_second > 0
+    assert result.p50_ms <= result.p99_ms
+    assert result.peak_memory_mib is not None
+
+
+@pytest.mark.parametrize("manager", ["async", "sync"])
+def test_token_storm_refreshes_instead_of_logging_in(manager: str):
+    result = run_benchmark(manager, SCENARIOS["token-storm"], concurrency=1, requests=120, trace_memory=False)
+
+    assert result.errors == 0
+    assert result.logins == 1
+    # Tokens are revoked every 50 requests
+    assert result.refreshes == 2
+
+
+@pytest.mark.parametrize("manager", ["async", "sync", "threaded"])
+def test_concurrent_token_storm_refreshes_once(manager: str):
+    # One revocation, at the 50th request, with several requests in flight
+    result = run_benchmark(manager, SCENARIOS["token-storm"], concurrency=8, requests=60, trace_memory=False)
+
+    assert result.errors == 0
+    assert result.logins == 1
+    assert result.refreshes == 1
+
+
+def test_gzip_scenarios_send_fewer_bytes():
+    upload = run_benchmark("sync", SCENARIOS["upload"], concurrency=1, requests=5, trace_memory=False)
+    upload_gzip = run_benchmark("sync", SCENARIOS["upload-gzip"], concurrency=1, requests=5, trace_memory=False)
+
+    assert upload_gzip.errors == 0
+    assert 0 < upload_gzip.kib_sent < upload.kib_sent
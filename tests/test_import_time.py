@@ -0,0 +1,62 @@
+"""
+Cold-start import benchmark, based on `python -X importtime`.
+
+Each transport's module must not import the other transport's stack,
+nor exceed the cumulative import time budget: IMPORT_BUDGET_US, with
+headroom for slow CI machines, or PDAP_IMPORT_BUDGET_US to tighten it.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+AIOHTTP_STACK = {"aiohttp", "multidict", "yarl", "frozenlist", "aiosignal"}
+REQUESTS_STACK = {"requests", "urllib3"}
+IMPORT_BUDGET_US = int(os.environ.get("PDAP_IMPORT_BUDGET_US", 1_500_000))
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module, forbidden",
+    [
+        ("pdap_access_manager.access_manager.sync", AIOHTTP_STACK),
+        ("pdap_access_manager.access_manager.async_", REQUESTS_STACK),
+    ]
+)
+def test_transport_imports_are_isolated(module: str, forbidden: set[str]):
+    times = import_times(module)
+
+    assert module in times
+    assert forbidden.isdisjoint(times), sorted(forbidden & times.keys())
+    assert times[module] <= IMPORT_BUDGET_US, f"{module} took {times[module]}us to import"
+
+
+def test_sync_manager_does_not_load_asyncio():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; import pdap_access_manager.access_manager.sync; print('asyncio' in sys.modules)"
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    assert result.stdout.strip() == "False"